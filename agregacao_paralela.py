@@ -0,0 +1,186 @@
+"""
+==============================================================================
+CÁLCULO DAS MÉTRICAS EM VÁRIOS NÚCLEOS (SHARDS)
+==============================================================================
+Descrição: Divide os dados tratados em pedaços ("shards"), calcula um estado
+           parcial das métricas de cada pedaço em um processo separado e
+           junta os estados no processo principal. O resultado é o mesmo
+           dicionário de métricas de calcular_metricas().
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- Por que threads não aceleram código Python e processos sim
+- Como dividir um trabalho em partes independentes (sharding)
+- Como um estado parcial em JSON permite juntar resultados de várias máquinas
+==============================================================================
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import instrumentacao
+from gerador_relatorio import (
+    COLUNAS_CONTAGEM,
+    calcular_estado_metricas,
+    combinar_estados,
+    criar_estado_metricas,
+    exibir_metricas,
+    finalizar_metricas,
+)
+from serie_backlog import (
+    combinar_eventos,
+    contar_eventos,
+    eventos_de_dict,
+    eventos_para_dict,
+    montar_serie_backlog,
+)
+
+# ==============================================================================
+# COMO FUNCIONA A AGREGAÇÃO EM SHARDS
+# ==============================================================================
+#
+# calcular_metricas() roda em um único núcleo. Em uma máquina com 32
+# núcleos, 31 ficam parados. Threads não resolvem: o Python executa uma
+# thread de cada vez (o GIL). Processos sim, cada um tem seu interpretador.
+#
+# 1. DIVIDIR: as linhas viram N shards contíguos (ex.: 1 milhão de linhas
+#    em 8 shards de 125 mil).
+# 2. CALCULAR: cada processo recebe um shard e devolve o seu ESTADO
+#    PARCIAL (os "ingredientes" da ETAPA 5 do gerador_relatorio:
+#    contagens, soma/quantidade/mínimo/máximo do tempo, acumuladores por
+#    prioridade, sketches dos percentis) e os saldos do backlog.
+# 3. JUNTAR: o processo principal soma os estados com combinar_estados(),
+#    a mesma função dos modos streaming e incremental, e finaliza.
+#
+# Como os estados só têm somas, contagens, mínimos e máximos, o resultado
+# é o mesmo de calcular_metricas(), em qualquer divisão (a soma dos tempos
+# em outra ordem pode mudar só a última casa do float, nada que apareça
+# nas médias arredondadas).
+#
+# O estado parcial é um dicionário simples, que vira JSON sem conversões
+# (salvar_parcial/carregar_parcial). Assim, o mesmo combinar_parciais()
+# junta estados calculados em outras máquinas, cada uma com sua parte
+# dos chamados.
+
+VERSAO_PARCIAL = 1
+
+# Só as colunas usadas nas métricas vão para os processos (menos cópia)
+COLUNAS_AGREGACAO = list(COLUNAS_CONTAGEM.values()) + [
+    'tempo_atendimento_horas', 'data_abertura', 'data_fechamento'
+]
+
+# Abaixo disso, abrir processos custa mais do que calcular direto
+MINIMO_LINHAS_PARALELO = 200_000
+
+# Shards por processo: pedaços menores equilibram melhor a carga
+SHARDS_POR_PROCESSO = 2
+
+
+def dividir_em_shards(df, quantidade):
+    """
+    Divide as linhas em 'quantidade' pedaços contíguos de tamanho parecido.
+
+    Retorna:
+        list: DataFrames (fatias do original, sem cópia)
+    """
+    limites = np.linspace(0, len(df), quantidade + 1).astype(int)
+    return [df.iloc[inicio:fim] for inicio, fim in zip(limites[:-1], limites[1:]) if fim > inicio]
+
+
+def calcular_parcial(shard):
+    """
+    Calcula o estado parcial de um shard (roda dentro de um processo do pool).
+
+    Parâmetros:
+        shard (DataFrame): Parte dos dados tratados
+
+    Retorna:
+        dict: {'versao', 'linhas', 'estado', 'eventos_backlog'}, pronto para JSON
+    """
+    return {
+        'versao': VERSAO_PARCIAL,
+        'linhas': len(shard),
+        'estado': calcular_estado_metricas(shard),
+        'eventos_backlog': eventos_para_dict(contar_eventos(shard)),
+    }
+
+
+def combinar_parciais(parciais):
+    """
+    Junta estados parciais (de processos ou de máquinas diferentes).
+
+    Parâmetros:
+        parciais (iterável): Estados de calcular_parcial()/carregar_parcial()
+
+    Retorna:
+        dict: Métricas no mesmo formato de calcular_metricas()
+    """
+    estado = criar_estado_metricas()
+    eventos = None
+    for parcial in parciais:
+        if parcial.get('versao') != VERSAO_PARCIAL:
+            raise ValueError(f"Estado parcial de versão incompatível: {parcial.get('versao')}")
+        combinar_estados(estado, parcial['estado'])
+        eventos = combinar_eventos(eventos, eventos_de_dict(parcial['eventos_backlog']))
+
+    metricas = finalizar_metricas(estado)
+    metricas['backlog'] = montar_serie_backlog(eventos)
+    return metricas
+
+
+def salvar_parcial(parcial, caminho):
+    """Grava um estado parcial em JSON (para juntar em outra máquina)."""
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(parcial, arquivo, ensure_ascii=False)
+
+
+def carregar_parcial(caminho):
+    """Lê um estado parcial gravado por salvar_parcial()."""
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def calcular_metricas_paralelo(df, max_processos=None, exibir_mensagens=True):
+    """
+    Calcula as métricas usando vários núcleos.
+
+    Parâmetros:
+        df (DataFrame): Dados tratados
+        max_processos (int): Processos no pool (None = um por núcleo)
+        exibir_mensagens (bool): Se False, não imprime as métricas
+
+    Retorna:
+        dict: Métricas (as mesmas de calcular_metricas())
+    """
+    if exibir_mensagens:
+        print("\n" + "="*60)
+        print("📊 CÁLCULO DE MÉTRICAS (PARALELO)")
+        print("="*60)
+
+    processos = max_processos or os.cpu_count() or 1
+    dados = df[COLUNAS_AGREGACAO]
+
+    if processos == 1 or len(dados) < MINIMO_LINHAS_PARALELO:
+        # Um núcleo só (ou poucos dados): o mesmo cálculo, sem o pool
+        shards = [dados]
+        parciais = [calcular_parcial(dados)]
+    else:
+        shards = dividir_em_shards(dados, processos * SHARDS_POR_PROCESSO)
+        with ProcessPoolExecutor(max_workers=processos,
+                                 initializer=instrumentacao.descartar_rastreamento) as pool:
+            # Cada shard é copiado para um processo; volta só o estado (pequeno)
+            parciais = list(pool.map(calcular_parcial, shards))
+
+    metricas = combinar_parciais(parciais)
+
+    if exibir_mensagens:
+        print(f"   {len(shards)} shard(s) em {min(processos, len(shards))} processo(s)")
+        exibir_metricas(metricas)
+        print("\n✅ Cálculo de métricas concluído!")
+
+    return metricas
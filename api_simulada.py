@@ -0,0 +1,250 @@
+"""
+==============================================================================
+API DE HELPDESK SIMULADA (PARA TESTAR A INGESTÃO SEM REDE)
+==============================================================================
+Descrição: Um servidor local que responde como a API REST do helpdesk
+           (o contrato descrito em ingestao_api.py), servindo os chamados
+           de um CSV. Tem latência e falhas configuráveis, para medir a
+           vazão da ingestão e ver o retry funcionando, tudo offline.
+
+Para executar:
+    python api_simulada.py chamados_ti.csv --porta 8765 --latencia 0.05
+    python api_simulada.py chamados_1m.csv --medir --concorrencia 1 4 16
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- Como escrever um servidor HTTP assíncrono com aiohttp
+- Como gerar cursores de paginação "opacos"
+- Como simular uma rede lenta e instável para testar um cliente
+==============================================================================
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from aiohttp import web
+
+from ingestao_api import COLUNAS_API, TAMANHO_PAGINA_PADRAO, carregar_da_api
+
+# ==============================================================================
+# COMO FUNCIONA A API SIMULADA
+# ==============================================================================
+#
+# Na partida, o CSV é lido como texto e ordenado pela data de abertura.
+# Assim, cada período (abertura_de, abertura_ate) é um intervalo contínuo
+# de linhas, achado com busca binária (searchsorted).
+#
+# O CURSOR é a posição da próxima linha, codificada em base64. Para o
+# cliente ele é só um texto "opaco": ele não calcula nada, só devolve o
+# cursor recebido. (Numa API real, o cursor costuma ser o último id visto.)
+#
+# LATÊNCIA: cada resposta espera 'latencia' segundos (asyncio.sleep, que
+# não bloqueia as outras requisições), como a ida e volta de uma rede.
+#
+# FALHAS: uma fração 'taxa_erro' das requisições recebe 503 com
+# Retry-After, para exercitar o retry do cliente.
+
+# Maior página aceita (pedidos maiores são cortados)
+LIMITE_MAXIMO = 5000
+
+
+def carregar_chamados(caminho_arquivo):
+    """
+    Lê o CSV como texto e ordena pela data de abertura.
+
+    Retorna:
+        dict: {'registros': lista de dicts, 'aberturas': array de textos,
+               'com_abertura': quantas linhas têm data de abertura}
+    """
+    df = pd.read_csv(caminho_arquivo, dtype=str, keep_default_na=False)
+    df = df.reindex(columns=COLUNAS_API, fill_value='')
+    # Sem data de abertura vão para o fim (texto vazio → "~" na ordenação)
+    chave = df['data_abertura'].str.strip().replace('', '~').to_numpy()
+    ordem = np.argsort(chave, kind='stable')
+    df = df.iloc[ordem].reset_index(drop=True)
+    aberturas = chave[ordem]
+
+    registros = [
+        {coluna: (valor if valor != '' else None) for coluna, valor in linha.items()}
+        for linha in df.to_dict('records')
+    ]
+    for registro in registros:
+        registro['id_chamado'] = int(registro['id_chamado'])
+
+    return {
+        'registros': registros,
+        'aberturas': aberturas,
+        'com_abertura': int(np.searchsorted(aberturas, '~')),
+    }
+
+
+def codificar_cursor(posicao, fim):
+    """Cursor opaco com a próxima posição e o fim do intervalo."""
+    return base64.urlsafe_b64encode(json.dumps([posicao, fim]).encode()).decode()
+
+
+def decodificar_cursor(cursor):
+    """Lê um cursor de codificar_cursor() (ValueError se for inválido)."""
+    try:
+        posicao, fim = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(posicao), int(fim)
+    except Exception as erro:
+        raise ValueError(f"Cursor inválido: {cursor}") from erro
+
+
+def criar_aplicacao(dados, latencia=0.0, taxa_erro=0.0, semente=None):
+    """
+    Monta o servidor aiohttp com as rotas da API.
+
+    Parâmetros:
+        dados (dict): Resultado de carregar_chamados()
+        latencia (float): Segundos de espera em cada resposta
+        taxa_erro (float): Fração das requisições que recebem 503
+        semente (int): Semente do sorteio das falhas (reprodutível)
+
+    Retorna:
+        web.Application
+    """
+    sorteio = random.Random(semente)
+    aberturas = dados['aberturas']
+    registros = dados['registros']
+
+    async def simular_rede():
+        if latencia:
+            await asyncio.sleep(latencia)
+        if taxa_erro and sorteio.random() < taxa_erro:
+            raise web.HTTPServiceUnavailable(headers={'Retry-After': '0.05'})
+
+    async def listar(requisicao):
+        await simular_rede()
+        parametros = requisicao.query
+        try:
+            limite = min(int(parametros.get('limite', TAMANHO_PAGINA_PADRAO)), LIMITE_MAXIMO)
+            if 'cursor' in parametros:
+                posicao, fim = decodificar_cursor(parametros['cursor'])
+            elif parametros.get('sem_abertura'):
+                posicao, fim = dados['com_abertura'], len(registros)
+            else:
+                de = parametros.get('abertura_de', '')
+                ate = parametros.get('abertura_ate', '~')
+                posicao = int(np.searchsorted(aberturas[:dados['com_abertura']], de, side='left'))
+                fim = int(np.searchsorted(aberturas[:dados['com_abertura']], ate, side='left'))
+        except ValueError as erro:
+            raise web.HTTPBadRequest(text=str(erro))
+
+        proxima = min(posicao + limite, fim)
+        return web.json_response({
+            'chamados': registros[posicao:proxima],
+            'proximo_cursor': codificar_cursor(proxima, fim) if proxima < fim else None,
+        })
+
+    async def periodo(requisicao):
+        await simular_rede()
+        com_abertura = aberturas[:dados['com_abertura']]
+        return web.json_response({
+            'inicio': com_abertura[0] if len(com_abertura) else None,
+            'fim': com_abertura[-1] if len(com_abertura) else None,
+        })
+
+    aplicacao = web.Application()
+    aplicacao.router.add_get('/chamados', listar)
+    aplicacao.router.add_get('/chamados/periodo', periodo)
+    return aplicacao
+
+
+def iniciar_em_segundo_plano(dados, porta=0, **opcoes):
+    """
+    Sobe o servidor em uma thread (com o seu próprio loop asyncio).
+
+    Parâmetros:
+        dados (dict): Resultado de carregar_chamados()
+        porta (int): Porta local (0 = uma porta livre qualquer)
+        **opcoes: latencia, taxa_erro, semente (ver criar_aplicacao)
+
+    Retorna:
+        tuple: (url_base, função que para o servidor)
+    """
+    loop = asyncio.new_event_loop()
+    pronto = threading.Event()
+    estado = {}
+
+    async def subir():
+        executor = web.AppRunner(criar_aplicacao(dados, **opcoes), access_log=None)
+        await executor.setup()
+        site = web.TCPSite(executor, '127.0.0.1', porta)
+        await site.start()
+        estado['executor'] = executor
+        estado['porta'] = executor.addresses[0][1]
+        pronto.set()
+
+    thread = threading.Thread(target=lambda: (loop.run_until_complete(subir()), loop.run_forever()),
+                              daemon=True)
+    thread.start()
+    pronto.wait()
+
+    def parar():
+        asyncio.run_coroutine_threadsafe(estado['executor'].cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return f"http://127.0.0.1:{estado['porta']}", parar
+
+
+def medir_vazao(caminho_arquivo, concorrencias, latencia, taxa_erro, tamanho_pagina):
+    """
+    Mede chamados/s da ingestão pela API para cada nível de concorrência.
+
+    Retorna:
+        list: Um dict por medição (concorrencia, chamados, segundos, chamados_s)
+    """
+    dados = carregar_chamados(caminho_arquivo)
+    url_base, parar = iniciar_em_segundo_plano(dados, latencia=latencia,
+                                               taxa_erro=taxa_erro, semente=42)
+    resultados = []
+    try:
+        for concorrencia in concorrencias:
+            inicio = time.perf_counter()
+            df = carregar_da_api(url_base, concorrencia=concorrencia,
+                                 tamanho_pagina=tamanho_pagina, exibir_mensagens=False)
+            segundos = time.perf_counter() - inicio
+            resultados.append({'concorrencia': concorrencia, 'chamados': len(df),
+                               'segundos': round(segundos, 2),
+                               'chamados_s': round(len(df) / segundos)})
+            print(f"   concorrência {concorrencia:>3}: {len(df)} chamados em "
+                  f"{segundos:.2f}s ({len(df) / segundos:,.0f} chamados/s)")
+    finally:
+        parar()
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API de helpdesk simulada (servindo um CSV)")
+    parser.add_argument('arquivo', help="CSV de chamados servido pela API")
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--latencia', type=float, default=0.05,
+                        help="Segundos de espera em cada resposta (padrão: %(default)s)")
+    parser.add_argument('--taxa-erro', type=float, default=0.0,
+                        help="Fração das requisições que recebem 503 (padrão: %(default)s)")
+    parser.add_argument('--medir', action='store_true',
+                        help="Em vez de ficar no ar, mede a vazão da ingestão e sai")
+    parser.add_argument('--concorrencia', type=int, nargs='+', default=[1, 4, 8, 16],
+                        help="Níveis de concorrência medidos com --medir")
+    parser.add_argument('--tamanho-pagina', type=int, default=TAMANHO_PAGINA_PADRAO)
+    argumentos = parser.parse_args()
+
+    if argumentos.medir:
+        print(f"📏 Vazão da ingestão (latência {argumentos.latencia}s, "
+              f"erros {argumentos.taxa_erro:.0%}, páginas de {argumentos.tamanho_pagina})")
+        medir_vazao(argumentos.arquivo, argumentos.concorrencia, argumentos.latencia,
+                    argumentos.taxa_erro, argumentos.tamanho_pagina)
+    else:
+        print(f"🌐 API simulada em http://127.0.0.1:{argumentos.porta} (Ctrl+C para sair)")
+        web.run_app(criar_aplicacao(carregar_chamados(argumentos.arquivo),
+                                    argumentos.latencia, argumentos.taxa_erro),
+                    host='127.0.0.1', port=argumentos.porta, print=None)
@@ -0,0 +1,280 @@
+"""
+==============================================================================
+DASHBOARD AO VIVO: ACOMPANHANDO O CSV ENQUANTO ELE CRESCE
+==============================================================================
+Descrição: Mantém, para o dashboard, uma "visão" dos dados (DataFrame,
+           índice bitmap, cubos e ordem da tabela) que acompanha o CSV de
+           chamados. Quando o helpdesk acrescenta linhas, só o final do
+           arquivo é lido e tratado, e cada estrutura recebe apenas as
+           linhas novas, sem ser reconstruída do zero.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- Como perceber que um arquivo mudou (tamanho e mtime) sem relê-lo
+- O que é "debounce" e por que esperar o arquivo parar de mudar
+- Como atualizar estruturas derivadas só com os dados novos
+- Como trocar dados compartilhados entre sessões sem travar a leitura
+==============================================================================
+"""
+
+import itertools
+import os
+import threading
+import time
+
+import pandas as pd
+
+import cubo_olap
+import indice_bitmap
+import paginacao_tabela
+from esquema_chamados import COLUNAS_CATEGORICAS, ORDEM_PRIORIDADE
+from gerador_relatorio import tratar_dados
+from ingestao_incremental import estado_ainda_valido, hash_conferencia, ler_cauda_em_blocos
+
+# ==============================================================================
+# COMO FUNCIONA O MODO AO VIVO
+# ==============================================================================
+#
+# 1. VIGIAR: a cada verificação olhamos só o tamanho e o mtime do CSV
+#    (os.stat, sem abrir o arquivo). Se nada mudou, não há o que fazer.
+#
+# 2. ESPERAR (debounce): o helpdesk costuma gravar várias linhas em
+#    sequência. Se lêssemos a cada mudança, processaríamos dezenas de
+#    pedacinhos. Então só lemos quando o arquivo fica ESPERA segundos sem
+#    mudar: uma rajada de gravações vira uma única atualização.
+#
+# 3. LER SÓ O FINAL: guardamos até qual byte já lemos (o offset), como na
+#    ingestão incremental. Lemos do offset até a última linha completa;
+#    uma linha ainda sendo escrita fica para a próxima vez.
+#
+# 4. ACRESCENTAR: as linhas novas são tratadas (tratar_dados) e somadas:
+#
+#       DataFrame      → concat das linhas novas no final
+#       índice bitmap  → bits das linhas novas no final de cada bitmap
+#       cubo / tempos  → cubo das linhas novas somado ao cubo atual
+#       ordem tabela   → linhas novas intercaladas na ordem existente
+#
+#    Nada é reagrupado nem reordenado desde o início.
+#
+# 5. TROCAR: a visão nova é montada ao lado da antiga e trocada em UMA
+#    atribuição. Uma sessão que estava lendo a visão antiga continua com
+#    ela até o fim do seu rerun; não existe visão "pela metade".
+#
+# Se o arquivo foi reescrito (diminuiu ou o trecho já lido mudou), as
+# linhas antigas não valem mais: aí, e só aí, tudo é lido de novo.
+
+# Segundos entre duas verificações do arquivo (em cada sessão aberta)
+INTERVALO_VERIFICACAO_PADRAO = 5.0
+
+# Segundos que o arquivo precisa ficar sem mudar antes de ser lido (debounce)
+ESPERA_ESTABILIDADE_PADRAO = 2.0
+
+# Numera as visões montadas neste processo. O número de linhas não serve
+# como versão: um CSV reescrito com as mesmas linhas (chamados fechados no
+# lugar) teria a mesma versão e as figuras em cache não seriam refeitas.
+_CONTADOR_VERSOES = itertools.count(1)
+
+
+def tipos_unificados(partes):
+    """
+    Tipos categóricos que comportam os valores de todas as partes.
+
+    Um setor que aparece pela primeira vez nas linhas novas precisa
+    entrar nas categorias, senão o concat vira texto (object). As
+    categorias continuam na ordem do esquema: alfabética e, na
+    prioridade, a ORDEM_PRIORIDADE (desconhecidas no início).
+
+    Retorna:
+        dict: {coluna: CategoricalDtype}
+    """
+    tipos = {}
+    for coluna in COLUNAS_CATEGORICAS:
+        primeiro = partes[0][coluna].dtype
+        if all(parte[coluna].dtype == primeiro for parte in partes[1:]):
+            tipos[coluna] = primeiro
+            continue
+        valores = set()
+        for parte in partes:
+            valores.update(parte[coluna].cat.categories)
+        if coluna == 'prioridade':
+            desconhecidas = sorted(valores - set(ORDEM_PRIORIDADE))
+            tipos[coluna] = pd.CategoricalDtype(desconhecidas + ORDEM_PRIORIDADE, ordered=True)
+        else:
+            tipos[coluna] = pd.CategoricalDtype(sorted(valores))
+    return tipos
+
+
+def juntar_partes(partes):
+    """Concatena DataFrames tratados mantendo as colunas categóricas."""
+    tipos = tipos_unificados(partes)
+    return pd.concat([parte.astype(tipos) for parte in partes], ignore_index=True)
+
+
+def ler_linhas_novas(caminho_arquivo, leitura):
+    """
+    Lê e trata as linhas completas depois do offset já lido.
+
+    Parâmetros:
+        caminho_arquivo (str): Caminho do CSV de chamados
+        leitura (dict): {'offset', 'cabecalho', 'conferencia'} da leitura
+                        anterior (offset 0 = arquivo ainda não lido)
+
+    Retorna:
+        tuple: (DataFrame tratado ou None se não houver linhas novas,
+                leitura atualizada)
+    """
+    leitura = dict(leitura)
+    partes = []
+    with open(caminho_arquivo, 'rb') as arquivo:
+        if leitura['offset'] == 0:
+            linha_cabecalho = arquivo.readline()
+            leitura['cabecalho'] = linha_cabecalho.decode('utf-8').rstrip('\r\n')
+            leitura['offset'] = len(linha_cabecalho)
+
+        nomes_colunas = leitura['cabecalho'].split(',')
+        for bloco, novo_offset in ler_cauda_em_blocos(arquivo, leitura['offset'], nomes_colunas):
+            partes.append(tratar_dados(bloco, exibir_mensagens=False))
+            leitura['offset'] = novo_offset
+
+        leitura['conferencia'] = hash_conferencia(arquivo, leitura['offset'])
+
+    if not partes:
+        return None, leitura
+    return juntar_partes(partes), leitura
+
+
+def montar_visao(df, colunas_filtro):
+    """
+    Monta do zero tudo o que o dashboard consulta (uma vez, na partida).
+
+    Parâmetros:
+        df (DataFrame): Dados tratados
+        colunas_filtro (list): Colunas indexadas no índice bitmap
+
+    Retorna:
+        dict: {'df', 'indice', 'cubo', 'cubo_tempos', 'ordem', 'versao'}
+    """
+    return {
+        'df': df,
+        'indice': indice_bitmap.construir_indice(df, colunas_filtro),
+        'cubo': cubo_olap.construir_cubo(df),
+        'cubo_tempos': cubo_olap.construir_cubo_tempos(df),
+        'ordem': paginacao_tabela.construir_ordem(df),
+        # Nova a cada visão montada ou ampliada (nunca se repete no processo)
+        'versao': next(_CONTADOR_VERSOES),
+    }
+
+
+def anexar_a_visao(visao, df_novo):
+    """
+    Monta a visão com as linhas novas, reaproveitando a visão atual.
+
+    A visão atual não é alterada (outras sessões podem estar lendo).
+
+    Parâmetros:
+        visao (dict): Resultado de montar_visao()/anexar_a_visao()
+        df_novo (DataFrame): Linhas novas, já tratadas
+
+    Retorna:
+        dict: Nova visão, no mesmo formato
+    """
+    df = juntar_partes([visao['df'], df_novo])
+    # Linhas novas já com as categorias unificadas
+    novas = df.iloc[len(visao['df']):]
+    return {
+        'df': df,
+        'indice': indice_bitmap.anexar_linhas(visao['indice'], novas),
+        'cubo': cubo_olap.combinar_cubos(visao['cubo'], cubo_olap.construir_cubo(novas)),
+        'cubo_tempos': cubo_olap.combinar_cubos(visao['cubo_tempos'],
+                                                cubo_olap.construir_cubo_tempos(novas)),
+        'ordem': paginacao_tabela.anexar_ordem(visao['ordem'], df, len(visao['df'])),
+        'versao': next(_CONTADOR_VERSOES),
+    }
+
+
+def abrir_base(caminho_arquivo, colunas_filtro):
+    """
+    Lê o CSV inteiro e prepara o acompanhamento das linhas novas.
+
+    Parâmetros:
+        caminho_arquivo (str): Caminho do CSV de chamados
+        colunas_filtro (list): Colunas indexadas no índice bitmap
+
+    Retorna:
+        dict: Base compartilhada; a visão atual fica em base['visao']
+    """
+    leitura = {'offset': 0, 'cabecalho': None, 'conferencia': None}
+    info = os.stat(caminho_arquivo)
+    df, leitura = ler_linhas_novas(caminho_arquivo, leitura)
+    if df is None:
+        raise ValueError(f"O arquivo '{caminho_arquivo}' não tem nenhum chamado")
+
+    assinatura = (info.st_size, info.st_mtime_ns)
+    return {
+        'caminho': caminho_arquivo,
+        'colunas_filtro': colunas_filtro,
+        'leitura': leitura,
+        'visao': montar_visao(df, colunas_filtro),
+        # (tamanho, mtime) visto na última verificação e desde quando
+        'observado': assinatura,
+        'observado_em': time.monotonic(),
+        # (tamanho, mtime) do arquivo na última leitura aplicada
+        'aplicado': assinatura,
+        'trava': threading.Lock(),
+    }
+
+
+def verificar_atualizacao(base, espera=ESPERA_ESTABILIDADE_PADRAO):
+    """
+    Confere o arquivo e, se ele cresceu e já está estável, aplica as
+    linhas novas à visão.
+
+    Várias sessões chamam esta função; só uma por vez lê o arquivo.
+    As outras seguem com a visão atual e pegam a nova na próxima vez.
+
+    Parâmetros:
+        base (dict): Resultado de abrir_base()
+        espera (float): Segundos sem mudança antes de ler (debounce)
+
+    Retorna:
+        bool: True se a visão foi atualizada nesta chamada
+    """
+    try:
+        info = os.stat(base['caminho'])
+    except FileNotFoundError:
+        # Arquivo sendo substituído: tenta de novo na próxima verificação
+        return False
+
+    atual = (info.st_size, info.st_mtime_ns)
+    agora = time.monotonic()
+    if atual != base['observado']:
+        base['observado'] = atual
+        base['observado_em'] = agora
+    if atual == base['aplicado'] or agora - base['observado_em'] < espera:
+        return False
+
+    # Outra sessão já está lendo o arquivo: não espera por ela
+    if not base['trava'].acquire(blocking=False):
+        return False
+    try:
+        with open(base['caminho'], 'rb') as arquivo:
+            valido = estado_ainda_valido(base['leitura'], arquivo, info.st_size)
+
+        if valido:
+            df_novo, leitura = ler_linhas_novas(base['caminho'], base['leitura'])
+            visao = base['visao'] if df_novo is None else anexar_a_visao(base['visao'], df_novo)
+        else:
+            # Arquivo reescrito: as linhas já lidas não valem mais
+            leitura = {'offset': 0, 'cabecalho': None, 'conferencia': None}
+            df, leitura = ler_linhas_novas(base['caminho'], leitura)
+            if df is None:
+                return False
+            visao = montar_visao(df, base['colunas_filtro'])
+
+        atualizou = visao is not base['visao']
+        base['leitura'] = leitura
+        base['aplicado'] = atual
+        # Uma única atribuição: quem ler base['visao'] vê a antiga ou a nova
+        base['visao'] = visao
+        return atualizou
+    finally:
+        base['trava'].release()
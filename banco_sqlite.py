@@ -0,0 +1,588 @@
+"""
+==============================================================================
+BANCO SQLITE COM ÍNDICES (CONSULTAS SEM O DATAFRAME INTEIRO)
+==============================================================================
+Descrição: Carrega os chamados tratados em um banco SQLite local, com
+           índices nas colunas mais filtradas. As métricas do relatório e
+           os agregados do dashboard viram consultas SQL (COUNT, SUM,
+           GROUP BY) executadas DENTRO do banco: só os resultados, que são
+           pequenos, voltam para o Python.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- Como usar o sqlite3 (biblioteca padrão do Python) com o Pandas
+- O que é um índice de banco de dados e quando ele ajuda
+- O que é "empurrar" (push down) uma agregação para o banco
+- Por que usar parâmetros '?' em vez de colar valores no texto do SQL
+==============================================================================
+"""
+
+import os
+import sqlite3
+from contextlib import closing
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from cache_colunar import nome_cache
+from cubo_olap import DIMENSOES
+from esquema_chamados import COLUNAS_CATEGORICAS, COLUNAS_DATA, aplicar_esquema, chave_ordenacao
+from gerador_relatorio import (
+    COLUNAS_CONTAGEM,
+    COLUNAS_PERCENTIS,
+    TAMANHO_BLOCO_PADRAO,
+    carregar_dados_em_blocos,
+    criar_estado_metricas,
+    exibir_metricas,
+    finalizar_metricas,
+    tratar_dados,
+)
+from serie_backlog import DIMENSOES_BACKLOG, TOTAL, montar_serie_backlog
+from sketch_quantis import indices_baldes, sketch_de_contagens
+
+# ==============================================================================
+# COMO FUNCIONA O BANCO
+# ==============================================================================
+#
+# Sem banco: para responder "quantos chamados abertos no setor TI?", o
+# DataFrame inteiro precisa estar na memória, mesmo que a resposta seja
+# um número só.
+#
+# Com o banco:
+#
+#   SELECT status, COUNT(*) FROM chamados WHERE setor = 'TI' GROUP BY status
+#
+# O SQLite lê o arquivo do disco aos poucos (páginas de 4 KB, com um cache
+# de tamanho fixo). A memória do Python não depende mais do tamanho da base:
+# só os resultados das consultas chegam até ele.
+#
+# ÍNDICES: um índice é uma cópia ORDENADA de uma coluna, com o número de
+# cada linha (como o índice remissivo de um livro). Com o índice de
+# 'setor', o filtro setor = 'TI' vai direto às linhas do TI, sem ler as
+# outras. Criamos índices nas colunas dos filtros e do período:
+# data_abertura, status, prioridade, setor e responsavel.
+#
+# DATAS viram texto 'AAAA-MM-DD HH:MM:SS'. Nesse formato a ordem
+# alfabética é a ordem cronológica: comparações (>=, <=), ORDER BY e o
+# índice funcionam, e substr(data, 1, 10) é o dia.
+#
+# PERCENTIS: cada tempo ganha, na carga, a coluna balde_tempo (o balde do
+# sketch de quantis, ver sketch_quantis.py). O histograma de um grupo é
+# um GROUP BY balde_tempo, e os percentis saem dele como no modo normal.
+#
+# O banco é montado uma vez por versão do CSV (tamanho e mtime ficam na
+# tabela 'meta') e depois é só consultado, pelo relatório e pelo dashboard.
+
+# Versão do formato do banco. Aumente quando as colunas mudarem.
+VERSAO_BANCO = 1
+
+# Colunas gravadas no banco (as mesmas dos dados tratados + o balde)
+COLUNAS_BANCO = (['id_chamado'] + COLUNAS_DATA + COLUNAS_CATEGORICAS
+                 + ['tempo_atendimento_horas', 'balde_tempo'])
+
+TIPOS_SQL = {'id_chamado': 'INTEGER', 'tempo_atendimento_horas': 'REAL', 'balde_tempo': 'INTEGER'}
+
+# Colunas com índice
+COLUNAS_INDICE = ['data_abertura', 'status', 'prioridade', 'setor', 'responsavel']
+
+FORMATO_DATA = '%Y-%m-%d %H:%M:%S'
+
+# Quantos caracteres da data identificam o período do backlog
+CARACTERES_PERIODO = {'D': 10, 'h': 13}  # 'AAAA-MM-DD' e 'AAAA-MM-DD HH'
+FORMATO_PERIODO = {'D': '%Y-%m-%d', 'h': '%Y-%m-%d %H'}
+
+
+def caminho_banco_padrao(caminho_arquivo, pasta='.cache_chamados'):
+    """Caminho do banco de um CSV (ex.: .cache_chamados/chamados_ti-1a2b3c4d.sqlite)."""
+    return os.path.join(pasta, f'{nome_cache(caminho_arquivo)}.sqlite')
+
+
+def conectar(caminho_banco):
+    """
+    Abre o banco só para leitura.
+
+    Cada consulta abre a sua conexão (é barato no SQLite): uma conexão
+    não pode ser usada por várias threads, e o dashboard atende cada
+    sessão em uma thread.
+    """
+    if not os.path.exists(caminho_banco):
+        raise FileNotFoundError(f"Banco não encontrado: {caminho_banco} (use carregar_no_banco)")
+    return sqlite3.connect(f'file:{quote(os.path.abspath(caminho_banco))}?mode=ro', uri=True)
+
+
+def ler_meta(caminho_banco):
+    """Lê a tabela 'meta' do banco (None se o banco não existir ou for inválido)."""
+    if not os.path.exists(caminho_banco):
+        return None
+    try:
+        with closing(conectar(caminho_banco)) as conexao:
+            return dict(conexao.execute('SELECT chave, valor FROM meta'))
+    except sqlite3.DatabaseError:
+        return None
+
+
+def linhas_para_banco(df_tratado):
+    """
+    Converte um bloco tratado nas tuplas do INSERT.
+
+    Datas viram texto no formato fixo; nulos (NaN/NaT) viram None (NULL).
+
+    Retorna:
+        zip: Uma tupla por chamado, na ordem de COLUNAS_BANCO
+    """
+    colunas = {}
+    for coluna in COLUNAS_BANCO[:-1]:
+        serie = df_tratado[coluna]
+        if coluna in COLUNAS_DATA:
+            serie = serie.dt.strftime(FORMATO_DATA)
+        serie = serie.astype(object)
+        colunas[coluna] = serie.where(serie.notna(), None).tolist()
+
+    tempos = df_tratado['tempo_atendimento_horas'].to_numpy()
+    validos = ~np.isnan(tempos)
+    baldes = np.full(len(tempos), None, dtype=object)
+    baldes[validos] = indices_baldes(tempos[validos]).tolist()
+    colunas['balde_tempo'] = baldes.tolist()
+
+    return zip(*colunas.values())
+
+
+def carregar_no_banco(caminho_arquivo, caminho_banco=None, tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+                      exibir_mensagens=True):
+    """
+    Carrega o CSV no banco SQLite, bloco a bloco (memória constante).
+
+    Se o banco já foi montado a partir desta mesma versão do CSV (tamanho
+    e mtime iguais), nada é feito.
+
+    Parâmetros:
+        caminho_arquivo (str): Caminho do CSV de chamados
+        caminho_banco (str): Caminho do banco (padrão: .cache_chamados/)
+        tamanho_bloco (int): Linhas por bloco na carga
+        exibir_mensagens (bool): Se False, não imprime o progresso
+
+    Retorna:
+        str: Caminho do banco
+    """
+    if exibir_mensagens:
+        print("\n" + "="*60)
+        print("🗄️ CARGA NO BANCO SQLITE")
+        print("="*60)
+
+    if caminho_banco is None:
+        caminho_banco = caminho_banco_padrao(caminho_arquivo)
+
+    info = os.stat(caminho_arquivo)
+    assinatura = {
+        'versao': str(VERSAO_BANCO),
+        'tamanho': str(info.st_size),
+        'mtime_ns': str(info.st_mtime_ns),
+    }
+    meta = ler_meta(caminho_banco)
+    if meta is not None and all(meta.get(chave) == valor for chave, valor in assinatura.items()):
+        if exibir_mensagens:
+            print(f"   ⚡ Banco já atualizado: {caminho_banco} ({meta['linhas']} chamados)")
+        return caminho_banco
+
+    pasta = os.path.dirname(caminho_banco)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+
+    # Monta em um arquivo temporário e troca no final: quem estiver
+    # consultando o banco antigo nunca vê um banco pela metade
+    temporario = f'{caminho_banco}.{os.getpid()}.tmp'
+    if os.path.exists(temporario):
+        os.remove(temporario)
+
+    linhas = 0
+    with closing(sqlite3.connect(temporario)) as conexao:
+        # Arquivo temporário: sem journal nem fsync a cada transação
+        conexao.execute('PRAGMA journal_mode = OFF')
+        conexao.execute('PRAGMA synchronous = OFF')
+        definicoes = ', '.join(f'{coluna} {TIPOS_SQL.get(coluna, "TEXT")}' for coluna in COLUNAS_BANCO)
+        conexao.execute(f'CREATE TABLE chamados ({definicoes})')
+        conexao.execute('CREATE TABLE meta (chave TEXT PRIMARY KEY, valor TEXT)')
+
+        marcadores = ', '.join('?' for _ in COLUNAS_BANCO)
+        for bloco in carregar_dados_em_blocos(caminho_arquivo, tamanho_bloco):
+            bloco_tratado = tratar_dados(bloco, exibir_mensagens=False)
+            conexao.executemany(f'INSERT INTO chamados VALUES ({marcadores})',
+                                linhas_para_banco(bloco_tratado))
+            linhas += len(bloco_tratado)
+
+        # Índices criados depois da carga: ordenar cada coluna uma vez é
+        # bem mais rápido do que atualizar o índice a cada INSERT
+        for coluna in COLUNAS_INDICE:
+            conexao.execute(f'CREATE INDEX idx_chamados_{coluna} ON chamados ({coluna})')
+        # Estatísticas que ajudam o SQLite a escolher o melhor índice
+        conexao.execute('ANALYZE')
+
+        conexao.executemany('INSERT INTO meta VALUES (?, ?)',
+                            list({**assinatura, 'linhas': str(linhas)}.items()))
+        conexao.commit()
+
+    os.replace(temporario, caminho_banco)
+    if exibir_mensagens:
+        print(f"   ✅ {linhas} chamados gravados em {caminho_banco}")
+        print(f"   Índices: {', '.join(COLUNAS_INDICE)}")
+    return caminho_banco
+
+
+# ==============================================================================
+# FILTROS (CLÁUSULA WHERE)
+# ==============================================================================
+
+def montar_filtro(filtros=None, data_inicio=None, data_fim=None):
+    """
+    Monta a cláusula WHERE dos filtros e do período.
+
+    Os valores vão como parâmetros '?' (o SQLite os trata como dados,
+    nunca como SQL): um setor chamado "TI' OR '1'='1" não quebra nada.
+
+    Parâmetros:
+        filtros (dict): {coluna: valor}; valores None são ignorados
+        data_inicio: Início do período (data_abertura >=)
+        data_fim: Fim do período, inclusive (só a data = o dia inteiro)
+
+    Retorna:
+        tuple: (texto ' WHERE ...' ou '', lista de parâmetros)
+    """
+    condicoes, parametros = [], []
+    for coluna, valor in (filtros or {}).items():
+        if valor is None:
+            continue
+        if coluna not in COLUNAS_CATEGORICAS:
+            raise ValueError(f"Filtro desconhecido: {coluna}")
+        condicoes.append(f'{coluna} = ?')
+        parametros.append(valor)
+
+    if data_inicio is not None:
+        condicoes.append('data_abertura >= ?')
+        parametros.append(pd.Timestamp(data_inicio).strftime(FORMATO_DATA))
+    if data_fim is not None:
+        fim = pd.Timestamp(data_fim)
+        if fim == fim.normalize():
+            # Só a data (sem hora): inclui o dia inteiro, como filtrar_periodo()
+            condicoes.append('data_abertura < ?')
+            parametros.append((fim + pd.Timedelta(days=1)).strftime(FORMATO_DATA))
+        else:
+            condicoes.append('data_abertura <= ?')
+            parametros.append(fim.strftime(FORMATO_DATA))
+
+    return (' WHERE ' + ' AND '.join(condicoes)) if condicoes else '', parametros
+
+
+def mais_condicao(where, condicao):
+    """Acrescenta uma condição (com AND) a uma cláusula WHERE já montada."""
+    return f'{where} AND {condicao}' if where else f' WHERE {condicao}'
+
+
+# ==============================================================================
+# MÉTRICAS DO RELATÓRIO (AGREGAÇÕES NO BANCO)
+# ==============================================================================
+
+def calcular_estado_sql(conexao, where='', parametros=()):
+    """
+    Calcula o estado das métricas com consultas agregadas.
+
+    É o mesmo estado de calcular_estado_metricas() (contagens, somas,
+    mínimos, máximos e sketches), só que os ingredientes vêm de GROUP BY
+    no banco, e não de uma passada pelo DataFrame:
+
+    - as contagens por coluna são lidas dos índices (sem abrir a tabela)
+    - todo o resto sai de UMA consulta: os chamados fechados agrupados por
+      prioridade, tipo, responsável e balde_tempo. O resultado tem poucos
+      milhares de linhas, e as somas finais são feitas aqui.
+
+    Parâmetros:
+        conexao: Conexão com o banco
+        where (str): Cláusula de montar_filtro()
+        parametros (list): Parâmetros da cláusula
+
+    Retorna:
+        dict: Estado no formato de criar_estado_metricas()
+    """
+    estado = criar_estado_metricas()
+    tempo = 'tempo_atendimento_horas'
+
+    estado['total_chamados'] = conexao.execute(
+        f'SELECT COUNT(*) FROM chamados{where}', parametros).fetchone()[0]
+
+    for chave, coluna in COLUNAS_CONTAGEM.items():
+        # Os chamados foram gravados na ordem do CSV: MIN(rowid) é a primeira
+        # aparição de cada valor (o desempate das contagens, como na memória)
+        estado['contagens'][chave] = dict(conexao.execute(
+            f'SELECT {coluna}, COUNT(*) FROM chamados{mais_condicao(where, f"{coluna} IS NOT NULL")} '
+            f'GROUP BY {coluna} ORDER BY MIN(rowid)', parametros))
+
+    dimensoes = list(COLUNAS_PERCENTIS.values())
+    grupos = pd.DataFrame(
+        conexao.execute(
+            f'SELECT {", ".join(dimensoes)}, balde_tempo, COUNT(*), TOTAL({tempo}), '
+            f'MIN({tempo}), MAX({tempo}) FROM chamados{mais_condicao(where, f"{tempo} IS NOT NULL")} '
+            f'GROUP BY {", ".join(dimensoes)}, balde_tempo', parametros).fetchall(),
+        columns=dimensoes + ['balde', 'quantidade', 'soma', 'minimo', 'maximo'],
+    )
+
+    # Prioridades só com chamados abertos entram com quantidade 0,
+    # para aparecerem como NaN, igual ao groupby().mean()
+    for prioridade in estado['contagens']['por_prioridade']:
+        estado['tempo_prioridade'][prioridade] = [0.0, 0]
+    if grupos.empty:
+        return estado
+
+    estado['tempo_soma'] = float(grupos['soma'].sum())
+    estado['tempo_qtd'] = int(grupos['quantidade'].sum())
+    estado['tempo_min'] = float(grupos['minimo'].min())
+    estado['tempo_max'] = float(grupos['maximo'].max())
+    for prioridade, grupo in grupos.groupby('prioridade'):
+        estado['tempo_prioridade'][prioridade] = [float(grupo['soma'].sum()),
+                                                  int(grupo['quantidade'].sum())]
+
+    # Sketches: o histograma por balde de cada valor (+ mínimo e máximo exatos)
+    def sketch(grupo):
+        histograma = grupo.groupby('balde')['quantidade'].sum()
+        return sketch_de_contagens(histograma.index.to_numpy(), histograma.to_numpy(),
+                                   grupo['minimo'].min(), grupo['maximo'].max())
+
+    estado['sketches']['geral'] = sketch(grupos)
+    for chave, coluna in COLUNAS_PERCENTIS.items():
+        # groupby ignora os chamados sem valor na coluna
+        estado['sketches'][chave] = {valor: sketch(grupo) for valor, grupo in grupos.groupby(coluna)}
+
+    return estado
+
+
+def contar_eventos_sql(conexao, where='', parametros=(), frequencia='D',
+                       dimensoes=DIMENSOES_BACKLOG):
+    """
+    Saldos de abertura (+1) e fechamento (-1) por período, somados no banco.
+
+    Mesmas regras de serie_backlog.contar_eventos(): chamados sem abertura
+    ficam de fora e o fechamento antes da abertura conta na abertura.
+
+    Parâmetros:
+        conexao: Conexão com o banco
+        where (str): Cláusula de montar_filtro()
+        parametros (list): Parâmetros da cláusula
+        frequencia (str): 'D' (dia) ou 'h' (hora)
+        dimensoes (list): Colunas com série própria
+
+    Retorna:
+        DataFrame: [periodo, dimensao, valor, saldo], como contar_eventos()
+    """
+    caracteres = CARACTERES_PERIODO[frequencia]
+    dimensoes = list(dimensoes)
+
+    # Uma consulta só, agrupada por período de abertura, período de
+    # fechamento e todas as dimensões. As séries de cada dimensão são
+    # somadas aqui, sobre poucas linhas, em vez de uma passada pela tabela
+    # para cada dimensão. MAX() de dois textos no formato fixo = a data
+    # mais recente (e NULL se o chamado não foi fechado).
+    linhas = conexao.execute(
+        f'SELECT substr(data_abertura, 1, {caracteres}), '
+        f'substr(MAX(data_fechamento, data_abertura), 1, {caracteres}), '
+        f'{", ".join(dimensoes + ["COUNT(*)"])} '
+        f'FROM chamados{mais_condicao(where, "data_abertura IS NOT NULL")} '
+        f'GROUP BY {", ".join(["1", "2"] + dimensoes)}', parametros).fetchall()
+    grupos = pd.DataFrame(linhas, columns=['abertura', 'fechamento'] + dimensoes + ['quantidade'])
+
+    # Aberturas somam, fechamentos subtraem
+    fechados = grupos.dropna(subset=['fechamento'])
+    saldos = pd.concat([
+        grupos.drop(columns='fechamento').rename(columns={'abertura': 'periodo'}),
+        fechados.drop(columns='abertura').rename(columns={'fechamento': 'periodo'})
+                .assign(quantidade=-fechados['quantidade']),
+    ], ignore_index=True).rename(columns={'quantidade': 'saldo'})
+
+    partes = []
+    for dimensao in [TOTAL] + dimensoes:
+        chaves = ['periodo'] if dimensao == TOTAL else ['periodo', dimensao]
+        # groupby ignora os nulos da dimensão e mantém os períodos de saldo 0
+        serie = saldos.groupby(chaves)['saldo'].sum().reset_index()
+        partes.append(pd.DataFrame({
+            'periodo': serie['periodo'],
+            'dimensao': dimensao,
+            'valor': TOTAL if dimensao == TOTAL else serie[dimensao],
+            'saldo': serie['saldo'],
+        }))
+
+    eventos = pd.concat(partes, ignore_index=True)
+    eventos['periodo'] = pd.to_datetime(eventos['periodo'], format=FORMATO_PERIODO[frequencia])
+    eventos['periodo'] = eventos['periodo'].astype('datetime64[ns]')
+    eventos['saldo'] = eventos['saldo'].astype('int64')
+    return eventos
+
+
+def calcular_metricas_sql(caminho_banco, filtros=None, data_inicio=None, data_fim=None,
+                          exibir_mensagens=True):
+    """
+    Calcula as métricas do relatório direto no banco.
+
+    Parâmetros:
+        caminho_banco (str): Banco montado por carregar_no_banco()
+        filtros (dict): {coluna: valor} (opcional)
+        data_inicio, data_fim: Período (data de abertura, fim inclusive)
+        exibir_mensagens (bool): Se False, não imprime as métricas
+
+    Retorna:
+        dict: Métricas no mesmo formato de calcular_metricas()
+    """
+    if exibir_mensagens:
+        print("\n" + "="*60)
+        print("📊 CÁLCULO DE MÉTRICAS (SQLITE)")
+        print("="*60)
+
+    where, parametros = montar_filtro(filtros, data_inicio, data_fim)
+    with closing(conectar(caminho_banco)) as conexao:
+        metricas = finalizar_metricas(calcular_estado_sql(conexao, where, parametros))
+        metricas['backlog'] = montar_serie_backlog(contar_eventos_sql(conexao, where, parametros))
+
+    if exibir_mensagens:
+        exibir_metricas(metricas)
+        print("\n✅ Cálculo de métricas concluído!")
+
+    return metricas
+
+
+def restaurar_tipos(bloco):
+    """Converte as datas, o id e o tempo lidos do banco de volta para os tipos dos dados tratados."""
+    for coluna in COLUNAS_DATA:
+        if coluna in bloco.columns:
+            bloco[coluna] = pd.to_datetime(bloco[coluna], format=FORMATO_DATA)
+    if 'id_chamado' in bloco.columns:
+        bloco['id_chamado'] = bloco['id_chamado'].astype('int32')
+    if 'tempo_atendimento_horas' in bloco.columns:
+        bloco['tempo_atendimento_horas'] = bloco['tempo_atendimento_horas'].astype('float64')
+    return bloco
+
+
+def ler_blocos_do_banco(caminho_banco, tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+                        data_inicio=None, data_fim=None):
+    """
+    Lê os chamados de volta, em blocos, com os tipos dos dados tratados.
+
+    Serve para a aba Dados_Completos do relatório sem carregar a base inteira.
+
+    Retorna:
+        Gerador de DataFrames (na ordem do CSV)
+    """
+    where, parametros = montar_filtro(None, data_inicio, data_fim)
+    colunas = ', '.join(COLUNAS_BANCO[:-1])
+    with closing(conectar(caminho_banco)) as conexao:
+        for bloco in pd.read_sql_query(f'SELECT {colunas} FROM chamados{where} ORDER BY rowid',
+                                       conexao, params=parametros, chunksize=tamanho_bloco):
+            yield aplicar_esquema(restaurar_tipos(bloco))
+
+
+# ==============================================================================
+# CONSULTAS DO DASHBOARD
+# ==============================================================================
+#
+# O dashboard (streamlit run dashboard.py -- --sqlite) não guarda a base:
+# cada card, gráfico e página da tabela é uma consulta com os filtros no
+# WHERE, respondida pelos índices.
+
+def consultar_cubo(caminho_banco, filtros=None, tempos=False):
+    """
+    Cubo (ou cubo de tempos) dos chamados filtrados, agregado no banco.
+
+    O resultado tem o formato de cubo_olap.construir_cubo() (ou de
+    construir_cubo_tempos()), então consolidar(), totais() e percentis()
+    funcionam sem mudança.
+
+    Parâmetros:
+        caminho_banco (str): Caminho do banco
+        filtros (dict): {coluna: valor}; valores None são ignorados
+        tempos (bool): Se True, o cubo de tempos (por balde)
+
+    Retorna:
+        DataFrame: Cubo com as dimensões categóricas (na ordem do esquema)
+    """
+    where, parametros = montar_filtro(filtros)
+    dimensoes = ', '.join(DIMENSOES)
+    if tempos:
+        sql = (f'SELECT {dimensoes}, balde_tempo AS balde, COUNT(*) AS quantidade '
+               f'FROM chamados{mais_condicao(where, "tempo_atendimento_horas IS NOT NULL")} '
+               f'GROUP BY {dimensoes}, balde_tempo')
+    else:
+        sql = (f'SELECT {dimensoes}, COUNT(*) AS quantidade, '
+               f'TOTAL(tempo_atendimento_horas) AS soma_tempo, '
+               f'COUNT(tempo_atendimento_horas) AS qtd_tempo '
+               f'FROM chamados{where} GROUP BY {dimensoes}')
+
+    with closing(conectar(caminho_banco)) as conexao:
+        cubo = pd.read_sql_query(sql, conexao, params=parametros)
+
+    # Categorias na mesma ordem do modo normal (prioridade: Baixa → Critica)
+    for dimensao in DIMENSOES:
+        valores = sorted(cubo[dimensao].dropna().unique(), key=chave_ordenacao(dimensao))
+        cubo[dimensao] = pd.Categorical(cubo[dimensao], categories=valores,
+                                        ordered=dimensao == 'prioridade')
+    return cubo
+
+
+def valores_distintos(caminho_banco, coluna):
+    """Valores de uma coluna (lidos do índice), na ordem do esquema."""
+    if coluna not in COLUNAS_CATEGORICAS:
+        raise ValueError(f"Coluna desconhecida: {coluna}")
+    with closing(conectar(caminho_banco)) as conexao:
+        valores = [valor for (valor,) in conexao.execute(
+            f'SELECT DISTINCT {coluna} FROM chamados WHERE {coluna} IS NOT NULL')]
+    return sorted(valores, key=chave_ordenacao(coluna))
+
+
+def periodo_abertura(caminho_banco):
+    """
+    Primeira e última data de abertura (lidas das pontas do índice).
+
+    Retorna:
+        Series: [primeira, última] em datetime
+    """
+    with closing(conectar(caminho_banco)) as conexao:
+        primeira, ultima = conexao.execute(
+            'SELECT MIN(data_abertura), MAX(data_abertura) FROM chamados').fetchone()
+    return pd.to_datetime(pd.Series([primeira, ultima]), format=FORMATO_DATA)
+
+
+def contar_chamados(caminho_banco, filtros=None):
+    """Quantidade de chamados que atendem aos filtros."""
+    where, parametros = montar_filtro(filtros)
+    with closing(conectar(caminho_banco)) as conexao:
+        return conexao.execute(f'SELECT COUNT(*) FROM chamados{where}', parametros).fetchone()[0]
+
+
+def pagina_chamados(caminho_banco, filtros, pagina, tamanho_pagina, colunas):
+    """
+    Uma página da tabela, da abertura mais recente para a mais antiga.
+
+    Mesma ordem de paginacao_tabela.construir_ordem(): empates na ordem
+    do arquivo (rowid) e datas vazias no final (no SQLite, NULL é menor
+    que qualquer valor, então fica por último no DESC).
+
+    Parâmetros:
+        caminho_banco (str): Caminho do banco
+        filtros (dict): {coluna: valor}
+        pagina (int): Número da página, começando em 1
+        tamanho_pagina (int): Linhas por página
+        colunas (list): Colunas exibidas
+
+    Retorna:
+        DataFrame: No máximo 'tamanho_pagina' linhas
+    """
+    colunas = [coluna for coluna in colunas if coluna in COLUNAS_BANCO[:-1]]
+    where, parametros = montar_filtro(filtros)
+    sql = (f'SELECT {", ".join(colunas)} FROM chamados{where} '
+           f'ORDER BY data_abertura DESC, rowid LIMIT ? OFFSET ?')
+    with closing(conectar(caminho_banco)) as conexao:
+        pagina_df = pd.read_sql_query(
+            sql, conexao, params=parametros + [tamanho_pagina, (pagina - 1) * tamanho_pagina])
+    return restaurar_tipos(pagina_df)
+
+
+def serie_backlog_sql(caminho_banco, filtros=None, frequencia='D', dimensoes=DIMENSOES_BACKLOG):
+    """Série de backlog dos chamados filtrados (saldos somados no banco)."""
+    where, parametros = montar_filtro(filtros)
+    with closing(conectar(caminho_banco)) as conexao:
+        eventos = contar_eventos_sql(conexao, where, parametros, frequencia, dimensoes)
+    return montar_serie_backlog(eventos, frequencia)
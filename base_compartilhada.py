@@ -0,0 +1,178 @@
+"""
+==============================================================================
+BASE COMPARTILHADA (ARROW MAPEADO NA MEMÓRIA, SEM CÓPIA)
+==============================================================================
+Descrição: Grava a base tratada em um arquivo Arrow que pode ser aberto
+           como DataFrame SEM copiar os dados: as colunas apontam direto
+           para as páginas do arquivo mapeado na memória. Todas as sessões
+           do dashboard (e outros processos que abrirem o mesmo arquivo)
+           leem as mesmas páginas, somente leitura.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- A diferença entre "ler" um arquivo e "mapear" um arquivo (mmap)
+- Por que valores nulos impedem a leitura sem cópia (zero-copy)
+- Como montar um DataFrame em cima de arrays que já existem
+==============================================================================
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from cache_colunar import (
+    PASTA_CACHE_PADRAO,
+    VERSAO_SNAPSHOT,
+    assinatura_arquivo,
+    caminhos_cache,
+    remover_snapshots_antigos,
+)
+from gerador_relatorio import carregar_dados_com_cache
+
+# ==============================================================================
+# COMO FUNCIONA A BASE COMPARTILHADA
+# ==============================================================================
+#
+# O snapshot do cache colunar já é mapeado na memória, mas o to_pandas()
+# ainda COPIA as colunas para o heap do processo: as datas nulas viram NaT
+# e as categorias viram pd.Categorical. Cada processo fica com a sua cópia.
+#
+# Aqui o arquivo é gravado já no formato da memória do pandas, sem nulos
+# do Arrow (que exigiriam conversão):
+#
+#   datas        → int64, com NaT guardado como o próprio valor do NaT
+#   categorias   → códigos int8/int16 (-1 = nulo), categorias nos metadados
+#   números      → como estão (NaN já é o nulo do float)
+#
+# Na leitura, cada coluna é só uma "vista" numpy sobre o arquivo mapeado
+# (to_numpy(zero_copy_only=True)): abrir 1 milhão de linhas custa ~1 MB de
+# memória do processo. O sistema operacional traz as páginas do disco
+# quando são lidas e as guarda no cache de páginas, que é compartilhado:
+# dez processos abrindo o arquivo usam as mesmas páginas.
+#
+# Os arrays são somente leitura. Qualquer tentativa de alterar a base em
+# vez de criar uma vista (seleção, fatia) vira erro, e não uma cópia
+# silenciosa por sessão.
+
+# Versão do formato do arquivo. Aumente quando a gravação mudar.
+VERSAO_BASE = 1
+
+
+def gravar_base_compartilhada(df, caminho_base):
+    """
+    Grava o DataFrame tratado em Arrow IPC, pronto para leitura sem cópia.
+
+    Parâmetros:
+        df (DataFrame): Dados tratados
+        caminho_base (str): Arquivo .arrow gerado
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    colunas = {}
+    descricao = {}
+    for nome in df.columns:
+        serie = df[nome]
+        if serie.dtype.kind not in 'biufM' and not isinstance(serie.dtype, pd.CategoricalDtype):
+            # Texto livre também vira categoria: só os códigos vão para o arquivo
+            serie = serie.astype('category')
+
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            colunas[nome] = pa.array(serie.cat.codes.to_numpy())
+            descricao[nome] = {'categorias': serie.cat.categories.tolist(),
+                               'ordenada': bool(serie.cat.ordered)}
+        elif serie.dtype.kind == 'M':
+            colunas[nome] = pa.array(serie.to_numpy().view('int64'))
+            descricao[nome] = {'data': str(serie.dtype)}
+        else:
+            colunas[nome] = pa.array(serie.to_numpy())
+
+    metadados = {'versao': VERSAO_BASE, 'versao_snapshot': VERSAO_SNAPSHOT, 'colunas': descricao}
+    tabela = pa.table(colunas).replace_schema_metadata({'base_compartilhada': json.dumps(metadados)})
+
+    # Um único bloco por coluna: cada coluna vira um array contínuo no arquivo
+    caminho_temporario = f'{caminho_base}.{os.getpid()}.tmp'
+    with ipc.new_file(caminho_temporario, tabela.schema) as escritor:
+        escritor.write_table(tabela, max_chunksize=max(len(df), 1))
+    os.replace(caminho_temporario, caminho_base)
+
+
+def abrir_base_compartilhada(caminho_base):
+    """
+    Abre a base mapeada na memória, sem copiar as colunas.
+
+    Parâmetros:
+        caminho_base (str): Arquivo gravado por gravar_base_compartilhada()
+
+    Retorna:
+        DataFrame: Somente leitura, com os mesmos tipos do esquema
+                   (ou None se o arquivo for de outra versão)
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    tabela = ipc.open_file(pa.memory_map(caminho_base)).read_all()
+    metadados = json.loads((tabela.schema.metadata or {}).get(b'base_compartilhada', b'{}'))
+    if (metadados.get('versao') != VERSAO_BASE
+            or metadados.get('versao_snapshot') != VERSAO_SNAPSHOT):
+        return None
+
+    colunas = {}
+    for nome in tabela.column_names:
+        partes = tabela.column(nome).chunks
+        # Base vazia: não há bloco nenhum para mapear
+        valores = (partes[0].to_numpy(zero_copy_only=True) if partes
+                   else np.array([], dtype=tabela.schema.field(nome).type.to_pandas_dtype()))
+        descricao = metadados['colunas'].get(nome, {})
+        if 'categorias' in descricao:
+            tipo = pd.CategoricalDtype(descricao['categorias'], ordered=descricao['ordenada'])
+            colunas[nome] = pd.Categorical.from_codes(valores, dtype=tipo, validate=False)
+        elif 'data' in descricao:
+            colunas[nome] = valores.view(descricao['data'])
+        else:
+            colunas[nome] = valores
+
+    # copy=False: o DataFrame usa os arrays do arquivo, sem juntá-los em blocos novos
+    return pd.DataFrame(colunas, copy=False)
+
+
+def carregar_base_compartilhada(caminho_arquivo, pasta_cache=PASTA_CACHE_PADRAO):
+    """
+    Devolve a base tratada mapeada na memória, gravando-a se necessário.
+
+    A primeira chamada depois de uma mudança no CSV passa pelo cache
+    colunar (ou pelo CSV) e grava a base; as seguintes, neste ou em
+    outro processo, só mapeiam o arquivo.
+
+    Parâmetros:
+        caminho_arquivo (str): Caminho do CSV de origem
+        pasta_cache (str): Pasta onde ficam os snapshots
+
+    Retorna:
+        DataFrame: Dados tratados (mesmo resultado de carregar_dados_com_cache)
+    """
+    try:
+        import pyarrow  # só verificamos se está instalado
+    except ImportError:
+        # Sem pyarrow não há mapeamento: cada processo fica com a sua cópia
+        return carregar_dados_com_cache(caminho_arquivo, exibir_mensagens=False)
+
+    # Um arquivo por conteúdo do CSV, ao lado dos snapshots do cache colunar
+    assinatura = assinatura_arquivo(caminho_arquivo, pasta_cache)
+    _, prefixo = caminhos_cache(caminho_arquivo, pasta_cache)
+    prefixo_base = f'{prefixo}.compartilhada'
+    caminho_base = f"{prefixo_base}-{assinatura['sha256'][:16]}.arrow"
+
+    if os.path.exists(caminho_base):
+        df = abrir_base_compartilhada(caminho_base)
+        if df is not None:
+            return df
+
+    df = carregar_dados_com_cache(caminho_arquivo, exibir_mensagens=False)
+    os.makedirs(pasta_cache, exist_ok=True)
+    gravar_base_compartilhada(df, caminho_base)
+    remover_snapshots_antigos(prefixo_base, manter=caminho_base)
+    # A cópia no heap é descartada: daqui em diante vale só o arquivo mapeado
+    del df
+    return abrir_base_compartilhada(caminho_base)
@@ -0,0 +1,304 @@
+"""
+==============================================================================
+BENCHMARK DO GERADOR DE RELATÓRIO E DO DASHBOARD
+==============================================================================
+Descrição: Mede o tempo e o pico de memória de cada etapa do relatório
+           (carregar, tratar, métricas, Excel) e dos cálculos do dashboard
+           (índice, filtros, cubo), usando bases sintéticas de vários
+           tamanhos. Guarda uma "linha de base" e avisa quando algo piorou.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- Como medir tempo com time.perf_counter()
+- Como medir memória com tracemalloc
+- O que é uma regressão de desempenho e como detectá-la
+==============================================================================
+
+Uso:
+    python benchmark.py                          # 10^4 e 10^5 chamados
+    python benchmark.py --linhas 1000000         # outro tamanho
+    python benchmark.py --salvar-base            # grava a linha de base
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import cubo_olap
+import indice_bitmap
+from gerador_dados_sinteticos import salvar_csv_sintetico
+from gerador_relatorio import (
+    calcular_metricas,
+    carregar_dados,
+    gerar_relatorio_excel,
+    tratar_dados,
+)
+
+# ==============================================================================
+# COMO FUNCIONA O BENCHMARK
+# ==============================================================================
+#
+# 1. Para cada tamanho (ex.: 10^4, 10^5), geramos uma base sintética com
+#    semente fixa. O CSV fica guardado em .cache_chamados/benchmark/ e é
+#    reaproveitado nas próximas execuções.
+#
+# 2. Cada etapa roda algumas vezes só com o cronômetro (guardamos o MENOR
+#    tempo, o menos afetado por "ruído" da máquina) e uma vez com o
+#    tracemalloc ligado, para medir o pico de memória. Rodar separado é
+#    importante: o tracemalloc deixa o código mais lento.
+#
+# 3. Com --salvar-base, os resultados viram a linha de base (um JSON).
+#    Nas próximas execuções, qualquer etapa mais lenta ou mais pesada que a
+#    base além da tolerância (padrão 20%) é marcada como REGRESSÃO e o
+#    script termina com código de saída 1 (útil em integração contínua).
+#
+# Tempos abaixo de TEMPO_MINIMO_COMPARACAO são ignorados na comparação:
+# em poucos milissegundos, a variação da máquina é maior que a do código.
+
+TAMANHOS_PADRAO = [10_000, 100_000]
+
+PASTA_BENCHMARK = os.path.join('.cache_chamados', 'benchmark')
+
+ARQUIVO_LINHA_BASE = 'benchmark_linha_base.json'
+
+TOLERANCIA_PADRAO = 0.20
+
+TEMPO_MINIMO_COMPARACAO = 0.005  # segundos
+
+# Acima disso o Excel é ignorado (escrever 10^7 linhas leva muitos minutos)
+LIMITE_LINHAS_EXCEL_BENCHMARK = 1_000_000
+
+# Mesmas colunas e um filtro típico do dashboard
+COLUNAS_FILTRO = ['status', 'tipo_chamado', 'setor', 'prioridade']
+FILTRO_EXEMPLO = {'status': 'Aberto', 'setor': 'TI', 'tipo_chamado': None, 'prioridade': None}
+
+
+def preparar_base(linhas, semente=42):
+    """Gera (ou reaproveita) o CSV sintético com o tamanho pedido."""
+    os.makedirs(PASTA_BENCHMARK, exist_ok=True)
+    caminho = os.path.join(PASTA_BENCHMARK, f'chamados_{linhas}_s{semente}.csv')
+    if not os.path.exists(caminho):
+        print(f"   Gerando base sintética com {linhas} chamados...")
+        caminho_temporario = f'{caminho}.{os.getpid()}.tmp'
+        salvar_csv_sintetico(caminho_temporario, linhas, semente=semente)
+        os.replace(caminho_temporario, caminho)
+    return caminho
+
+
+def medir(funcao, repeticoes):
+    """
+    Mede uma função: melhor tempo entre as repetições e pico de memória.
+
+    Parâmetros:
+        funcao (function): Função sem parâmetros a medir
+        repeticoes (int): Quantas vezes cronometrar
+
+    Retorna:
+        tuple: (resultado da função, {'tempo_s': float, 'memoria_pico_mb': float})
+    """
+    # As etapas imprimem mensagens; aqui elas só atrapalham
+    silencio = io.StringIO()
+
+    tempos = []
+    for _ in range(repeticoes):
+        with contextlib.redirect_stdout(silencio):
+            inicio = time.perf_counter()
+            resultado = funcao()
+            tempos.append(time.perf_counter() - inicio)
+        silencio.seek(0)
+        silencio.truncate()
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(silencio):
+            resultado = funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return resultado, {
+        'tempo_s': round(min(tempos), 6),
+        'memoria_pico_mb': round(pico / 1024 / 1024, 3),
+    }
+
+
+def executar_tamanho(linhas, repeticoes=3, pasta_saida=PASTA_BENCHMARK):
+    """
+    Executa todas as etapas para uma base de um tamanho.
+
+    Retorna:
+        dict: {nome da etapa: medidas}
+    """
+    caminho = preparar_base(linhas)
+    medidas = {}
+
+    # --- Etapas do relatório -------------------------------------------------
+    df, medidas['carregar_dados'] = medir(lambda: carregar_dados(caminho), repeticoes)
+    df_tratado, medidas['tratar_dados'] = medir(
+        lambda: tratar_dados(df, exibir_mensagens=False), repeticoes
+    )
+    metricas, medidas['calcular_metricas'] = medir(
+        lambda: calcular_metricas(df_tratado, exibir_mensagens=False), repeticoes
+    )
+    if linhas <= LIMITE_LINHAS_EXCEL_BENCHMARK:
+        arquivo_excel = os.path.join(pasta_saida, f'relatorio_{linhas}.xlsx')
+        _, medidas['gerar_relatorio_excel'] = medir(
+            lambda: gerar_relatorio_excel(df_tratado, metricas, arquivo_excel), repeticoes
+        )
+
+    # --- Cálculos do dashboard -----------------------------------------------
+    indice, medidas['dashboard_construir_indice'] = medir(
+        lambda: indice_bitmap.construir_indice(df_tratado, COLUNAS_FILTRO), repeticoes
+    )
+    _, medidas['dashboard_filtrar_tabela'] = medir(
+        lambda: indice_bitmap.posicoes(indice, indice_bitmap.selecionar(indice, FILTRO_EXEMPLO)),
+        repeticoes,
+    )
+    cubo, medidas['dashboard_construir_cubo'] = medir(
+        lambda: cubo_olap.construir_cubo(df_tratado), repeticoes
+    )
+
+    def cards_e_graficos():
+        filtrado = cubo_olap.filtrar_cubo(cubo, FILTRO_EXEMPLO)
+        resultado = [cubo_olap.totais(filtrado)]
+        for dimensao in ['tipo_chamado', 'setor', 'prioridade', 'responsavel', 'status']:
+            resultado.append(cubo_olap.consolidar(filtrado, dimensao))
+        return resultado
+
+    _, medidas['dashboard_cards_graficos'] = medir(cards_e_graficos, repeticoes)
+
+    return medidas
+
+
+def informacoes_ambiente():
+    """Versões e máquina: comparar com uma base de outra máquina engana."""
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+    }
+
+
+def carregar_linha_base(caminho):
+    """Lê a linha de base salva (ou None se não existir)."""
+    try:
+        with open(caminho, encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+
+def salvar_linha_base(caminho, resultados):
+    """Grava os resultados como nova linha de base (mantendo outros tamanhos)."""
+    base = carregar_linha_base(caminho) or {'resultados': {}}
+    base['ambiente'] = informacoes_ambiente()
+    base['resultados'].update(resultados)
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(base, arquivo, ensure_ascii=False, indent=2)
+
+
+def comparar(resultados, base, tolerancia=TOLERANCIA_PADRAO):
+    """
+    Compara os resultados com a linha de base.
+
+    Parâmetros:
+        resultados (dict): {linhas: {etapa: medidas}}
+        base (dict): Linha de base carregada
+        tolerancia (float): Piora aceita (0.20 = 20%)
+
+    Retorna:
+        list: Regressões encontradas, como textos
+    """
+    regressoes = []
+    for linhas, etapas in resultados.items():
+        etapas_base = base['resultados'].get(linhas, {})
+        for etapa, medidas in etapas.items():
+            medidas_base = etapas_base.get(etapa)
+            if medidas_base is None:
+                continue
+            for chave, unidade in [('tempo_s', 's'), ('memoria_pico_mb', 'MB')]:
+                atual, anterior = medidas[chave], medidas_base[chave]
+                if chave == 'tempo_s' and anterior < TEMPO_MINIMO_COMPARACAO:
+                    continue
+                if anterior > 0 and atual > anterior * (1 + tolerancia):
+                    regressoes.append(
+                        f"{linhas} linhas / {etapa}: {chave} {anterior:.3f}{unidade} → "
+                        f"{atual:.3f}{unidade} (+{(atual / anterior - 1) * 100:.0f}%)"
+                    )
+    return regressoes
+
+
+def exibir_resultados(resultados, base=None):
+    """Imprime uma tabela por tamanho, com a variação contra a base."""
+    for linhas, etapas in resultados.items():
+        print(f"\n📏 {int(linhas):,} chamados".replace(',', '.'))
+        print(f"   {'etapa':<30}{'tempo (s)':>12}{'pico (MB)':>12}{'vs. base':>12}")
+        etapas_base = (base or {}).get('resultados', {}).get(linhas, {})
+        for etapa, medidas in etapas.items():
+            variacao = ''
+            anterior = etapas_base.get(etapa, {}).get('tempo_s')
+            if anterior:
+                variacao = f"{(medidas['tempo_s'] / anterior - 1) * 100:+.0f}%"
+            print(f"   {etapa:<30}{medidas['tempo_s']:>12.4f}"
+                  f"{medidas['memoria_pico_mb']:>12.1f}{variacao:>12}")
+
+
+def main(argumentos=None):
+    """Executa o benchmark. Retorna o código de saída (1 = houve regressão)."""
+    parser = argparse.ArgumentParser(description="Benchmark do relatório de TI")
+    parser.add_argument('--linhas', type=int, nargs='+', default=TAMANHOS_PADRAO,
+                        help="Tamanhos das bases (ex.: 10000 100000 1000000)")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--linha-base', default=ARQUIVO_LINHA_BASE)
+    parser.add_argument('--salvar-base', action='store_true',
+                        help="Grava os resultados como nova linha de base")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA_PADRAO)
+    argumentos = parser.parse_args(argumentos)
+
+    print("\n" + "="*60)
+    print("⏱️ BENCHMARK")
+    print("="*60)
+
+    resultados = {}
+    for linhas in argumentos.linhas:
+        # Chaves em texto: é assim que ficam depois de passar pelo JSON
+        resultados[str(linhas)] = executar_tamanho(linhas, argumentos.repeticoes)
+
+    base = carregar_linha_base(argumentos.linha_base)
+    exibir_resultados(resultados, base)
+
+    if argumentos.salvar_base:
+        salvar_linha_base(argumentos.linha_base, resultados)
+        print(f"\n💾 Linha de base gravada em {argumentos.linha_base}")
+        return 0
+
+    if base is None:
+        print("\nℹ️ Sem linha de base para comparar (use --salvar-base)")
+        return 0
+
+    if base.get('ambiente') != informacoes_ambiente():
+        print("\n⚠️ A linha de base foi gravada em outro ambiente; compare com cuidado")
+
+    regressoes = comparar(resultados, base, argumentos.tolerancia)
+    if regressoes:
+        print(f"\n❌ {len(regressoes)} regressão(ões) acima de {argumentos.tolerancia:.0%}:")
+        for regressao in regressoes:
+            print(f"   • {regressao}")
+        return 1
+
+    print(f"\n✅ Nenhuma regressão acima de {argumentos.tolerancia:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+==============================================================================
+CACHE COLUNAR DOS DADOS TRATADOS (ARROW)
+==============================================================================
+Descrição: Guarda o DataFrame já tratado em um arquivo colunar (Arrow IPC),
+           para que o gerador de relatório e o dashboard não precisem
+           reler o CSV e refazer a conversão de datas a cada execução.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- O que é um formato colunar e por que ele é rápido de ler
+- O que é memory-map (mapear um arquivo direto na memória)
+- Como invalidar um cache usando tamanho, data de modificação e hash
+==============================================================================
+"""
+
+import hashlib
+import json
+import os
+import re
+
+# ==============================================================================
+# COMO FUNCIONA O CACHE
+# ==============================================================================
+#
+# 1. Calculamos a "assinatura" do CSV: tamanho, data de modificação e hash
+#    (SHA-256) do conteúdo.
+# 2. Se já existe um snapshot com a mesma assinatura, lemos o arquivo
+#    .arrow mapeado na memória (memory_map). O sistema operacional só lê do
+#    disco as páginas das colunas que realmente usamos.
+# 3. Se não existe, carregamos o CSV, tratamos os dados e gravamos o
+#    snapshot uma única vez. As próximas execuções já encontram o cache.
+#
+# Por que Arrow IPC (e não Parquet)?
+# O Parquet é comprimido e precisa ser decodificado; o Arrow IPC sem
+# compressão tem o mesmo layout da memória, por isso pode ser mapeado direto.
+#
+# O pyarrow é opcional: sem ele, os dados são carregados do CSV normalmente.
+#
+# Os arquivos do cache levam o nome do CSV MAIS um hash curto do caminho
+# completo (ex.: chamados_ti-1a2b3c4d.json): dois 'chamados_ti.csv' em
+# pastas diferentes não sobrescrevem o cache um do outro. A limpeza só
+# apaga arquivos no formato exato <prefixo>-<16 hex>.arrow, então atualizar
+# 'chamados_ti.csv' não apaga os snapshots de 'chamados_ti-2024.csv'.
+
+PASTA_CACHE_PADRAO = '.cache_chamados'
+
+# Versão do formato do snapshot. Aumente quando o tratamento dos dados mudar,
+# para que snapshots gravados pela versão anterior sejam descartados.
+VERSAO_SNAPSHOT = 2
+
+# Tamanho dos pedaços lidos para calcular o hash (1 MB)
+TAMANHO_LEITURA_HASH = 1024 * 1024
+
+
+def calcular_hash_arquivo(caminho_arquivo):
+    """
+    Calcula o hash SHA-256 do conteúdo de um arquivo, em pedaços.
+
+    Parâmetros:
+        caminho_arquivo (str): Caminho do arquivo
+
+    Retorna:
+        str: Hash em hexadecimal
+    """
+    hash_sha = hashlib.sha256()
+    with open(caminho_arquivo, 'rb') as arquivo:
+        for pedaco in iter(lambda: arquivo.read(TAMANHO_LEITURA_HASH), b''):
+            hash_sha.update(pedaco)
+    return hash_sha.hexdigest()
+
+
+def nome_cache(caminho_arquivo):
+    """
+    Nome base dos arquivos de cache de um CSV: o nome do arquivo e um hash
+    curto do caminho absoluto (ex.: 'chamados_ti-1a2b3c4d').
+
+    Usado também pelo banco SQLite e pela ingestão incremental.
+    """
+    nome_base = os.path.splitext(os.path.basename(caminho_arquivo))[0]
+    hash_caminho = hashlib.sha256(os.path.abspath(caminho_arquivo).encode('utf-8')).hexdigest()
+    return f'{nome_base}-{hash_caminho[:8]}'
+
+
+def caminhos_cache(caminho_arquivo, pasta_cache):
+    """
+    Monta os caminhos do arquivo de metadados e do prefixo dos snapshots.
+
+    Retorna:
+        tuple: (caminho do .json de metadados, prefixo dos arquivos .arrow)
+    """
+    nome_base = nome_cache(caminho_arquivo)
+    return (
+        os.path.join(pasta_cache, f'{nome_base}.json'),
+        os.path.join(pasta_cache, nome_base),
+    )
+
+
+def assinatura_arquivo(caminho_arquivo, pasta_cache=PASTA_CACHE_PADRAO):
+    """
+    Calcula a assinatura (tamanho, mtime e hash) do arquivo de origem.
+
+    O hash exige ler o arquivo inteiro. Para não pagar isso sempre, se o
+    tamanho e o mtime forem iguais aos guardados nos metadados, reaproveitamos
+    o hash já calculado.
+
+    Parâmetros:
+        caminho_arquivo (str): Caminho do CSV de origem
+        pasta_cache (str): Pasta onde ficam os snapshots
+
+    Retorna:
+        dict: {'tamanho': int, 'mtime_ns': int, 'sha256': str}
+    """
+    info = os.stat(caminho_arquivo)
+    assinatura = {'tamanho': info.st_size, 'mtime_ns': info.st_mtime_ns}
+
+    caminho_meta, _ = caminhos_cache(caminho_arquivo, pasta_cache)
+    metadados = ler_metadados(caminho_meta)
+    if (
+        metadados is not None
+        and metadados.get('tamanho') == assinatura['tamanho']
+        and metadados.get('mtime_ns') == assinatura['mtime_ns']
+    ):
+        assinatura['sha256'] = metadados['sha256']
+    else:
+        assinatura['sha256'] = calcular_hash_arquivo(caminho_arquivo)
+
+    return assinatura
+
+
+def ler_metadados(caminho_meta):
+    """Lê o arquivo de metadados do cache (ou None se não existir/estiver inválido)."""
+    try:
+        with open(caminho_meta, encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+
+def gravar_snapshot(df, caminho_snapshot):
+    """
+    Grava o DataFrame como Arrow IPC sem compressão (mapeável na memória).
+
+    A gravação é feita em um arquivo temporário e depois renomeada, para que
+    outro processo (ex.: o dashboard) nunca leia um snapshot pela metade.
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    caminho_temporario = f'{caminho_snapshot}.{os.getpid()}.tmp'
+    feather.write_feather(tabela, caminho_temporario, compression='uncompressed')
+    os.replace(caminho_temporario, caminho_snapshot)
+
+
+def ler_snapshot(caminho_snapshot, colunas=None):
+    """
+    Lê um snapshot Arrow mapeado na memória.
+
+    Parâmetros:
+        caminho_snapshot (str): Caminho do arquivo .arrow
+        colunas (list): Colunas a ler (None = todas). Só as páginas dessas
+                        colunas são lidas do disco.
+
+    Retorna:
+        DataFrame: Dados tratados, com os mesmos tipos do esquema
+    """
+    import pyarrow.feather as feather
+
+    tabela = feather.read_table(caminho_snapshot, columns=colunas, memory_map=True)
+    return tabela.to_pandas()
+
+
+def carregar_com_cache(caminho_arquivo, funcao_carregar, colunas=None,
+                       pasta_cache=PASTA_CACHE_PADRAO):
+    """
+    Devolve os dados tratados, usando o snapshot colunar quando possível.
+
+    Parâmetros:
+        caminho_arquivo (str): Caminho do CSV de origem
+        funcao_carregar (function): Função que recebe o caminho e devolve o
+                                    DataFrame tratado (usada quando não há cache)
+        colunas (list): Colunas desejadas (None = todas)
+        pasta_cache (str): Pasta onde ficam os snapshots
+
+    Retorna:
+        tuple: (DataFrame tratado, bool indicando se veio do cache)
+    """
+    try:
+        import pyarrow  # só verificamos se está instalado
+    except ImportError:
+        df = funcao_carregar(caminho_arquivo)
+        return (df[colunas] if colunas else df), False
+
+    assinatura = assinatura_arquivo(caminho_arquivo, pasta_cache)
+    caminho_meta, prefixo = caminhos_cache(caminho_arquivo, pasta_cache)
+    caminho_snapshot = f"{prefixo}-{assinatura['sha256'][:16]}.arrow"
+
+    # Cache válido: mesmo conteúdo (o hash manda; tamanho/mtime só evitam recalcular)
+    metadados = ler_metadados(caminho_meta)
+    if (
+        metadados is not None
+        and metadados.get('sha256') == assinatura['sha256']
+        and metadados.get('versao') == VERSAO_SNAPSHOT
+        and os.path.exists(caminho_snapshot)
+    ):
+        if metadados != {**assinatura, 'versao': VERSAO_SNAPSHOT}:
+            # Arquivo "tocado" sem mudar o conteúdo: só atualizamos o mtime
+            gravar_metadados(caminho_meta, assinatura)
+        return ler_snapshot(caminho_snapshot, colunas), True
+
+    # Cache ausente ou desatualizado: carrega do CSV e grava o snapshot
+    df = funcao_carregar(caminho_arquivo)
+
+    os.makedirs(pasta_cache, exist_ok=True)
+    gravar_snapshot(df, caminho_snapshot)
+    remover_snapshots_antigos(prefixo, manter=caminho_snapshot)
+    gravar_metadados(caminho_meta, assinatura)
+
+    return (df[colunas] if colunas else df), False
+
+
+def gravar_metadados(caminho_meta, assinatura):
+    """Grava a assinatura do snapshot atual (também de forma atômica)."""
+    caminho_temporario = f'{caminho_meta}.{os.getpid()}.tmp'
+    with open(caminho_temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump({**assinatura, 'versao': VERSAO_SNAPSHOT}, arquivo)
+    os.replace(caminho_temporario, caminho_meta)
+
+
+def remover_snapshots_antigos(prefixo, manter):
+    """Apaga snapshots de versões anteriores do mesmo CSV."""
+    pasta = os.path.dirname(prefixo) or '.'
+    # Só <prefixo>-<16 hex>.arrow: outro CSV cujo nome começa igual não casa
+    padrao = re.compile(re.escape(os.path.basename(prefixo)) + r'-[0-9a-f]{16}\.arrow')
+    for nome in os.listdir(pasta):
+        caminho = os.path.join(pasta, nome)
+        if padrao.fullmatch(nome) and caminho != manter:
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass  # Outro processo pode estar usando; fica para a próxima
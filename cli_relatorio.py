@@ -0,0 +1,287 @@
+"""
+==============================================================================
+LINHA DE COMANDO DO RELATÓRIO (SUBCOMANDOS COM IMPORTAÇÕES SOB DEMANDA)
+==============================================================================
+Descrição: Ponto de entrada único para o relatório, com um subcomando por
+           tarefa. Cada subcomando importa só as bibliotecas de que precisa,
+           então uma conferência rápida das métricas (num cron, por exemplo)
+           não paga o preço de carregar o openpyxl nem de gerar o Excel.
+
+Para executar:
+    python cli_relatorio.py metricas --entrada chamados_ti.csv
+    python cli_relatorio.py metricas --json --inicio 2024-03-01 > metricas.json
+    python cli_relatorio.py exportar --formatos parquet csv --pasta exportacao
+    python cli_relatorio.py relatorio --entrada chamados_ti.csv --saida relatorio_ti.xlsx
+    python cli_relatorio.py servir --porta 8000
+    python cli_relatorio.py --tempos-importacao metricas
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- Como organizar uma CLI em subcomandos com argparse
+- Quanto custa o "import" de bibliotecas grandes (e como adiar esse custo)
+- Como medir o tempo de importação de cada módulo
+==============================================================================
+"""
+
+import argparse
+import importlib
+import sys
+import time
+
+# Marcado antes de qualquer importação pesada: base do tempo total
+INICIO_PROCESSO = time.perf_counter()
+
+# ==============================================================================
+# COMO FUNCIONA A IMPORTAÇÃO SOB DEMANDA
+# ==============================================================================
+#
+# Um "import" executa o módulo inteiro: o pandas, por exemplo, carrega
+# centenas de submódulos e bibliotecas em C antes da primeira linha do
+# nosso código. Medido nesta máquina (python -X importtime):
+#
+#   pandas (+ numpy/pyarrow)   ~0,5s
+#   openpyxl                   ~0,25s
+#   aiohttp                    ~0,3s
+#
+# Se este arquivo importasse tudo no topo, até "--help" pagaria esse preço.
+# Por isso o topo só tem a biblioteca padrão, e cada subcomando importa o
+# que usa, na hora (função importar()):
+#
+#   metricas  → gerador_relatorio (pandas)            sem openpyxl
+#   exportar  → gerador_relatorio + exportacao_formatos sem openpyxl
+#   relatorio → gerador_relatorio (+ openpyxl ao gravar o Excel)
+#   servir    → servico_relatorio (http.server + gerador_relatorio)
+#
+# Com --tempos-importacao, o tempo gasto em cada importação é exibido no
+# fim, junto com o tempo total do comando.
+
+# Tempos medidos por importar(): lista de (módulo, segundos)
+TEMPOS_IMPORTACAO = []
+
+
+def importar(nome_modulo):
+    """
+    Importa um módulo medindo quanto tempo a importação levou.
+
+    Parâmetros:
+        nome_modulo (str): Nome do módulo, por exemplo 'gerador_relatorio'
+
+    Retorna:
+        module: O módulo importado
+    """
+    ja_carregado = nome_modulo in sys.modules
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(nome_modulo)
+    if not ja_carregado:
+        TEMPOS_IMPORTACAO.append((nome_modulo, time.perf_counter() - inicio))
+    return modulo
+
+
+def exibir_tempos_importacao():
+    """Mostra o tempo de cada importação e a parte delas no tempo total."""
+    total = time.perf_counter() - INICIO_PROCESSO
+    em_importacoes = sum(segundos for _, segundos in TEMPOS_IMPORTACAO)
+
+    # Vai para stderr: não mistura com o JSON de "metricas --json"
+    print("\n⏱️ Tempos de importação:", file=sys.stderr)
+    for nome_modulo, segundos in TEMPOS_IMPORTACAO:
+        print(f"   {nome_modulo:<22} {segundos:.3f}s", file=sys.stderr)
+    print(f"   Importações: {em_importacoes:.3f}s de {total:.3f}s no total "
+          f"({em_importacoes / total:.0%})", file=sys.stderr)
+    print(f"   openpyxl carregado: {'sim' if 'openpyxl' in sys.modules else 'não'}",
+          file=sys.stderr)
+
+
+def data_valida(texto):
+    """
+    Confere uma data de --inicio/--fim (usada como 'type' do argparse).
+
+    Uma data inválida vira uma mensagem de uso do argparse, e não um erro
+    do pandas no meio do processamento.
+
+    Parâmetros:
+        texto (str): Data digitada, por exemplo '2024-03-01'
+
+    Retorna:
+        str: O próprio texto (quem usa a data converte com pd.Timestamp)
+    """
+    pd = importar('pandas')
+    try:
+        data = pd.Timestamp(texto)
+    except ValueError:
+        data = pd.NaT
+    if pd.isna(data):
+        raise argparse.ArgumentTypeError(f"data inválida: '{texto}' (use AAAA-MM-DD)")
+    return texto
+
+
+def conflitos_relatorio(argumentos):
+    """
+    Combinações de opções que gerador_relatorio.main() recusa.
+
+    Retorna:
+        list: Mensagens dos conflitos encontrados (vazia = tudo certo)
+    """
+    em_blocos = argumentos.streaming or argumentos.incremental
+    regras = [
+        (em_blocos and (argumentos.inicio or argumentos.fim),
+         "--inicio/--fim não podem ser usados com --streaming/--incremental"),
+        (em_blocos and argumentos.paralelo,
+         "--paralelo não pode ser usado com --streaming/--incremental"),
+        (em_blocos and argumentos.por,
+         "--por não pode ser usado com --streaming/--incremental"),
+        (argumentos.sqlite and (argumentos.paralelo or argumentos.por),
+         "--sqlite não pode ser combinado com --paralelo nem com --por"),
+    ]
+    return [mensagem for conflito, mensagem in regras if conflito]
+
+
+def carregar_e_calcular(argumentos, exibir_mensagens):
+    """
+    ETAPAS 3 a 5 dos subcomandos metricas e exportar: dados (com cache),
+    período e métricas.
+
+    Retorna:
+        tuple: (DataFrame tratado, dict de métricas)
+    """
+    gerador = importar('gerador_relatorio')
+
+    df = gerador.carregar_dados_com_cache(argumentos.entrada, exibir_mensagens=False)
+    if argumentos.inicio or argumentos.fim:
+        leitura = importar('leitura_particionada')
+        df = leitura.filtrar_periodo(df, argumentos.inicio, argumentos.fim)
+
+    metricas = gerador.calcular_metricas(df, exibir_mensagens=exibir_mensagens)
+    return df, metricas
+
+
+def comando_metricas(argumentos):
+    """Calcula e mostra as métricas (texto ou JSON), sem gerar arquivos."""
+    df, metricas = carregar_e_calcular(argumentos, exibir_mensagens=not argumentos.json)
+
+    if argumentos.json:
+        # Mesmo formato do /metricas do serviço de relatórios
+        servico = importar('servico_relatorio')
+        periodo = tuple((nome, valor) for nome, valor in
+                        (('data_fim', argumentos.fim), ('data_inicio', argumentos.inicio)) if valor)
+        documento = servico.montar_json_metricas(metricas, periodo,
+                                                 servico.assinatura_arquivo(argumentos.entrada))
+        sys.stdout.write(documento.decode('utf-8') + '\n')
+
+
+def comando_exportar(argumentos):
+    """Grava base e resumos em Parquet/CSV/JSON, sem gerar o Excel."""
+    df, metricas = carregar_e_calcular(argumentos, exibir_mensagens=False)
+    exportacao = importar('exportacao_formatos')
+    exportacao.exportar_formatos(df, metricas, pasta_saida=argumentos.pasta,
+                                 formatos=argumentos.formatos)
+
+
+def comando_relatorio(argumentos):
+    """Relatório completo (Excel e, opcionalmente, os outros formatos)."""
+    gerador = importar('gerador_relatorio')
+    gerador.main(
+        arquivo_entrada=argumentos.entrada,
+        arquivo_saida=argumentos.saida,
+        modo_streaming=argumentos.streaming,
+        modo_incremental=argumentos.incremental,
+        usar_sqlite=argumentos.sqlite,
+        usar_cache=not argumentos.sem_cache,
+        modo_paralelo=argumentos.paralelo,
+        relatorios_por=argumentos.por,
+        formatos_exportacao=argumentos.exportar,
+        data_inicio=argumentos.inicio,
+        data_fim=argumentos.fim,
+        arquivo_rastro=argumentos.rastro,
+    )
+
+
+def comando_servir(argumentos):
+    """Sobe o serviço HTTP de relatórios (ver servico_relatorio.py)."""
+    servico = importar('servico_relatorio')
+    servico.iniciar_servico(argumentos.entrada, argumentos.porta, argumentos.host)
+
+
+def criar_parser():
+    """
+    Monta o argparse com um subparser por subcomando.
+
+    Retorna:
+        ArgumentParser
+    """
+    parser = argparse.ArgumentParser(description="Relatório de suporte de TI")
+    parser.add_argument('--tempos-importacao', action='store_true',
+                        help="Mostra quanto tempo cada importação levou")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    # Opções comuns: arquivo de entrada e período
+    comuns = argparse.ArgumentParser(add_help=False)
+    comuns.add_argument('--entrada', default='chamados_ti.csv',
+                        help="CSV de chamados (padrão: %(default)s)")
+    comuns.add_argument('--inicio', type=data_valida, help="Início do período (AAAA-MM-DD)")
+    comuns.add_argument('--fim', type=data_valida,
+                        help="Fim do período, inclusive (AAAA-MM-DD)")
+
+    metricas = subcomandos.add_parser('metricas', parents=[comuns],
+                                      help="Só as métricas, sem gerar arquivos")
+    metricas.add_argument('--json', action='store_true',
+                          help="Imprime as tabelas de resumo em JSON")
+    metricas.set_defaults(funcao=comando_metricas)
+
+    exportar = subcomandos.add_parser('exportar', parents=[comuns],
+                                      help="Base e resumos em Parquet/CSV/JSON, sem Excel")
+    exportar.add_argument('--pasta', default='exportacao',
+                          help="Pasta de saída (padrão: %(default)s)")
+    exportar.add_argument('--formatos', nargs='+', default=['parquet', 'csv', 'json'],
+                          choices=['parquet', 'csv', 'json'])
+    exportar.set_defaults(funcao=comando_exportar)
+
+    relatorio = subcomandos.add_parser('relatorio', parents=[comuns],
+                                       help="Relatório Excel completo")
+    relatorio.add_argument('--saida', default='relatorio_ti.xlsx',
+                           help="Relatório gerado (padrão: %(default)s)")
+    modos = relatorio.add_mutually_exclusive_group()
+    modos.add_argument('--streaming', action='store_true', help="Processa o CSV em blocos")
+    modos.add_argument('--incremental', action='store_true', help="Só as linhas novas do CSV")
+    modos.add_argument('--sqlite', action='store_true', help="Métricas calculadas no SQLite")
+    relatorio.add_argument('--sem-cache', action='store_true', help="Ignora o cache colunar")
+    relatorio.add_argument('--paralelo', action='store_true', help="Métricas em vários núcleos")
+    relatorio.add_argument('--por', choices=['setor', 'mes'],
+                           help="Também gera um relatório por setor ou por mês")
+    relatorio.add_argument('--exportar', nargs='+', choices=['parquet', 'csv', 'json'],
+                           help="Formatos extras além do Excel")
+    relatorio.add_argument('--rastro', help="Grava o rastro de tempo/memória neste JSON")
+    relatorio.set_defaults(funcao=comando_relatorio)
+
+    servir = subcomandos.add_parser('servir', help="Serviço HTTP de relatórios")
+    servir.add_argument('--entrada', default='chamados_ti.csv',
+                        help="CSV de chamados (padrão: %(default)s)")
+    servir.add_argument('--porta', type=int, default=8000)
+    servir.add_argument('--host', default='127.0.0.1')
+    servir.set_defaults(funcao=comando_servir)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Lê os argumentos e executa o subcomando escolhido.
+
+    Parâmetros:
+        argv (list): Argumentos (None = os da linha de comando)
+    """
+    parser = criar_parser()
+    argumentos = parser.parse_args(argv)
+    if argumentos.comando == 'relatorio':
+        # Mesmas regras de gerador_relatorio.main(), mas com a mensagem do argparse
+        conflitos = conflitos_relatorio(argumentos)
+        if conflitos:
+            parser.error('; '.join(conflitos))
+    try:
+        argumentos.funcao(argumentos)
+    finally:
+        if argumentos.tempos_importacao:
+            exibir_tempos_importacao()
+
+
+if __name__ == "__main__":
+    main()
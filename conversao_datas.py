@@ -0,0 +1,272 @@
+"""
+==============================================================================
+CONVERSÃO RÁPIDA DE DATAS (FORMATO FIXO AAAA-MM-DD HH:MM:SS)
+==============================================================================
+Descrição: Converte as colunas de data lendo os bytes do texto diretamente,
+           de forma vetorizada (NumPy), em vez de deixar o pd.to_datetime()
+           adivinhar o formato. Só as linhas fora do formato passam pela
+           conversão lenta, e as que não puderam ser convertidas (viraram
+           NaT) são informadas, em vez de sumirem em silêncio.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- Como um texto vira uma "matriz de bytes" (um byte por caractere)
+- Como transformar dígitos em números sem laço: byte - ord('0')
+- Como uma data vira um número (segundos desde 1970, a "época Unix")
+==============================================================================
+"""
+
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# COMO FUNCIONA A CONVERSÃO RÁPIDA
+# ==============================================================================
+#
+# Todas as datas do helpdesk têm exatamente 19 caracteres, sempre nas
+# mesmas posições:
+#
+#   posição:  0123456789012345678
+#   texto:    2024-01-02 08:15:00
+#             AAAA-MM-DD HH:MM:SS
+#
+# 1. Montamos uma matriz com uma linha por data e 19 colunas (os bytes).
+# 2. Subtraindo ord('0') = 48 de cada byte, '2' vira 2, '0' vira 0...
+# 3. Ano = 1000*d0 + 100*d1 + 10*d2 + d3 (o mesmo para mês, dia, hora...)
+#    Isso é feito para TODAS as linhas de uma vez, sem laço em Python.
+# 4. Conferimos separadores, dígitos e limites (mês 1-12, dia do mês,
+#    ano bissexto, hora < 24...). Linhas que falham vão para o
+#    pd.to_datetime() tradicional, que aceita outros formatos.
+# 5. Ano/mês/dia viram "dias desde 01/01/1970" com uma fórmula de
+#    calendário (sem tabelas) e, daí, segundos desde 1970.
+#
+# Texto vazio (chamado ainda aberto) vira NaT sem ser considerado erro.
+# Texto preenchido que nem a conversão lenta entende vira NaT e é
+# REPORTADO, com o número das linhas.
+
+FORMATO_DATA = '%Y-%m-%d %H:%M:%S'
+
+TAMANHO_DATA = 19
+
+# Posições dos dígitos de cada campo no texto AAAA-MM-DD HH:MM:SS
+POSICOES_CAMPOS = {
+    'ano': [0, 1, 2, 3],
+    'mes': [5, 6],
+    'dia': [8, 9],
+    'hora': [11, 12],
+    'minuto': [14, 15],
+    'segundo': [17, 18],
+}
+POSICOES_DIGITOS = [posicao for posicoes in POSICOES_CAMPOS.values() for posicao in posicoes]
+
+# Separadores esperados (o 'T' do padrão ISO também é aceito no lugar do espaço)
+SEPARADORES = {4: [ord('-')], 7: [ord('-')], 10: [ord(' '), ord('T')],
+               13: [ord(':')], 16: [ord(':')]}
+
+DIAS_POR_MES = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# Linhas convertidas por vez (limita a memória da matriz de bytes)
+TAMANHO_LOTE = 1_000_000
+
+# Mesmo tipo (resolução) que o pd.to_datetime() produz nesta versão do pandas,
+# para que o resultado seja idêntico ao da conversão tradicional
+TIPO_DATA = pd.to_datetime(pd.Series(['2024-01-01 00:00:00'])).dtype
+
+
+def matriz_de_bytes(valores):
+    """
+    Monta a matriz (candidatas × 19) com os códigos dos caracteres.
+
+    "Candidatas" são as linhas com exatamente 19 caracteres; as demais
+    nem entram na matriz (vão direto para o caminho lento).
+
+    Com pyarrow, os bytes são lidos direto do buffer do texto (sem criar
+    um objeto Python por linha). Se todas as datas preenchidas têm 19
+    caracteres (o caso normal), o buffer já É a matriz: basta "remodelar"
+    (reshape), sem copiar nada. Sem pyarrow, usamos o texto de largura fixa
+    do NumPy (um código Unicode por caractere).
+
+    Parâmetros:
+        valores (Series): Textos das datas (nulos permitidos)
+
+    Retorna:
+        tuple: (matriz de códigos das candidatas, máscara das candidatas,
+                máscara das linhas nulas/vazias)
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        pa = None
+
+    arrow = None
+    if pa is not None:
+        try:
+            # pandas 3 já guarda o texto em pyarrow: a conversão não copia nada
+            arrow = pa.array(valores, type=pa.large_string(), from_pandas=True)
+            if isinstance(arrow, pa.ChunkedArray):
+                arrow = arrow.combine_chunks()
+        except pa.ArrowException:
+            # Coluna que não é texto (ex.: toda vazia, lida como float NaN)
+            arrow = None
+
+    if arrow is not None:
+        _, buffer_offsets, buffer_dados = arrow.buffers()
+        offsets = np.frombuffer(buffer_offsets, dtype=np.int64)[
+            arrow.offset:arrow.offset + len(arrow) + 1
+        ]
+        dados = np.frombuffer(buffer_dados, dtype=np.uint8) if buffer_dados else np.zeros(0, np.uint8)
+        tamanhos = np.diff(offsets)
+        nulos = arrow.is_null().to_numpy(zero_copy_only=False) | (tamanhos == 0)
+        candidatas = tamanhos == TAMANHO_DATA
+
+        usados = dados[offsets[0]:offsets[-1]]
+        if len(usados) == int(candidatas.sum()) * TAMANHO_DATA:
+            # Caso normal: só há textos de 19 caracteres (e vazios)
+            matriz = usados.reshape(-1, TAMANHO_DATA)
+        else:
+            inicios = offsets[:-1][candidatas]
+            matriz = dados[inicios[:, None] + np.arange(TAMANHO_DATA)]
+        return matriz, candidatas, nulos
+
+    textos = np.asarray(valores.to_numpy(dtype=object, na_value=''), dtype='U')
+    largura = max(textos.dtype.itemsize // 4, TAMANHO_DATA + 1)
+    textos = textos.astype(f'U{largura}')
+    codigos = textos.view(np.uint32).reshape(len(textos), largura)
+    nulos = valores.isna().to_numpy() | (codigos[:, 0] == 0)
+    candidatas = (codigos[:, TAMANHO_DATA - 1] != 0) & (codigos[:, TAMANHO_DATA] == 0)
+    # Só caracteres ASCII podem ser dígitos/separadores válidos
+    matriz = np.minimum(codigos[candidatas, :TAMANHO_DATA], 255).astype(np.uint8)
+    return matriz, candidatas, nulos
+
+
+def dias_desde_1970(ano, mes, dia):
+    """
+    Dias entre 01/01/1970 e a data (algoritmo "days from civil").
+
+    Conta o ano a partir de março, para o 29 de fevereiro ficar no fim
+    do ano; assim a quantidade de dias até cada mês é uma fórmula simples.
+    """
+    ano = ano - (mes <= 2)
+    era = ano // 400
+    ano_da_era = ano - era * 400
+    mes_desde_marco = (mes + 9) % 12
+    dia_do_ano = (153 * mes_desde_marco + 2) // 5 + dia - 1
+    dia_da_era = ano_da_era * 365 + ano_da_era // 4 - ano_da_era // 100 + dia_do_ano
+    return era * 146097 + dia_da_era - 719468
+
+
+def converter_lote(valores):
+    """
+    Converte um lote de textos pelo caminho rápido.
+
+    Retorna:
+        tuple: (segundos desde 1970 em int64, máscara das linhas convertidas,
+                máscara das linhas nulas/vazias)
+    """
+    matriz, candidatas, nulos = matriz_de_bytes(valores)
+
+    validas = np.ones(len(matriz), dtype=bool)
+    for posicao, permitidos in SEPARADORES.items():
+        coluna = matriz[:, posicao]
+        separador_ok = coluna == permitidos[0]
+        for outro in permitidos[1:]:
+            separador_ok |= coluna == outro
+        validas &= separador_ok
+
+    # Em uint8, bytes menores que '0' "dão a volta" e viram números > 9:
+    # uma única comparação confere se todos são dígitos
+    digitos = matriz[:, POSICOES_DIGITOS] - np.uint8(ord('0'))
+    validas &= (digitos <= 9).all(axis=1)
+
+    # Cada campo: dígitos × potências de 10 (ex.: ano = 1000*d0 + 100*d1 + ...)
+    campos = {}
+    coluna = 0
+    for nome, posicoes in POSICOES_CAMPOS.items():
+        valor = np.zeros(len(matriz), dtype=np.int32)
+        for deslocamento in range(len(posicoes)):
+            valor = valor * 10 + digitos[:, coluna + deslocamento]
+        campos[nome] = valor
+        coluna += len(posicoes)
+
+    ano, mes, dia = campos['ano'], campos['mes'], campos['dia']
+    bissexto = (ano % 4 == 0) & ((ano % 100 != 0) | (ano % 400 == 0))
+    mes_valido = (mes >= 1) & (mes <= 12)
+    ultimo_dia = DIAS_POR_MES[np.clip(mes, 1, 12) - 1] + (bissexto & (mes == 2))
+    validas &= (
+        mes_valido
+        & (dia >= 1) & (dia <= ultimo_dia)
+        & (campos['hora'] <= 23) & (campos['minuto'] <= 59) & (campos['segundo'] <= 59)
+    )
+
+    segundos_candidatas = (
+        dias_desde_1970(ano, mes, dia).astype(np.int64) * 86400
+        + campos['hora'] * 3600 + campos['minuto'] * 60 + campos['segundo']
+    )
+
+    # De volta às posições originais do lote
+    segundos = np.zeros(len(valores), dtype=np.int64)
+    convertidas = np.zeros(len(valores), dtype=bool)
+    segundos[candidatas] = segundos_candidatas
+    convertidas[candidatas] = validas
+    return segundos, convertidas, nulos
+
+
+def converter_datas(serie):
+    """
+    Converte uma coluna de texto AAAA-MM-DD HH:MM:SS para datetime.
+
+    Equivale a pd.to_datetime(serie, errors='coerce'), mas:
+    - as linhas no formato esperado são convertidas de forma vetorizada;
+    - só as demais passam pelo pd.to_datetime() (formato livre);
+    - as linhas preenchidas que viraram NaT são informadas.
+
+    Parâmetros:
+        serie (Series): Coluna de datas em texto (ou já datetime)
+
+    Retorna:
+        tuple: (Series datetime, dict com o relatório da conversão:
+                'rapidas', 'alternativas', 'coagidas' e 'linhas_coagidas')
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+        # Já convertida (ex.: dados vindos do cache): nada a fazer
+        return serie, {'rapidas': 0, 'alternativas': 0, 'coagidas': 0, 'linhas_coagidas': []}
+
+    total = len(serie)
+    segundos = np.empty(total, dtype=np.int64)
+    convertidas = np.zeros(total, dtype=bool)
+    nulas = np.zeros(total, dtype=bool)
+
+    for inicio in range(0, total, TAMANHO_LOTE):
+        fim = min(inicio + TAMANHO_LOTE, total)
+        segundos[inicio:fim], convertidas[inicio:fim], nulas[inicio:fim] = (
+            converter_lote(serie.iloc[inicio:fim])
+        )
+
+    # NaT é o menor int64; as linhas não convertidas começam como NaT
+    segundos[~convertidas] = np.iinfo(np.int64).min
+    datas = pd.Series(
+        segundos.view('datetime64[s]').astype(TIPO_DATA),
+        index=serie.index,
+        name=serie.name,
+    )
+
+    # Caminho lento: só as linhas preenchidas que não estavam no formato fixo
+    lentas = ~convertidas & ~nulas
+    alternativas = 0
+    linhas_coagidas = []
+    if lentas.any():
+        convertidas_lentas = pd.to_datetime(serie[lentas], errors='coerce', format='mixed')
+        if convertidas_lentas.dt.tz is not None:
+            # Texto com fuso (ex.: ...+00:00): guardamos o horário sem fuso
+            convertidas_lentas = convertidas_lentas.dt.tz_localize(None)
+        convertidas_lentas = convertidas_lentas.astype(TIPO_DATA)
+        datas.iloc[np.flatnonzero(lentas)] = convertidas_lentas.to_numpy()
+        alternativas = int(convertidas_lentas.notna().sum())
+        linhas_coagidas = convertidas_lentas.index[convertidas_lentas.isna()].tolist()
+
+    relatorio = {
+        'rapidas': int(convertidas.sum()),
+        'alternativas': alternativas,
+        'coagidas': len(linhas_coagidas),
+        'linhas_coagidas': linhas_coagidas,
+    }
+    return datas, relatorio
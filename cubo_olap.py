@@ -0,0 +1,201 @@
+"""
+==============================================================================
+CUBO OLAP PRÉ-AGREGADO
+==============================================================================
+Descrição: Agrupa os chamados uma única vez por todas as combinações de
+           (status, tipo, setor, prioridade, responsável). Os cards e os
+           gráficos do dashboard são respondidos somando linhas desse
+           "cubo", que é minúsculo perto da base de chamados.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- O que é um cubo OLAP e o que é "roll-up" (consolidar dimensões)
+- Por que guardar soma e quantidade em vez da média
+- Como responder percentis filtrados somando histogramas (sketches)
+==============================================================================
+"""
+
+import numpy as np
+import pandas as pd
+
+from sketch_quantis import QUANTIS_PADRAO, indices_baldes, quantis_de_baldes
+
+# ==============================================================================
+# COMO FUNCIONA O CUBO
+# ==============================================================================
+#
+# Cada linha do cubo é uma combinação de dimensões, por exemplo:
+#
+#   status  tipo     setor  prioridade  responsavel  quantidade  soma_tempo  qtd_tempo
+#   Fechado Hardware TI     Alta        Ana Costa    12          48.5        12
+#
+# Com 3 status × 4 tipos × 7 setores × 4 prioridades × 4 responsáveis, o cubo
+# tem no máximo 1.344 linhas, seja a base de 100 chamados ou de 100 milhões.
+#
+# Para responder "tempo médio por prioridade com setor = TI":
+# 1. Filtramos as linhas do cubo com setor = TI
+# 2. Somamos soma_tempo e qtd_tempo por prioridade ("roll-up")
+# 3. Dividimos: média = soma_tempo / qtd_tempo
+#
+# Por isso guardamos SOMA e QUANTIDADE: médias não podem ser somadas.
+#
+# Percentis também não podem ser somados. Para eles existe um segundo
+# cubo, o "cubo de tempos": as mesmas dimensões + o balde do sketch
+# (sketch_quantis.py) de cada chamado fechado, com a quantidade por balde.
+# Histogramas podem ser somados, então o roll-up funciona do mesmo jeito:
+# filtramos, somamos as quantidades por balde e lemos os percentis.
+
+DIMENSOES = ['status', 'tipo_chamado', 'setor', 'prioridade', 'responsavel']
+
+
+def construir_cubo(df):
+    """
+    Materializa o cubo: uma linha por combinação de dimensões existente.
+
+    Parâmetros:
+        df (DataFrame): Dados tratados
+
+    Retorna:
+        DataFrame: Dimensões + quantidade, soma_tempo e qtd_tempo
+    """
+    cubo = (
+        df.groupby(DIMENSOES, observed=True, dropna=False)['tempo_atendimento_horas']
+        .agg(quantidade='size', soma_tempo='sum', qtd_tempo='count')
+        .reset_index()
+    )
+    # soma em float64 para não acumular erro do float32
+    cubo['soma_tempo'] = cubo['soma_tempo'].astype('float64')
+    return cubo
+
+
+def filtrar_cubo(cubo, filtros):
+    """
+    Seleciona as células do cubo que atendem aos filtros.
+
+    Parâmetros:
+        cubo (DataFrame): Resultado de construir_cubo()
+        filtros (dict): {dimensão: valor}; valores None são ignorados
+
+    Retorna:
+        DataFrame: Células selecionadas (poucas linhas)
+    """
+    mascara = np.ones(len(cubo), dtype=bool)
+    for dimensao, valor in filtros.items():
+        if valor is not None:
+            mascara &= (cubo[dimensao] == valor).to_numpy()
+    return cubo[mascara]
+
+
+def consolidar(cubo, dimensao):
+    """
+    Roll-up: soma as células do cubo por uma única dimensão.
+
+    Parâmetros:
+        cubo (DataFrame): Cubo (já filtrado, se for o caso)
+        dimensao (str): Dimensão que será mantida
+
+    Retorna:
+        DataFrame: [dimensao, quantidade, soma_tempo, qtd_tempo, tempo_medio],
+                   só com os valores que têm chamados
+    """
+    resultado = (
+        cubo.groupby(dimensao, observed=True)[['quantidade', 'soma_tempo', 'qtd_tempo']]
+        .sum()
+        .reset_index()
+    )
+    resultado = resultado[resultado['quantidade'] > 0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # 0 / 0 vira NaN: valor sem nenhum chamado fechado
+        return resultado.assign(tempo_medio=resultado['soma_tempo'] / resultado['qtd_tempo'])
+
+
+def totais(cubo):
+    """
+    Totais gerais das células do cubo (para os cards de métricas).
+
+    Retorna:
+        dict: total, contagem por status, críticos e tempo médio
+    """
+    por_status = cubo.groupby('status', observed=True)['quantidade'].sum()
+    qtd_tempo = cubo['qtd_tempo'].sum()
+    return {
+        'total': int(cubo['quantidade'].sum()),
+        'abertos': int(por_status.get('Aberto', 0)),
+        'em_andamento': int(por_status.get('Em Andamento', 0)),
+        'fechados': int(por_status.get('Fechado', 0)),
+        'tempo_medio': float(cubo['soma_tempo'].sum() / qtd_tempo) if qtd_tempo > 0 else float('nan'),
+        'criticos': int(cubo.loc[cubo['prioridade'] == 'Critica', 'quantidade'].sum()),
+    }
+
+
+def combinar_cubos(cubo, outro):
+    """
+    Soma dois cubos do mesmo tipo (ex.: o cubo atual e o das linhas novas).
+
+    Como o cubo só guarda somas e quantidades, somar os cubos de duas
+    partes dá o mesmo cubo da base inteira: não é preciso reagrupar tudo.
+
+    Parâmetros:
+        cubo (DataFrame): Cubo atual (construir_cubo ou construir_cubo_tempos)
+        outro (DataFrame): Cubo do mesmo tipo, com as categorias já unificadas
+
+    Retorna:
+        DataFrame: Cubo combinado
+    """
+    if len(outro) == 0:
+        return cubo
+    chaves = [coluna for coluna in outro.columns if coluna in DIMENSOES or coluna == 'balde']
+    valores = [coluna for coluna in outro.columns if coluna not in chaves]
+    # As categorias do cubo novo incluem as antigas (e talvez valores novos)
+    tipos = {dimensao: outro[dimensao].dtype for dimensao in DIMENSOES}
+    return (
+        pd.concat([cubo.astype(tipos), outro], ignore_index=True)
+        .groupby(chaves, observed=True, dropna=False)[valores]
+        .sum()
+        .reset_index()
+    )
+
+
+def construir_cubo_tempos(df):
+    """
+    Materializa o cubo de tempos: quantidade de chamados fechados por
+    combinação de dimensões e balde do sketch de quantis.
+
+    Parâmetros:
+        df (DataFrame): Dados tratados
+
+    Retorna:
+        DataFrame: Dimensões + balde e quantidade
+    """
+    fechados = df.loc[df['tempo_atendimento_horas'].notna(), DIMENSOES]
+    baldes = indices_baldes(df['tempo_atendimento_horas'].dropna().to_numpy())
+    return (
+        fechados.assign(balde=baldes)
+        .groupby(DIMENSOES + ['balde'], observed=True, dropna=False)
+        .size()
+        .reset_index(name='quantidade')
+    )
+
+
+def percentis(cubo_tempos, dimensao=None):
+    """
+    Roll-up dos percentis do tempo (p50/p90/p95/p99).
+
+    Parâmetros:
+        cubo_tempos (DataFrame): Cubo de tempos (já filtrado, se for o caso)
+        dimensao (str): Dimensão mantida (None = percentis gerais)
+
+    Retorna:
+        dict ou DataFrame: {nome: horas} sem dimensão; com dimensão,
+                           [dimensao, p50, p90, p95, p99]
+    """
+    if dimensao is None:
+        histograma = cubo_tempos.groupby('balde')['quantidade'].sum()
+        return quantis_de_baldes(histograma.index.to_numpy(), histograma.to_numpy())
+
+    histograma = cubo_tempos.groupby([dimensao, 'balde'], observed=True)['quantidade'].sum()
+    linhas = {
+        valor: quantis_de_baldes(grupo.index.get_level_values('balde').to_numpy(), grupo.to_numpy())
+        for valor, grupo in histograma.groupby(level=dimensao, observed=True)
+    }
+    resultado = pd.DataFrame.from_dict(linhas, orient='index', columns=list(QUANTIS_PADRAO))
+    return resultado.rename_axis(dimensao).reset_index()
@@ -9,6 +9,9 @@ Descrição: Dashboard interativo para visualização de métricas de suporte de
 Para executar:
     streamlit run dashboard.py
 
+    Com a base em um banco SQLite (consultas no banco, sem a base na memória):
+    streamlit run dashboard.py -- --sqlite
+
 O que você vai aprender:
 - Como criar dashboards com Streamlit
 - Visualização de dados com gráficos
@@ -16,12 +19,37 @@ O que você vai aprender:
 ==============================================================================
 """
 
+import argparse
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
 
+# Carregamento com cache colunar, compartilhado com o gerador de relatório
+from gerador_relatorio import carregar_dados_com_cache
+
+# Índice bitmap: seleção das linhas da tabela sem copiar o DataFrame
+import indice_bitmap
+
+# Cubo OLAP: cards e gráficos respondidos por agregados pré-calculados
+import cubo_olap
+
+# Backlog ao longo do tempo (varredura de eventos de abertura/fechamento)
+import serie_backlog
+
+# Tabela de dados paginada sobre uma ordenação calculada uma vez
+import paginacao_tabela
+
+# Modo ao vivo: acompanha o CSV e acrescenta as linhas novas
+import atualizacao_ao_vivo
+
+# Modo SQLite: cards, gráficos e tabela respondidos por consultas no banco
+import banco_sqlite
+
+# Base compartilhada: Arrow mapeado na memória, lido sem cópia
+import base_compartilhada
+
 # ==============================================================================
 # CONFIGURAÇÃO DA PÁGINA
 # ==============================================================================
@@ -80,174 +108,235 @@ st.markdown("""
 # FUNÇÕES DE CARREGAMENTO E TRATAMENTO
 # ==============================================================================
 
-@st.cache_data  # Cache para não recarregar dados a cada interação
-def carregar_dados():
-    """
-    Carrega e trata os dados do CSV.
-    
-    @st.cache_data é um decorador que cacheia os dados.
-    Isso significa que a função só roda uma vez, depois usa o cache.
-    Melhora muito a performance do dashboard!
+def ler_opcoes():
     """
-    df = pd.read_csv('chamados_ti.csv')
-    
-    # Tratamento de datas
-    df['data_abertura'] = pd.to_datetime(df['data_abertura'])
-    df['data_fechamento'] = pd.to_datetime(df['data_fechamento'], errors='coerce')
-    
-    # Cálculo do tempo de atendimento
-    df['tempo_atendimento_horas'] = (
-        (df['data_fechamento'] - df['data_abertura'])
-        .dt.total_seconds() / 3600
-    ).round(2)
-    
-    return df
-
-
-def calcular_metricas(df):
-    """Calcula as métricas principais do dashboard."""
-    return {
-        'total': len(df),
-        'abertos': len(df[df['status'] == 'Aberto']),
-        'em_andamento': len(df[df['status'] == 'Em Andamento']),
-        'fechados': len(df[df['status'] == 'Fechado']),
-        'tempo_medio': df['tempo_atendimento_horas'].mean(),
-        'criticos': len(df[df['prioridade'] == 'Critica'])
-    }
+    Lê as opções do dashboard, passadas depois de "--" no streamlit run:
 
+        streamlit run dashboard.py -- --ao-vivo --intervalo 5 --espera 2
+        streamlit run dashboard.py -- --sqlite
+        streamlit run dashboard.py -- --base-compartilhada
 
-# ==============================================================================
-# CARREGAMENTO DOS DADOS
-# ==============================================================================
+    Retorna:
+        Namespace: ao_vivo, intervalo, espera, sqlite e base_compartilhada
+    """
+    parser = argparse.ArgumentParser(description="Dashboard de Suporte de TI")
+    parser.add_argument('--ao-vivo', action='store_true',
+                        help="Acompanha o CSV e mostra os chamados novos sem reiniciar")
+    parser.add_argument('--intervalo', type=float,
+                        default=atualizacao_ao_vivo.INTERVALO_VERIFICACAO_PADRAO,
+                        help="Segundos entre verificações do arquivo (padrão: %(default)s)")
+    parser.add_argument('--espera', type=float,
+                        default=atualizacao_ao_vivo.ESPERA_ESTABILIDADE_PADRAO,
+                        help="Segundos sem mudança no arquivo antes de lê-lo (padrão: %(default)s)")
+    parser.add_argument('--sqlite', action='store_true',
+                        help="Consulta a base em um banco SQLite com índices (ver banco_sqlite.py)")
+    parser.add_argument('--base-compartilhada', action='store_true',
+                        help="Mapeia a base tratada na memória, sem cópia (ver base_compartilhada.py)")
+    # parse_known_args: argumentos que não são do dashboard são ignorados
+    opcoes, _ = parser.parse_known_args()
+    return opcoes
+
+
+OPCOES = ler_opcoes()
+if OPCOES.sqlite and OPCOES.ao_vivo:
+    st.error("As opções --sqlite e --ao-vivo não podem ser usadas juntas.")
+    st.stop()
+if OPCOES.base_compartilhada and (OPCOES.sqlite or OPCOES.ao_vivo):
+    st.error("A opção --base-compartilhada não combina com --sqlite nem com --ao-vivo.")
+    st.stop()
+
+CAMINHO_DADOS = 'chamados_ti.csv'
+
+# Colunas que aparecem como filtros na sidebar
+COLUNAS_FILTRO = ['status', 'tipo_chamado', 'setor', 'prioridade']
+
+
+@st.cache_resource  # Uma única base por processo, compartilhada pelas sessões
+def carregar_base():
+    """
+    Carrega e trata os dados do CSV e monta, uma única vez, a "visão" que
+    o dashboard consulta (ver atualizacao_ao_vivo.montar_visao):
+
+    - o índice bitmap das colunas de filtro: cada clique em um filtro é só
+      um E (AND) entre bitmaps, em vez de df.copy() e várias máscaras;
+    - o cubo OLAP e o cubo de tempos: cards, gráficos e percentis saem de
+      agregados pequenos, e o custo de cada rerun depende do número de
+      combinações, não do número de chamados;
+    - a ordem da tabela (mais recentes primeiro): cada página é uma fatia.
+
+    @st.cache_resource guarda o resultado uma vez por processo: a função
+    só roda na primeira visita e todas as sessões usam os mesmos objetos,
+    sem cópia a cada interação.
+
+    No modo normal, os dados vêm do snapshot colunar gravado pelo gerador
+    de relatório, sem reler o CSV. No modo ao vivo, o CSV é lido até o
+    fim e acompanhado: as linhas novas são acrescentadas à visão.
+
+    No modo SQLite, a visão é só o caminho do banco (montado a partir do
+    CSV quando ele muda), os valores dos filtros e o período: o resto é
+    consultado no banco a cada filtro, sem a base na memória.
+
+    No modo base compartilhada, as colunas do DataFrame são vistas
+    somente leitura sobre um arquivo Arrow mapeado na memória: a base
+    não é copiada para o processo, e outros processos que abrirem o
+    mesmo arquivo dividem as mesmas páginas.
+    """
+    if OPCOES.sqlite:
+        caminho_banco = banco_sqlite.carregar_no_banco(CAMINHO_DADOS, exibir_mensagens=False)
+        meta = banco_sqlite.ler_meta(caminho_banco)
+        return {'visao': {
+            'banco': caminho_banco,
+            # Tamanho e mtime do CSV carregado: mudam mesmo que o número de linhas não mude
+            'versao': (meta['tamanho'], meta['mtime_ns']),
+            'valores_filtro': {coluna: banco_sqlite.valores_distintos(caminho_banco, coluna)
+                               for coluna in COLUNAS_FILTRO},
+            'datas_abertura': banco_sqlite.periodo_abertura(caminho_banco),
+        }}
+    if OPCOES.ao_vivo:
+        return atualizacao_ao_vivo.abrir_base(CAMINHO_DADOS, COLUNAS_FILTRO)
+    if OPCOES.base_compartilhada:
+        df = base_compartilhada.carregar_base_compartilhada(CAMINHO_DADOS)
+    else:
+        df = carregar_dados_com_cache(CAMINHO_DADOS, exibir_mensagens=False)
+    return {'visao': atualizacao_ao_vivo.montar_visao(df, COLUNAS_FILTRO)}
 
-df = carregar_dados()
-metricas = calcular_metricas(df)
 
-# ==============================================================================
-# SIDEBAR - FILTROS
-# ==============================================================================
+@st.cache_data(max_entries=128)  # Uma consulta por combinação de filtros já vista
+def consultar_cubo_banco(caminho_banco, filtros_itens, tempos, versao):
+    """Cubo filtrado calculado no banco (modo SQLite)."""
+    return banco_sqlite.consultar_cubo(caminho_banco, dict(filtros_itens), tempos)
 
-st.sidebar.markdown("## 🔧 Filtros")
 
-# Filtro de Status
-status_options = ['Todos'] + list(df['status'].unique())
-status_selecionado = st.sidebar.selectbox('Status', status_options)
+@st.cache_resource(max_entries=16)  # Uma seleção por combinação de filtros, para todas as sessões
+def linhas_da_tabela(_visao, filtros_itens, versao):
+    """
+    Posições das linhas da tabela (já ordenadas) que atendem aos filtros.
 
-# Filtro de Tipo de Chamado
-tipo_options = ['Todos'] + list(df['tipo_chamado'].unique())
-tipo_selecionado = st.sidebar.selectbox('Tipo de Chamado', tipo_options)
+    Fica em st.cache_resource, e não em st.cache_data: as sessões com os
+    mesmos filtros recebem o MESMO array (somente leitura), sem uma cópia
+    por sessão. Sem filtro nenhum, é a própria ordem da visão.
+    """
+    filtros = dict(filtros_itens)
+    if all(valor is None for valor in filtros.values()):
+        return _visao['ordem']
+    selecao = indice_bitmap.selecionar(_visao['indice'], filtros)
+    linhas = paginacao_tabela.filtrar_ordem(_visao['ordem'],
+                                           indice_bitmap.mascara(_visao['indice'], selecao))
+    linhas.flags.writeable = False
+    return linhas
 
-# Filtro de Setor
-setor_options = ['Todos'] + list(df['setor'].unique())
-setor_selecionado = st.sidebar.selectbox('Setor', setor_options)
 
-# Filtro de Prioridade
-prioridade_options = ['Todos'] + list(df['prioridade'].unique())
-prioridade_selecionada = st.sidebar.selectbox('Prioridade', prioridade_options)
+def cubo_da_visao(visao, filtros, tempos=False):
+    """
+    Cubo (ou cubo de tempos) dos chamados que atendem aos filtros.
 
-# Aplicar filtros
-df_filtrado = df.copy()
+    No modo SQLite vem de um GROUP BY no banco; nos outros modos, das
+    células do cubo em memória.
+    """
+    if 'banco' in visao:
+        return consultar_cubo_banco(visao['banco'], tuple(filtros.items()), tempos, visao['versao'])
+    return cubo_olap.filtrar_cubo(visao['cubo_tempos' if tempos else 'cubo'], filtros)
 
-if status_selecionado != 'Todos':
-    df_filtrado = df_filtrado[df_filtrado['status'] == status_selecionado]
-if tipo_selecionado != 'Todos':
-    df_filtrado = df_filtrado[df_filtrado['tipo_chamado'] == tipo_selecionado]
-if setor_selecionado != 'Todos':
-    df_filtrado = df_filtrado[df_filtrado['setor'] == setor_selecionado]
-if prioridade_selecionada != 'Todos':
-    df_filtrado = df_filtrado[df_filtrado['prioridade'] == prioridade_selecionada]
 
-# Recalcular métricas com filtros
-metricas_filtradas = calcular_metricas(df_filtrado)
+def valores_filtro(visao, coluna):
+    """Valores de uma coluna para o filtro da sidebar."""
+    if 'banco' in visao:
+        return visao['valores_filtro'][coluna]
+    return list(visao['indice']['bitmaps'][coluna])
 
-# Informação da sidebar
-st.sidebar.markdown("---")
-st.sidebar.markdown(f"📊 **Chamados exibidos:** {len(df_filtrado)}")
-st.sidebar.markdown(f"📅 **Período:** Jan-Mar 2024")
 
-# ==============================================================================
-# CONTEÚDO PRINCIPAL
-# ==============================================================================
+def datas_abertura(visao):
+    """Datas de abertura (no modo SQLite, só a primeira e a última)."""
+    if 'banco' in visao:
+        return visao['datas_abertura']
+    return visao['df']['data_abertura']
 
-# Título
-st.markdown('<h1 class="main-title">📊 Dashboard de Suporte de TI</h1>', unsafe_allow_html=True)
 
-# Subtítulo
-st.markdown(
-    '<p style="text-align: center; color: #666; margin-bottom: 30px;">'
-    'Análise de chamados técnicos | Período: Janeiro a Março de 2024</p>',
-    unsafe_allow_html=True
-)
+MESES = ['Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho', 'Julho',
+         'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
 
-# ==============================================================================
-# CARDS DE MÉTRICAS
-# ==============================================================================
 
-st.markdown('<p class="section-title">📈 Métricas Principais</p>', unsafe_allow_html=True)
+def descrever_periodo(datas, abreviado=False):
+    """
+    Descreve o período coberto pelos dados (ex.: "Janeiro a Março de 2024").
 
-# Criando 6 colunas para os cards
-col1, col2, col3, col4, col5, col6 = st.columns(6)
+    Parâmetros:
+        datas (Series): Datas de abertura dos chamados
+        abreviado (bool): Se True, usa a forma curta (ex.: "Jan-Mar 2024")
 
-with col1:
-    st.metric(
-        label="📋 Total",
-        value=metricas_filtradas['total'],
-        delta=None
-    )
+    Retorna:
+        str: Descrição do período
+    """
+    inicio, fim = datas.min(), datas.max()
+    if pd.isna(inicio):
+        return 'Sem dados'
 
-with col2:
-    st.metric(
-        label="🔴 Abertos",
-        value=metricas_filtradas['abertos'],
-        delta=f"{(metricas_filtradas['abertos']/metricas_filtradas['total']*100):.0f}%" if metricas_filtradas['total'] > 0 else "0%"
-    )
+    def nome_mes(data):
+        return MESES[data.month - 1][:3] if abreviado else MESES[data.month - 1]
 
-with col3:
-    st.metric(
-        label="🟡 Em Andamento",
-        value=metricas_filtradas['em_andamento'],
-        delta=f"{(metricas_filtradas['em_andamento']/metricas_filtradas['total']*100):.0f}%" if metricas_filtradas['total'] > 0 else "0%"
-    )
+    if abreviado:
+        if inicio.year != fim.year:
+            return f"{nome_mes(inicio)} {inicio.year} - {nome_mes(fim)} {fim.year}"
+        if inicio.month == fim.month:
+            return f"{nome_mes(inicio)} {inicio.year}"
+        return f"{nome_mes(inicio)}-{nome_mes(fim)} {inicio.year}"
 
-with col4:
-    st.metric(
-        label="🟢 Fechados",
-        value=metricas_filtradas['fechados'],
-        delta=f"{(metricas_filtradas['fechados']/metricas_filtradas['total']*100):.0f}%" if metricas_filtradas['total'] > 0 else "0%"
-    )
+    if inicio.year != fim.year:
+        return f"{nome_mes(inicio)} de {inicio.year} a {nome_mes(fim)} de {fim.year}"
+    if inicio.month == fim.month:
+        return f"{nome_mes(inicio)} de {inicio.year}"
+    return f"{nome_mes(inicio)} a {nome_mes(fim)} de {inicio.year}"
 
-with col5:
-    tempo_medio_display = f"{metricas_filtradas['tempo_medio']:.1f}h" if pd.notna(metricas_filtradas['tempo_medio']) else "N/A"
-    st.metric(
-        label="⏱️ Tempo Médio",
-        value=tempo_medio_display
-    )
 
-with col6:
-    st.metric(
-        label="🚨 Críticos",
-        value=metricas_filtradas['criticos'],
-        delta="Atenção!" if metricas_filtradas['criticos'] > 0 else None,
-        delta_color="inverse"
-    )
+def tabela_contagem(cubo, dimensao, nome):
+    """
+    Monta a tabela [nome, Quantidade] de um gráfico a partir do cubo.
+
+    Mesma ordem de value_counts(): decrescente e sem valores vazios.
+    """
+    contagem = cubo_olap.consolidar(cubo, dimensao)
+    contagem = contagem.sort_values('quantidade', ascending=False, kind='stable')
+    return pd.DataFrame({nome: contagem[dimensao].to_numpy(), 'Quantidade': contagem['quantidade'].to_numpy()})
 
-st.markdown("---")
 
 # ==============================================================================
-# GRÁFICOS - LINHA 1
+# FIGURAS EM CACHE
 # ==============================================================================
+# Montar uma figura Plotly (px.pie, px.bar...) é a parte mais cara de cada
+# rerun. Cada figura depende só da VERSÃO DOS DADOS e dos FILTROS (e de
+# alguma escolha da própria seção, como a resolução do backlog): se nada
+# disso mudou, a figura é a mesma. Por isso as figuras ficam em cache com
+# essa chave, e mexer na tabela não reconstrói nenhum gráfico.
+#
+# Os filtros chegam como uma tupla de pares (coluna, valor): o
+# st.cache_data precisa de argumentos "hasheáveis" para montar a chave.
+# A visão dos dados é passada como '_visao': argumentos que começam com
+# '_' ficam fora da chave (calcular o hash de um DataFrame a cada rerun
+# seria caro). Quem identifica os dados na chave é a 'versao'.
+
+# Ordem de exibição das prioridades (da mais urgente para a menos urgente)
+ORDEM_PRIORIDADE = ['Critica', 'Alta', 'Media', 'Baixa']
+
+
+@st.cache_data(max_entries=64)  # Uma entrada por combinação de filtros já vista
+def figuras_categorias(_visao, filtros_itens, versao):
+    """
+    Gráficos de contagem por status, tipo, setor e prioridade.
 
-st.markdown('<p class="section-title">📊 Análise por Categoria</p>', unsafe_allow_html=True)
+    Parâmetros:
+        _visao (dict): Visão dos dados (fora da chave do cache)
+        filtros_itens (tuple): Filtros como pares (coluna, valor)
+        versao: _visao['versao'] (identifica os dados na chave)
 
-col_chart1, col_chart2 = st.columns(2)
+    Retorna:
+        dict: {'status', 'tipo', 'setor', 'prioridade'} → figura Plotly
+    """
+    # Contagens consolidadas a partir do cubo filtrado
+    cubo_filtrado = cubo_da_visao(_visao, dict(filtros_itens))
 
-with col_chart1:
     # Gráfico de Pizza - Chamados por Status
-    df_status = df_filtrado['status'].value_counts().reset_index()
-    df_status.columns = ['Status', 'Quantidade']
-    
     fig_status = px.pie(
-        df_status,
+        tabela_contagem(cubo_filtrado, 'status', 'Status'),
         values='Quantidade',
         names='Status',
         title='Chamados por Status',
@@ -264,15 +353,10 @@ with col_chart1:
         showlegend=True,
         legend=dict(orientation="h", yanchor="bottom", y=-0.2)
     )
-    st.plotly_chart(fig_status, use_container_width=True)
 
-with col_chart2:
     # Gráfico de Barras - Chamados por Tipo
-    df_tipo = df_filtrado['tipo_chamado'].value_counts().reset_index()
-    df_tipo.columns = ['Tipo', 'Quantidade']
-    
     fig_tipo = px.bar(
-        df_tipo,
+        tabela_contagem(cubo_filtrado, 'tipo_chamado', 'Tipo'),
         x='Tipo',
         y='Quantidade',
         title='Chamados por Tipo',
@@ -284,21 +368,10 @@ with col_chart2:
         yaxis_title="Quantidade",
         showlegend=False
     )
-    st.plotly_chart(fig_tipo, use_container_width=True)
-
-# ==============================================================================
-# GRÁFICOS - LINHA 2
-# ==============================================================================
 
-col_chart3, col_chart4 = st.columns(2)
-
-with col_chart3:
     # Gráfico de Barras Horizontais - Chamados por Setor
-    df_setor = df_filtrado['setor'].value_counts().reset_index()
-    df_setor.columns = ['Setor', 'Quantidade']
-    
     fig_setor = px.bar(
-        df_setor,
+        tabela_contagem(cubo_filtrado, 'setor', 'Setor'),
         y='Setor',
         x='Quantidade',
         title='Chamados por Setor',
@@ -311,15 +384,10 @@ with col_chart3:
         xaxis_title="Quantidade de Chamados",
         showlegend=False
     )
-    st.plotly_chart(fig_setor, use_container_width=True)
 
-with col_chart4:
     # Gráfico de Pizza - Chamados por Prioridade
-    df_prioridade = df_filtrado['prioridade'].value_counts().reset_index()
-    df_prioridade.columns = ['Prioridade', 'Quantidade']
-    
     fig_prioridade = px.pie(
-        df_prioridade,
+        tabela_contagem(cubo_filtrado, 'prioridade', 'Prioridade'),
         values='Quantidade',
         names='Prioridade',
         title='Chamados por Prioridade',
@@ -336,33 +404,41 @@ with col_chart4:
         showlegend=True,
         legend=dict(orientation="h", yanchor="bottom", y=-0.2)
     )
-    st.plotly_chart(fig_prioridade, use_container_width=True)
 
-st.markdown("---")
+    return {'status': fig_status, 'tipo': fig_tipo, 'setor': fig_setor, 'prioridade': fig_prioridade}
 
-# ==============================================================================
-# GRÁFICO DE TEMPO MÉDIO POR PRIORIDADE
-# ==============================================================================
 
-st.markdown('<p class="section-title">⏱️ Análise de Tempo de Atendimento</p>', unsafe_allow_html=True)
+@st.cache_data(max_entries=64)
+def figuras_tempo(_visao, filtros_itens, versao):
+    """
+    Gráficos de tempo: média por prioridade, chamados por responsável e
+    percentis por prioridade.
 
-col_tempo1, col_tempo2 = st.columns(2)
+    Parâmetros:
+        _visao (dict): Visão dos dados (fora da chave do cache)
+        filtros_itens (tuple): Filtros como pares (coluna, valor)
+        versao: _visao['versao'] (identifica os dados na chave)
+
+    Retorna:
+        dict: {'tempo', 'responsavel', 'percentis_prioridade'} → figura Plotly
+    """
+    filtros = dict(filtros_itens)
+    cubo_filtrado = cubo_da_visao(_visao, filtros)
+    cubo_tempos_filtrado = cubo_da_visao(_visao, filtros, tempos=True)
 
-with col_tempo1:
     # Tempo médio por prioridade
-    df_tempo_prioridade = df_filtrado.groupby('prioridade')['tempo_atendimento_horas'].mean().reset_index()
+    df_tempo_prioridade = cubo_olap.consolidar(cubo_filtrado, 'prioridade')[['prioridade', 'tempo_medio']]
     df_tempo_prioridade.columns = ['Prioridade', 'Tempo Médio (h)']
     df_tempo_prioridade = df_tempo_prioridade.dropna()
-    
+
     # Ordenar por tempo
-    ordem_prioridade = ['Critica', 'Alta', 'Media', 'Baixa']
     df_tempo_prioridade['Prioridade'] = pd.Categorical(
-        df_tempo_prioridade['Prioridade'], 
-        categories=ordem_prioridade, 
+        df_tempo_prioridade['Prioridade'],
+        categories=ORDEM_PRIORIDADE,
         ordered=True
     )
     df_tempo_prioridade = df_tempo_prioridade.sort_values('Prioridade')
-    
+
     fig_tempo = px.bar(
         df_tempo_prioridade,
         x='Prioridade',
@@ -377,17 +453,14 @@ with col_tempo1:
         }
     )
     fig_tempo.update_layout(showlegend=False)
-    st.plotly_chart(fig_tempo, use_container_width=True)
 
-with col_tempo2:
     # Performance por Responsável
-    df_responsavel = df_filtrado.groupby('responsavel').agg({
-        'id_chamado': 'count',
-        'tempo_atendimento_horas': 'mean'
-    }).reset_index()
+    df_responsavel = cubo_olap.consolidar(cubo_filtrado, 'responsavel')[
+        ['responsavel', 'quantidade', 'tempo_medio']
+    ]
     df_responsavel.columns = ['Responsável', 'Total Chamados', 'Tempo Médio (h)']
     df_responsavel = df_responsavel.dropna()
-    
+
     fig_responsavel = px.bar(
         df_responsavel,
         x='Responsável',
@@ -400,20 +473,402 @@ with col_tempo2:
         xaxis_title="",
         yaxis_title="Quantidade de Chamados"
     )
-    st.plotly_chart(fig_responsavel, use_container_width=True)
+
+    # Percentis por prioridade, lado a lado (barras agrupadas)
+    df_percentis_prioridade = cubo_olap.percentis(cubo_tempos_filtrado, 'prioridade')
+    df_percentis_prioridade['prioridade'] = pd.Categorical(
+        df_percentis_prioridade['prioridade'],
+        categories=ORDEM_PRIORIDADE,
+        ordered=True
+    )
+    df_percentis_prioridade = df_percentis_prioridade.sort_values('prioridade')
+
+    fig_percentis_prioridade = px.bar(
+        df_percentis_prioridade.melt(id_vars='prioridade', var_name='Percentil', value_name='Horas'),
+        x='prioridade',
+        y='Horas',
+        color='Percentil',
+        barmode='group',
+        title='Percentis do Tempo por Prioridade'
+    )
+    fig_percentis_prioridade.update_layout(xaxis_title="Prioridade", yaxis_title="Horas")
+
+    return {'tempo': fig_tempo, 'responsavel': fig_responsavel,
+            'percentis_prioridade': fig_percentis_prioridade}
+
+
+@st.cache_data(max_entries=64)
+def figura_percentis(_visao, filtros_itens, coluna, nome, versao):
+    """
+    Percentis do tempo por tipo de chamado ou por responsável.
+
+    Parâmetros:
+        _visao (dict): Visão dos dados (fora da chave do cache)
+        filtros_itens (tuple): Filtros como pares (coluna, valor)
+        coluna (str): Dimensão do gráfico ('tipo_chamado' ou 'responsavel')
+        nome (str): Nome da dimensão no título
+        versao: _visao['versao'] (identifica os dados na chave)
+
+    Retorna:
+        Figure: Barras agrupadas (um grupo por valor da dimensão)
+    """
+    cubo_tempos_filtrado = cubo_da_visao(_visao, dict(filtros_itens), tempos=True)
+    df_percentis = cubo_olap.percentis(cubo_tempos_filtrado, coluna)
+
+    fig_percentis = px.bar(
+        df_percentis.melt(id_vars=coluna, var_name='Percentil', value_name='Horas'),
+        x=coluna,
+        y='Horas',
+        color='Percentil',
+        barmode='group',
+        title=f'Percentis do Tempo por {nome}'
+    )
+    fig_percentis.update_layout(xaxis_title="", yaxis_title="Horas")
+    return fig_percentis
+
+
+@st.cache_data(max_entries=32)  # Uma série por combinação de filtros já vista
+def figura_backlog(_visao, filtros_itens, resolucao, separar_por, versao):
+    """
+    Série de backlog dos chamados que atendem aos filtros.
+
+    O backlog precisa das datas de cada chamado (o cubo não tem datas):
+    as linhas vêm do índice bitmap e a série é montada pela varredura de
+    eventos de serie_backlog.py, sem filtrar a base uma vez por dia. No
+    modo SQLite, os saldos de cada período são somados no próprio banco.
+
+    Parâmetros:
+        _visao (dict): Visão dos dados (fora da chave do cache)
+        filtros_itens (tuple): Filtros como pares (coluna, valor)
+        resolucao (str): 'Diária' ou 'Por hora'
+        separar_por (str): 'Total', 'Prioridade' ou 'Setor'
+        versao: _visao['versao'] (identifica os dados na chave)
+
+    Retorna:
+        Figure: Gráfico de linhas (None se não houver chamados com data)
+    """
+    frequencia = serie_backlog.FREQUENCIAS['dia' if resolucao == 'Diária' else 'hora']
+    dimensao = None if separar_por == 'Total' else separar_por.lower()
+    dimensoes = [] if dimensao is None else [dimensao]
+
+    if 'banco' in _visao:
+        serie = banco_sqlite.serie_backlog_sql(_visao['banco'], dict(filtros_itens), frequencia, dimensoes)
+    else:
+        indice_filtros = _visao['indice']
+        dados = _visao['df']
+        linhas = indice_bitmap.posicoes(indice_filtros, indice_bitmap.selecionar(indice_filtros, dict(filtros_itens)))
+        if len(linhas) < len(dados):
+            dados = dados.iloc[linhas]
+        serie = serie_backlog.calcular_backlog(dados, frequencia, dimensoes)
+    if serie.empty:
+        return None
+
+    # Colunas (dimensão, valor): ficamos com os valores da dimensão escolhida
+    df_backlog = serie[dimensao or serie_backlog.TOTAL].reset_index().melt(
+        id_vars='periodo', var_name=separar_por, value_name='Chamados em Aberto'
+    )
+    fig_backlog = px.line(
+        df_backlog,
+        x='periodo',
+        y='Chamados em Aberto',
+        color=separar_por,
+        title='Chamados em Aberto no Fim de Cada ' + ('Dia' if resolucao == 'Diária' else 'Hora'),
+        color_discrete_map={
+            'Baixa': '#3498db',
+            'Media': '#2ecc71',
+            'Alta': '#f39c12',
+            'Critica': '#e74c3c'
+        }
+    )
+    fig_backlog.update_layout(xaxis_title="", yaxis_title="Chamados em Aberto",
+                              showlegend=dimensao is not None)
+    return fig_backlog
+
+
+# ==============================================================================
+# CARREGAMENTO DOS DADOS
+# ==============================================================================
+
+base = carregar_base()
+if OPCOES.ao_vivo:
+    # Linhas novas no CSV? (só lê o arquivo depois que ele parou de mudar)
+    atualizacao_ao_vivo.verificar_atualizacao(base, OPCOES.espera)
+
+# A visão é lida UMA vez por rerun: tudo na página vem da mesma versão
+visao = base['visao']
+versao = visao['versao']
+
+# ==============================================================================
+# SIDEBAR - FILTROS
+# ==============================================================================
+
+st.sidebar.markdown("## 🔧 Filtros")
+
+# Filtro de Status
+status_options = ['Todos'] + valores_filtro(visao, 'status')
+status_selecionado = st.sidebar.selectbox('Status', status_options)
+
+# Filtro de Tipo de Chamado
+tipo_options = ['Todos'] + valores_filtro(visao, 'tipo_chamado')
+tipo_selecionado = st.sidebar.selectbox('Tipo de Chamado', tipo_options)
+
+# Filtro de Setor
+setor_options = ['Todos'] + valores_filtro(visao, 'setor')
+setor_selecionado = st.sidebar.selectbox('Setor', setor_options)
+
+# Filtro de Prioridade
+prioridade_options = ['Todos'] + valores_filtro(visao, 'prioridade')
+prioridade_selecionada = st.sidebar.selectbox('Prioridade', prioridade_options)
+
+# Aplicar filtros
+# Os cards e gráficos usam só as células do cubo que atendem aos filtros.
+# Nada de df.copy() nem de DataFrames intermediários a cada clique.
+filtros = {
+    'status': status_selecionado,
+    'tipo_chamado': tipo_selecionado,
+    'setor': setor_selecionado,
+    'prioridade': prioridade_selecionada,
+}
+filtros = {coluna: (None if valor == 'Todos' else valor) for coluna, valor in filtros.items()}
+filtros_itens = tuple(filtros.items())
+cubo_filtrado = cubo_da_visao(visao, filtros)
+cubo_tempos_filtrado = cubo_da_visao(visao, filtros, tempos=True)
+
+# Recalcular métricas com filtros
+metricas_filtradas = cubo_olap.totais(cubo_filtrado)
+
+# Informação da sidebar
+st.sidebar.markdown("---")
+st.sidebar.markdown(f"📊 **Chamados exibidos:** {metricas_filtradas['total']}")
+# O período vem dos próprios dados (não fica fixo no código)
+st.sidebar.markdown(f"📅 **Período:** {descrever_periodo(datas_abertura(visao), abreviado=True)}")
+
+# ==============================================================================
+# CONTEÚDO PRINCIPAL
+# ==============================================================================
+
+# Título
+st.markdown('<h1 class="main-title">📊 Dashboard de Suporte de TI</h1>', unsafe_allow_html=True)
+
+# Subtítulo
+st.markdown(
+    '<p style="text-align: center; color: #666; margin-bottom: 30px;">'
+    f'Análise de chamados técnicos | Período: {descrever_periodo(datas_abertura(visao))}</p>',
+    unsafe_allow_html=True
+)
+
+# ==============================================================================
+# CARDS DE MÉTRICAS
+# ==============================================================================
+
+st.markdown('<p class="section-title">📈 Métricas Principais</p>', unsafe_allow_html=True)
+
+# No modo ao vivo, os cards são um fragmento que roda sozinho a cada
+# OPCOES.intervalo segundos (run_every) em cada sessão aberta: confere o
+# CSV e mostra os números da visão mais nova, sem rerun da página inteira.
+@st.fragment(run_every=OPCOES.intervalo if OPCOES.ao_vivo else None)
+def secao_cards(filtros_itens, versao_pagina):
+    """Cards de métricas (sempre da visão mais nova dos dados)."""
+    if OPCOES.ao_vivo:
+        atualizacao_ao_vivo.verificar_atualizacao(base, OPCOES.espera)
+    visao_cards = base['visao']
+    metricas_filtradas = cubo_olap.totais(cubo_da_visao(visao_cards, dict(filtros_itens)))
+
+    # Criando 6 colunas para os cards
+    col1, col2, col3, col4, col5, col6 = st.columns(6)
+
+    with col1:
+        st.metric(
+            label="📋 Total",
+            value=metricas_filtradas['total'],
+            delta=None
+        )
+
+    with col2:
+        st.metric(
+            label="🔴 Abertos",
+            value=metricas_filtradas['abertos'],
+            delta=f"{(metricas_filtradas['abertos']/metricas_filtradas['total']*100):.0f}%" if metricas_filtradas['total'] > 0 else "0%"
+        )
+
+    with col3:
+        st.metric(
+            label="🟡 Em Andamento",
+            value=metricas_filtradas['em_andamento'],
+            delta=f"{(metricas_filtradas['em_andamento']/metricas_filtradas['total']*100):.0f}%" if metricas_filtradas['total'] > 0 else "0%"
+        )
+
+    with col4:
+        st.metric(
+            label="🟢 Fechados",
+            value=metricas_filtradas['fechados'],
+            delta=f"{(metricas_filtradas['fechados']/metricas_filtradas['total']*100):.0f}%" if metricas_filtradas['total'] > 0 else "0%"
+        )
+
+    with col5:
+        tempo_medio_display = f"{metricas_filtradas['tempo_medio']:.1f}h" if pd.notna(metricas_filtradas['tempo_medio']) else "N/A"
+        st.metric(
+            label="⏱️ Tempo Médio",
+            value=tempo_medio_display
+        )
+
+    with col6:
+        st.metric(
+            label="🚨 Críticos",
+            value=metricas_filtradas['criticos'],
+            delta="Atenção!" if metricas_filtradas['criticos'] > 0 else None,
+            delta_color="inverse"
+        )
+
+    if visao_cards['versao'] != versao_pagina:
+        # Os gráficos e a tabela continuam na versão do último rerun
+        # completo: não são refeitos sem pedido (o usuário pode estar lendo)
+        col_aviso, col_botao = st.columns([5, 1])
+        col_aviso.info("🔄 Chegaram chamados novos: os cards já estão atualizados.")
+        if col_botao.button('Atualizar página', use_container_width=True):
+            st.rerun()
+
+
+secao_cards(filtros_itens, versao)
+
+st.markdown("---")
+
+# ==============================================================================
+# GRÁFICOS - LINHA 1
+# ==============================================================================
+# As figuras vêm do cache (ver FIGURAS EM CACHE): só são montadas de novo
+# quando os filtros ou os dados mudam.
+
+figuras = figuras_categorias(visao, filtros_itens, versao)
+
+st.markdown('<p class="section-title">📊 Análise por Categoria</p>', unsafe_allow_html=True)
+
+col_chart1, col_chart2 = st.columns(2)
+
+with col_chart1:
+    st.plotly_chart(figuras['status'], use_container_width=True)
+
+with col_chart2:
+    st.plotly_chart(figuras['tipo'], use_container_width=True)
+
+# ==============================================================================
+# GRÁFICOS - LINHA 2
+# ==============================================================================
+
+col_chart3, col_chart4 = st.columns(2)
+
+with col_chart3:
+    st.plotly_chart(figuras['setor'], use_container_width=True)
+
+with col_chart4:
+    st.plotly_chart(figuras['prioridade'], use_container_width=True)
+
+st.markdown("---")
+
+# ==============================================================================
+# GRÁFICO DE TEMPO MÉDIO POR PRIORIDADE
+# ==============================================================================
+
+st.markdown('<p class="section-title">⏱️ Análise de Tempo de Atendimento</p>', unsafe_allow_html=True)
+
+figuras_tempo_filtradas = figuras_tempo(visao, filtros_itens, versao)
+col_tempo1, col_tempo2 = st.columns(2)
+
+with col_tempo1:
+    st.plotly_chart(figuras_tempo_filtradas['tempo'], use_container_width=True)
+
+with col_tempo2:
+    st.plotly_chart(figuras_tempo_filtradas['responsavel'], use_container_width=True)
+
+# ==============================================================================
+# PERCENTIS DO TEMPO DE ATENDIMENTO (SLA)
+# ==============================================================================
+# A média esconde os chamados que demoram muito. O p90 responde: "90% dos
+# chamados foram resolvidos em até quantas horas?" (erro máximo de 1%)
+
+st.markdown('<p class="section-title">🎯 Percentis do Tempo de Atendimento (SLA)</p>', unsafe_allow_html=True)
+
+percentis_gerais = cubo_olap.percentis(cubo_tempos_filtrado)
+for coluna, (nome, valor) in zip(st.columns(len(percentis_gerais)), percentis_gerais.items()):
+    with coluna:
+        st.metric(label=f"⏱️ {nome.upper()}", value=f"{valor:.1f}h" if pd.notna(valor) else "N/A")
+
+
+# @st.fragment: uma seção que roda de novo SOZINHA. Quando um widget de
+# dentro dela muda (aqui, o botão de rádio), o Streamlit executa só esta
+# função, e não o script inteiro: cards, gráficos e tabela ficam como estão.
+@st.fragment
+def secao_percentis_por(visao, filtros_itens):
+    """Percentis por tipo de chamado ou por responsável (escolha do usuário)."""
+    dimensoes_percentis = {'Tipo de Chamado': 'tipo_chamado', 'Responsável': 'responsavel'}
+    dimensao_escolhida = st.radio('Percentis por', list(dimensoes_percentis), horizontal=True)
+    st.plotly_chart(
+        figura_percentis(visao, filtros_itens, dimensoes_percentis[dimensao_escolhida],
+                         dimensao_escolhida, visao['versao']),
+        use_container_width=True
+    )
+
+
+col_percentil1, col_percentil2 = st.columns(2)
+
+with col_percentil1:
+    st.plotly_chart(figuras_tempo_filtradas['percentis_prioridade'], use_container_width=True)
+
+with col_percentil2:
+    secao_percentis_por(visao, filtros_itens)
+
+st.markdown("---")
+
+# ==============================================================================
+# BACKLOG AO LONGO DO TEMPO
+# ==============================================================================
+# Quantos chamados estavam em aberto no fim de cada dia (ou hora).
+# A fila está crescendo? A equipe está dando conta da demanda?
+
+st.markdown('<p class="section-title">📈 Backlog ao Longo do Tempo</p>', unsafe_allow_html=True)
+
+
+@st.fragment
+def secao_backlog(visao, filtros_itens):
+    """Gráfico do backlog, com a resolução e a separação escolhidas."""
+    col_backlog1, col_backlog2 = st.columns(2)
+    with col_backlog1:
+        resolucao = st.radio('Resolução', ['Diária', 'Por hora'], horizontal=True)
+    with col_backlog2:
+        separar_por = st.radio('Separar por', ['Total', 'Prioridade', 'Setor'], horizontal=True)
+
+    fig_backlog = figura_backlog(visao, filtros_itens, resolucao, separar_por, visao['versao'])
+    if fig_backlog is None:
+        st.info("Nenhum chamado com data de abertura para os filtros selecionados.")
+    else:
+        st.plotly_chart(fig_backlog, use_container_width=True)
+
+
+secao_backlog(visao, filtros_itens)
 
 st.markdown("---")
 
 # ==============================================================================
 # TABELA DE DADOS
 # ==============================================================================
+# Também é um fragmento: mostrar a tabela, trocar as colunas ou mudar de
+# página roda só esta seção, sem passar pelos cards e gráficos.
 
 st.markdown('<p class="section-title">📋 Dados Detalhados</p>', unsafe_allow_html=True)
 
-# Checkbox para mostrar/esconder tabela
-if st.checkbox('Mostrar tabela de dados', value=False):
+
+@st.fragment
+def secao_tabela(visao, filtros_itens):
+    """Tabela paginada dos chamados que atendem aos filtros."""
+    # Checkbox para mostrar/esconder tabela
+    if not st.checkbox('Mostrar tabela de dados', value=False):
+        return
+
     # Seletor de colunas
-    colunas_disponiveis = df_filtrado.columns.tolist()
+    if 'banco' in visao:
+        colunas_disponiveis = banco_sqlite.COLUNAS_BANCO[:-1]
+    else:
+        colunas_disponiveis = visao['df'].columns.tolist()
     colunas_selecionadas = st.multiselect(
         'Selecione as colunas:',
         colunas_disponiveis,
@@ -421,14 +876,69 @@ if st.checkbox('Mostrar tabela de dados', value=False):
     )
     
     if colunas_selecionadas:
+        if 'banco' in visao:
+            # Modo SQLite: COUNT agora e, mais abaixo, ORDER BY ... LIMIT da página
+            total_linhas = banco_sqlite.contar_chamados(visao['banco'], dict(filtros_itens))
+        else:
+            # A tabela precisa das linhas em si: aqui entra o índice bitmap.
+            # A ordem (mais recentes primeiro) já vem pronta; o filtro só
+            # remove as linhas que não foram selecionadas
+            linhas_ordenadas = linhas_da_tabela(visao, filtros_itens, visao['versao'])
+            total_linhas = len(linhas_ordenadas)
+
+        col_tamanho, col_navegacao = st.columns([1, 3])
+        with col_tamanho:
+            tamanho_pagina = st.selectbox('Linhas por página:', paginacao_tabela.TAMANHOS_PAGINA,
+                                          index=1)
+        total_paginas = paginacao_tabela.quantidade_paginas(total_linhas, tamanho_pagina)
+
+        # A página fica no session_state: os botões mudam o valor ANTES do
+        # rerun (on_click) e um filtro novo pode reduzir o número de páginas
+        if 'pagina_tabela' not in st.session_state:
+            st.session_state.pagina_tabela = 1
+        st.session_state.pagina_tabela = min(max(st.session_state.pagina_tabela, 1), total_paginas)
+
+        def ir_para_pagina(pagina):
+            st.session_state.pagina_tabela = min(max(pagina, 1), total_paginas)
+
+        with col_navegacao:
+            botoes = st.columns([1, 1, 2, 1, 1])
+            pagina_atual = st.session_state.pagina_tabela
+            botoes[0].button('⏮', on_click=ir_para_pagina, args=(1,),
+                             disabled=pagina_atual == 1, use_container_width=True)
+            botoes[1].button('◀', on_click=ir_para_pagina, args=(pagina_atual - 1,),
+                             disabled=pagina_atual == 1, use_container_width=True)
+            botoes[2].number_input('Página', min_value=1, max_value=total_paginas,
+                                   key='pagina_tabela', label_visibility='collapsed')
+            botoes[3].button('▶', on_click=ir_para_pagina, args=(pagina_atual + 1,),
+                             disabled=pagina_atual == total_paginas, use_container_width=True)
+            botoes[4].button('⏭', on_click=ir_para_pagina, args=(total_paginas,),
+                             disabled=pagina_atual == total_paginas, use_container_width=True)
+
+        pagina_atual = st.session_state.pagina_tabela
+        inicio = (pagina_atual - 1) * tamanho_pagina
+        fim = min(inicio + tamanho_pagina, total_linhas)
+        st.caption(f"Linhas {inicio + 1 if total_linhas else 0}–{fim} de {total_linhas} "
+                   f"(página {pagina_atual} de {total_paginas})")
+
+        # Só a página visível (e só as colunas escolhidas) vai para o navegador
+        if 'banco' in visao:
+            pagina_df = banco_sqlite.pagina_chamados(visao['banco'], dict(filtros_itens), pagina_atual,
+                                                     tamanho_pagina, colunas_selecionadas)
+        else:
+            pagina_df = paginacao_tabela.montar_pagina(visao['df'], linhas_ordenadas, pagina_atual,
+                                                       tamanho_pagina, colunas_selecionadas)
         st.dataframe(
-            df_filtrado[colunas_selecionadas].sort_values('data_abertura', ascending=False),
+            pagina_df,
             use_container_width=True,
-            height=400
+            height=min(400, 35 * (fim - inicio + 1) + 3)
         )
     else:
         st.warning("Selecione pelo menos uma coluna para exibir.")
 
+
+secao_tabela(visao, filtros_itens)
+
 # ==============================================================================
 # RODAPÉ
 # ==============================================================================
@@ -0,0 +1,156 @@
+"""
+==============================================================================
+ESQUEMA DA TABELA DE CHAMADOS
+==============================================================================
+Descrição: Tipos de dados (dtypes) declarados para a base de chamados,
+           usados tanto pelo gerador de relatório quanto pelo dashboard.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- O que é um dtype e por que ele importa para a memória
+- Colunas categóricas (category) e categóricas ordenadas
+- Inteiros "estreitos" (int32) e float32
+==============================================================================
+"""
+
+import pandas as pd
+
+# ==============================================================================
+# POR QUE DECLARAR O ESQUEMA?
+# ==============================================================================
+#
+# Sem dtype, o read_csv guarda cada texto como um objeto Python separado.
+# Colunas como 'status' têm só 3 valores diferentes, mas milhões de cópias!
+#
+# Com dtype 'category', o Pandas guarda:
+# - Uma lista pequena com os valores únicos (as "categorias")
+# - Um código inteiro de 1 byte por linha apontando para a categoria
+#
+# Resultado: muito menos memória e value_counts()/groupby() bem mais rápidos,
+# porque o Pandas passa a trabalhar com inteiros em vez de textos.
+
+# Ordem das prioridades, da menor para a maior (Critica > Alta > Media > Baixa)
+ORDEM_PRIORIDADE = ['Baixa', 'Media', 'Alta', 'Critica']
+
+# Categórica ordenada: permite comparações como df['prioridade'] >= 'Alta'
+TIPO_PRIORIDADE = pd.CategoricalDtype(categories=ORDEM_PRIORIDADE, ordered=True)
+
+# Colunas de texto com poucos valores diferentes
+COLUNAS_CATEGORICAS = ['status', 'tipo_chamado', 'setor', 'prioridade', 'responsavel']
+
+# Colunas de data (lidas como texto e convertidas em tratar_dados)
+COLUNAS_DATA = ['data_abertura', 'data_fechamento']
+
+# Tipos usados na leitura do CSV
+# - int32 cobre ids até ~2,1 bilhões usando metade da memória do int64
+# - As categóricas são lidas "livres" e só depois padronizadas,
+#   porque o CSV pode ter espaços extras (" Alta ") que ainda serão removidos
+TIPOS_LEITURA = {
+    'id_chamado': 'int32',
+    **{coluna: 'category' for coluna in COLUNAS_CATEGORICAS},
+}
+
+# Tipo final da coluna calculada de tempo de atendimento
+# float32 tem ~7 dígitos de precisão: sobra para horas com 2 casas decimais
+TIPO_TEMPO = 'float32'
+
+
+def ler_csv_chamados(caminho_arquivo, **opcoes):
+    """
+    Lê o CSV de chamados já com os tipos declarados.
+
+    Parâmetros:
+        caminho_arquivo (str): Caminho para o arquivo CSV
+        **opcoes: Opções extras repassadas ao pd.read_csv (ex.: chunksize)
+
+    Retorna:
+        DataFrame (ou leitor de blocos, se chunksize for informado)
+    """
+    return pd.read_csv(caminho_arquivo, dtype=TIPOS_LEITURA, **opcoes)
+
+
+def padronizar_texto(serie):
+    """
+    Remove espaços extras do início e do fim dos textos.
+
+    Em colunas categóricas basta limpar a lista de categorias (poucos itens),
+    em vez de limpar linha por linha.
+
+    Parâmetros:
+        serie (Series): Coluna de texto ou categórica
+
+    Retorna:
+        Series: Coluna categórica com os textos padronizados
+    """
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.str.strip().astype('category')
+
+    categorias_limpas = serie.cat.categories.str.strip()
+    if categorias_limpas.is_unique:
+        serie = serie.cat.rename_categories(categorias_limpas)
+        # Mantém as categorias em ordem alfabética (a ordem do read_csv)
+        return serie.cat.reorder_categories(sorted(categorias_limpas))
+
+    # Caso raro: "Alta" e " Alta" viram a mesma categoria depois do strip
+    return serie.astype(str).str.strip().astype('category')
+
+
+def converter_prioridade(serie):
+    """
+    Converte a coluna de prioridade para a categórica ordenada.
+
+    Prioridades fora da lista conhecida não são descartadas: elas entram
+    no início da ordem (abaixo de 'Baixa') para não virarem nulos.
+
+    Parâmetros:
+        serie (Series): Coluna de prioridade já padronizada
+
+    Retorna:
+        Series: Coluna com dtype categórico ordenado
+    """
+    desconhecidas = sorted(set(serie.dropna().unique()) - set(ORDEM_PRIORIDADE))
+    if not desconhecidas:
+        return serie.astype(TIPO_PRIORIDADE)
+
+    tipo = pd.CategoricalDtype(categories=desconhecidas + ORDEM_PRIORIDADE, ordered=True)
+    return serie.astype(str).astype(tipo)
+
+
+def chave_ordenacao(coluna):
+    """
+    Função de ordenação dos valores de uma coluna categórica.
+
+    É a mesma ordem das categorias depois de aplicar o esquema:
+    alfabética para as colunas livres e ORDEM_PRIORIDADE para a prioridade.
+
+    Parâmetros:
+        coluna (str): Nome da coluna
+
+    Retorna:
+        function: Função para usar em sorted(..., key=...)
+    """
+    if coluna == 'prioridade':
+        return lambda valor: (
+            (1, ORDEM_PRIORIDADE.index(valor), '') if valor in ORDEM_PRIORIDADE
+            else (0, 0, str(valor))
+        )
+    return str
+
+
+def aplicar_esquema(df):
+    """
+    Aplica os tipos declarados a um DataFrame tratado (altera no lugar).
+
+    Parâmetros:
+        df (DataFrame): Dados com as colunas do esquema
+
+    Retorna:
+        DataFrame: O mesmo DataFrame, com os tipos compactos
+    """
+    for coluna in COLUNAS_CATEGORICAS:
+        df[coluna] = padronizar_texto(df[coluna])
+    df['prioridade'] = converter_prioridade(df['prioridade'])
+
+    if 'tempo_atendimento_horas' in df.columns:
+        df['tempo_atendimento_horas'] = df['tempo_atendimento_horas'].astype(TIPO_TEMPO)
+
+    return df
@@ -0,0 +1,229 @@
+"""
+==============================================================================
+EXPORTAÇÃO EM OUTROS FORMATOS (PARQUET, CSV E JSON)
+==============================================================================
+Descrição: Grava a base tratada e as tabelas de resumo do relatório em
+           Parquet, CSV e JSON, para quem consome os dados sem abrir o Excel.
+           Os arquivos são gravados ao mesmo tempo, por um pool de threads
+           (e, para o JSON da base completa, por um processo à parte).
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- O que é um pool de threads (ThreadPoolExecutor)
+- Por que só código que libera o GIL ganha com threads
+- Quando vale mandar uma tarefa para outro processo
+- Diferenças entre Parquet, CSV e JSON
+==============================================================================
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+import instrumentacao
+from gerador_relatorio import montar_tabelas_resumo, preparar_para_excel
+
+# ==============================================================================
+# COMO FUNCIONA A EXPORTAÇÃO EM PARALELO
+# ==============================================================================
+#
+# São 24 arquivos (8 tabelas × 3 formatos), e cada um é uma tarefa num
+# pool de threads. Threads só trabalham AO MESMO TEMPO enquanto o código
+# que elas rodam libera o GIL (a trava do interpretador Python):
+#
+#   to_csv / to_json do pandas      formatam em Python: seguram o GIL,
+#                                   uma thread por vez (sem ganho nenhum)
+#   pyarrow (Parquet, CSV, datas)   C++ que libera o GIL: rodam juntos
+#
+# Por isso o Parquet e o CSV são gravados pelo pyarrow (a tabela é
+# convertida para Arrow uma vez por arquivo), e as datas do CSV são
+# formatadas pelo pyarrow.compute, também fora do GIL.
+#
+# O pyarrow não grava JSON. O JSON das tabelas de resumo é pequeno (poucos
+# milissegundos de GIL), mas o da base completa é o arquivo mais lento:
+# com mais de um núcleo, ele vai para um processo à parte (ProcessPool),
+# que tem o seu próprio GIL. Com um núcleo só, o processo não teria onde
+# rodar em paralelo e só somaria a cópia da base, então ele fica nas threads.
+#
+# Com vários núcleos, o tempo total fica perto do tempo do arquivo mais
+# lento. O tempo exibido no fim é o medido de ponta a ponta, e não uma
+# estimativa.
+#
+# Qual formato usar?
+# - Parquet: colunar e comprimido; mantém os tipos (datas, categorias).
+#            Ideal para outras ferramentas de dados. Precisa do pyarrow.
+# - CSV:     abre em qualquer lugar, mas perde os tipos.
+# - JSON:    uma lista de objetos {coluna: valor}, fácil de usar em APIs.
+
+FORMATOS_DISPONIVEIS = ('parquet', 'csv', 'json')
+
+PASTA_EXPORTACAO_PADRAO = 'exportacao'
+
+
+def tabela_arrow(tabela):
+    """
+    Converte um DataFrame em tabela Arrow, para os escritores do pyarrow.
+
+    O Arrow exige um tipo por coluna: colunas que misturam números e texto
+    (ex.: 'N/A' no Resumo quando não há chamados fechados) viram texto.
+    """
+    import pyarrow as pa
+
+    mistas = [coluna for coluna in tabela.columns
+              if pd.api.types.infer_dtype(tabela[coluna], skipna=True).startswith('mixed')]
+    return pa.Table.from_pandas(tabela.astype({coluna: str for coluna in mistas}),
+                                preserve_index=False)
+
+
+def gravar_csv_arrow(tabela, caminho):
+    """
+    Grava uma tabela Arrow em CSV pelo pyarrow (fora do GIL).
+
+    As datas seguem o formato do to_csv do pandas: 'AAAA-MM-DD HH:MM:SS',
+    ou só 'AAAA-MM-DD' quando nenhuma linha da coluna tem horário. O
+    cabeçalho sai entre aspas (o pyarrow sempre as coloca nele).
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+
+    for posicao, coluna in enumerate(tabela.columns):
+        if not pa.types.is_timestamp(coluna.type):
+            continue
+        # Em segundos: no pyarrow, o %S de datas em microssegundos sai com a
+        # fração ('00.000000'); as datas do esquema não têm fração de segundo
+        coluna = coluna.cast(pa.timestamp('s', tz=coluna.type.tz), safe=False)
+        so_data = pc.all(pc.equal(pc.floor_temporal(coluna, unit='day'), coluna)).as_py()
+        texto = pc.strftime(coluna, format='%Y-%m-%d' if so_data else '%Y-%m-%d %H:%M:%S')
+        tabela = tabela.set_column(posicao, tabela.field(posicao).name, texto)
+    try:
+        # Sem aspas nos valores, como no pandas ...
+        pa_csv.write_csv(tabela, caminho, pa_csv.WriteOptions(quoting_style='none'))
+    except pa.ArrowInvalid:
+        # ... a não ser que algum valor tenha vírgula, aspas ou quebra de linha
+        pa_csv.write_csv(tabela, caminho)
+
+
+def gravar_tabela(tabela, caminho, formato):
+    """
+    Grava uma tabela em um formato.
+
+    Parâmetros:
+        tabela (DataFrame): Tabela a gravar
+        caminho (str): Caminho do arquivo de saída
+        formato (str): 'parquet', 'csv' ou 'json'
+
+    Retorna:
+        tuple: (caminho, segundos gastos)
+    """
+    inicio = time.perf_counter()
+    if formato == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(tabela_arrow(tabela), caminho)
+    elif formato == 'csv':
+        try:
+            import pyarrow  # só verificamos se está instalado
+        except ImportError:
+            # Sem pyarrow, o CSV do pandas (segura o GIL)
+            tabela.to_csv(caminho, index=False, encoding='utf-8')
+        else:
+            gravar_csv_arrow(tabela_arrow(tabela), caminho)
+    elif formato == 'json':
+        tabela.to_json(caminho, orient='records', date_format='iso',
+                       force_ascii=False, indent=2)
+    else:
+        raise ValueError(f"Formato desconhecido: {formato}")
+    return caminho, time.perf_counter() - inicio
+
+
+def exportar_formatos(df, metricas, pasta_saida=PASTA_EXPORTACAO_PADRAO,
+                      formatos=FORMATOS_DISPONIVEIS, max_threads=None):
+    """
+    Exporta a base tratada e as tabelas de resumo em vários formatos.
+
+    Parâmetros:
+        df (DataFrame): Dados tratados (None = exporta só as tabelas de resumo,
+                        como no modo streaming, em que a base não fica na memória)
+        metricas (dict): Métricas calculadas
+        pasta_saida (str): Pasta onde os arquivos serão gravados
+        formatos (tuple): Formatos desejados ('parquet', 'csv', 'json')
+        max_threads (int): Threads no pool (None = uma por arquivo, até 32)
+
+    Retorna:
+        list: Caminhos dos arquivos gravados
+    """
+    print("\n" + "="*60)
+    print("📦 EXPORTAÇÃO EM OUTROS FORMATOS")
+    print("="*60)
+
+    formatos = list(formatos)
+    for formato in formatos:
+        if formato not in FORMATOS_DISPONIVEIS:
+            raise ValueError(f"Formato desconhecido: {formato}")
+
+    if 'parquet' in formatos:
+        try:
+            import pyarrow  # só verificamos se está instalado
+        except ImportError:
+            print("   ⚠️ pyarrow não instalado: o formato Parquet foi ignorado")
+            formatos.remove('parquet')
+
+    # Mesmas tabelas das abas do Excel; os nomes viram nomes de arquivo
+    tabelas = {nome.lower(): tabela for nome, tabela in montar_tabelas_resumo(metricas).items()}
+    if df is not None:
+        tabelas['dados_completos'] = df
+
+    os.makedirs(pasta_saida, exist_ok=True)
+
+    tarefas = []
+    em_processo = []
+    for nome, tabela in tabelas.items():
+        # CSV e JSON são texto: mesmos arredondamentos do Excel (tempo em float64)
+        tabela_texto = preparar_para_excel(tabela) if nome == 'dados_completos' else tabela
+        for formato in formatos:
+            tabela_formato = tabela if formato == 'parquet' else tabela_texto
+            caminho = os.path.join(pasta_saida, f'{nome}.{formato}')
+            if nome == 'dados_completos' and formato == 'json' and (os.cpu_count() or 1) > 1:
+                # to_json segura o GIL: a base completa vai para outro processo
+                em_processo.append((tabela_formato, caminho, formato))
+            else:
+                tarefas.append((tabela_formato, caminho, formato))
+
+    if not tarefas and not em_processo:
+        return []
+
+    inicio = time.perf_counter()
+    gravados = []
+    mais_lento = (None, 0.0)
+    pool_processos = None
+
+    try:
+        futuros = []
+        if em_processo:
+            # Enviado antes das threads: a cópia da base para o processo
+            # acontece enquanto as threads já estão gravando
+            pool_processos = ProcessPoolExecutor(
+                max_workers=1, initializer=instrumentacao.descartar_rastreamento)
+            futuros += [pool_processos.submit(gravar_tabela, *tarefa) for tarefa in em_processo]
+
+        # O 'with' espera todas as threads terminarem antes de continuar
+        with ThreadPoolExecutor(max_workers=max_threads or min(32, len(tarefas) or 1)) as pool:
+            futuros += [pool.submit(gravar_tabela, *tarefa) for tarefa in tarefas]
+            for futuro in as_completed(futuros):
+                # result() também repassa qualquer erro que aconteceu na thread
+                caminho, segundos = futuro.result()
+                gravados.append(caminho)
+                if segundos > mais_lento[1]:
+                    mais_lento = (caminho, segundos)
+    finally:
+        if pool_processos is not None:
+            pool_processos.shutdown()
+
+    tempo_total = time.perf_counter() - inicio
+    print(f"   Arquivos gravados em '{pasta_saida}': {len(gravados)}")
+    print(f"   Formatos: {', '.join(formatos)}")
+    print(f"   Tempo total: {tempo_total:.2f}s "
+          f"(arquivo mais lento: {os.path.basename(mais_lento[0])}, {mais_lento[1]:.2f}s)")
+
+    return sorted(gravados)
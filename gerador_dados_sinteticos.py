@@ -0,0 +1,211 @@
+"""
+==============================================================================
+GERADOR DE CHAMADOS SINTÉTICOS
+==============================================================================
+Descrição: Gera bases de chamados falsas, mas realistas, no mesmo formato de
+           chamados_ti.csv. Serve para medir o desempenho do projeto com
+           10 mil, 1 milhão ou até 100 milhões de chamados.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- Como gerar números aleatórios reproduzíveis (semente / seed)
+- Como sortear categorias com pesos diferentes (distribuição enviesada)
+- Como gravar um CSV enorme em blocos, sem estourar a memória
+==============================================================================
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# COMO OS DADOS SÃO GERADOS
+# ==============================================================================
+#
+# 1. Reprodutível: o gerador aleatório de cada bloco é criado a partir de
+#    (semente, número do bloco). A mesma semente (com o mesmo tamanho de
+#    bloco) gera sempre o mesmo arquivo.
+#
+# 2. Categorias enviesadas: na vida real alguns setores abrem muito mais
+#    chamados que outros. Cada valor tem um peso; os pesos viram
+#    probabilidades e np.random.Generator.choice() sorteia com elas.
+#
+# 3. Tempo de atendimento: segue uma distribuição log-normal (muitos
+#    chamados rápidos e poucos muito demorados), com a mediana dependendo
+#    da prioridade.
+#
+# 4. Datas de abertura crescentes: o período é dividido igualmente entre as
+#    linhas, como um helpdesk que só acrescenta chamados ao final do CSV.
+
+# Valores possíveis e pesos (quanto maior o peso, mais frequente)
+PESOS_STATUS_ABERTO = {'Aberto': 3, 'Em Andamento': 1}
+
+PESOS_TIPO = {'Software': 40, 'Hardware': 25, 'Acesso': 20, 'Rede': 15}
+
+PESOS_SETOR = {
+    'TI': 30, 'Comercial': 20, 'Financeiro': 15, 'Operacoes': 12,
+    'RH': 10, 'Marketing': 8, 'Juridico': 5,
+}
+
+PESOS_PRIORIDADE = {'Baixa': 35, 'Media': 40, 'Alta': 18, 'Critica': 7}
+
+PESOS_RESPONSAVEL = {
+    'João Silva': 35, 'Maria Santos': 30, 'Carlos Oliveira': 20, 'Ana Costa': 15,
+}
+
+# Mediana do tempo de atendimento (horas) por prioridade, parecida com a base real
+MEDIANA_TEMPO_PRIORIDADE = {'Baixa': 2.5, 'Media': 4.5, 'Alta': 6.0, 'Critica': 24.0}
+
+# Espalhamento da log-normal (quanto maior, mais chamados muito demorados)
+DISPERSAO_TEMPO = 0.8
+
+PROPORCAO_FECHADOS_PADRAO = 0.83   # 100 de 120 na base de exemplo
+
+TAMANHO_BLOCO_GERACAO = 1_000_000
+
+FORMATO_DATA = '%Y-%m-%d %H:%M:%S'
+
+
+def sortear(gerador, pesos, quantidade):
+    """
+    Sorteia valores de acordo com os pesos.
+
+    Parâmetros:
+        gerador: np.random.Generator
+        pesos (dict): {valor: peso}
+        quantidade (int): Quantos valores sortear
+
+    Retorna:
+        Categorical: Valores sorteados (categórico, para economizar memória)
+    """
+    valores = list(pesos)
+    probabilidades = np.array(list(pesos.values()), dtype=float)
+    probabilidades /= probabilidades.sum()
+    codigos = gerador.choice(len(valores), size=quantidade, p=probabilidades)
+    return pd.Categorical.from_codes(codigos, categories=valores)
+
+
+def gerar_bloco(semente, indice_bloco, primeira_linha, quantidade, total_linhas,
+                inicio, duracao, proporcao_fechados):
+    """
+    Gera um bloco de chamados sintéticos.
+
+    Parâmetros:
+        semente (int): Semente geral da base
+        indice_bloco (int): Número do bloco (faz parte da semente do bloco)
+        primeira_linha (int): Posição global da primeira linha do bloco
+        quantidade (int): Linhas neste bloco
+        total_linhas (int): Linhas da base inteira
+        inicio (Timestamp): Início do período
+        duracao (Timedelta): Duração do período
+        proporcao_fechados (float): Fração de chamados fechados (0 a 1)
+
+    Retorna:
+        DataFrame: Bloco com as colunas de chamados_ti.csv
+    """
+    gerador = np.random.default_rng([semente, indice_bloco])
+    posicoes = np.arange(primeira_linha, primeira_linha + quantidade)
+
+    # Abertura: cada linha ganha uma "fatia" do período, com um sorteio dentro dela
+    passo_ns = duracao.value / total_linhas
+    deslocamento_ns = (posicoes + gerador.random(quantidade)) * passo_ns
+    abertura = (inicio + pd.to_timedelta(deslocamento_ns, unit='ns')).floor('min')
+
+    prioridade = sortear(gerador, PESOS_PRIORIDADE, quantidade)
+
+    # Tempo de atendimento log-normal com mediana por prioridade
+    medianas = np.array([MEDIANA_TEMPO_PRIORIDADE[p] for p in prioridade.categories])
+    horas = medianas[prioridade.codes] * gerador.lognormal(0.0, DISPERSAO_TEMPO, quantidade)
+    # Múltiplos de 15 minutos, com no mínimo 15 minutos
+    horas = np.maximum(np.round(horas * 4) / 4, 0.25)
+
+    fechado = gerador.random(quantidade) < proporcao_fechados
+    status = sortear(gerador, PESOS_STATUS_ABERTO, quantidade)
+    status = status.add_categories('Fechado')
+    status[fechado] = 'Fechado'
+
+    fechamento = abertura + pd.to_timedelta(horas, unit='h')
+    fechamento = fechamento.where(fechado, pd.NaT)
+
+    return pd.DataFrame({
+        'id_chamado': posicoes + 1001,   # mesma numeração da base de exemplo
+        'data_abertura': abertura,
+        'data_fechamento': fechamento,
+        'status': status,
+        'tipo_chamado': sortear(gerador, PESOS_TIPO, quantidade),
+        'setor': sortear(gerador, PESOS_SETOR, quantidade),
+        'prioridade': prioridade,
+        'responsavel': sortear(gerador, PESOS_RESPONSAVEL, quantidade),
+    })
+
+
+def gerar_chamados(linhas, semente=42, proporcao_fechados=PROPORCAO_FECHADOS_PADRAO,
+                   data_inicio='2024-01-01', dias=365,
+                   tamanho_bloco=TAMANHO_BLOCO_GERACAO):
+    """
+    Gera a base sintética em blocos (gerador Python).
+
+    Parâmetros:
+        linhas (int): Total de chamados (de 10^4 a 10^8, ou qualquer outro)
+        semente (int): Semente aleatória (mesma semente = mesmos dados)
+        proporcao_fechados (float): Fração de chamados fechados (0 a 1)
+        data_inicio (str): Data do primeiro chamado
+        dias (int): Duração do período coberto pela base
+        tamanho_bloco (int): Linhas por bloco gerado
+
+    Retorna:
+        Gerador de DataFrames
+    """
+    if not 0 <= proporcao_fechados <= 1:
+        raise ValueError("proporcao_fechados deve estar entre 0 e 1")
+
+    inicio = pd.Timestamp(data_inicio)
+    duracao = pd.Timedelta(days=dias)
+    for indice_bloco, primeira_linha in enumerate(range(0, linhas, tamanho_bloco)):
+        quantidade = min(tamanho_bloco, linhas - primeira_linha)
+        yield gerar_bloco(semente, indice_bloco, primeira_linha, quantidade, linhas,
+                          inicio, duracao, proporcao_fechados)
+
+
+def salvar_csv_sintetico(caminho_arquivo, linhas, **opcoes):
+    """
+    Grava a base sintética em CSV, bloco a bloco (memória constante).
+
+    Parâmetros:
+        caminho_arquivo (str): Caminho do CSV de saída
+        linhas (int): Total de chamados
+        **opcoes: Repassadas para gerar_chamados()
+
+    Retorna:
+        str: Caminho do arquivo gravado
+    """
+    with open(caminho_arquivo, 'w', encoding='utf-8', newline='') as arquivo:
+        for numero, bloco in enumerate(gerar_chamados(linhas, **opcoes)):
+            bloco.to_csv(arquivo, index=False, header=(numero == 0),
+                         date_format=FORMATO_DATA)
+    return caminho_arquivo
+
+
+# ==============================================================================
+# USO PELA LINHA DE COMANDO
+# ==============================================================================
+#
+# Exemplo: python gerador_dados_sinteticos.py 1000000 chamados_1m.csv
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera chamados sintéticos em CSV")
+    parser.add_argument('linhas', type=int, help="Quantidade de chamados")
+    parser.add_argument('saida', help="Arquivo CSV de saída")
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--proporcao-fechados', type=float, default=PROPORCAO_FECHADOS_PADRAO)
+    parser.add_argument('--dias', type=int, default=365)
+    argumentos = parser.parse_args()
+
+    salvar_csv_sintetico(
+        argumentos.saida,
+        argumentos.linhas,
+        semente=argumentos.semente,
+        proporcao_fechados=argumentos.proporcao_fechados,
+        dias=argumentos.dias,
+    )
+    print(f"✅ {argumentos.linhas} chamados gravados em {argumentos.saida}")
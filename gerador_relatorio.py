@@ -31,6 +31,42 @@ O QUE VOCÊ VAI APRENDER NESTE SCRIPT:
 
 import pandas as pd  # 'pd' é um apelido (alias) para facilitar a digitação
 
+# NumPy: Biblioteca de cálculo numérico (o Pandas é construído sobre ela)
+# Usamos np.bincount() para contar e somar por categoria de forma vetorizada
+import numpy as np
+
+# Esquema (tipos de cada coluna) compartilhado com o dashboard
+from esquema_chamados import COLUNAS_DATA, aplicar_esquema, chave_ordenacao, ler_csv_chamados
+
+# Conversão vetorizada das datas no formato fixo do helpdesk
+from conversao_datas import converter_datas
+
+# Cache colunar (Arrow) dos dados tratados, também usado pelo dashboard
+from cache_colunar import carregar_com_cache
+
+# Medição de tempo/memória por etapa (desligada por padrão, custo ~zero)
+import instrumentacao
+
+# Percentis (p50/p90/p95/p99) do tempo de atendimento sem ordenar os dados
+from sketch_quantis import (
+    QUANTIS_PADRAO,
+    combinar_sketches,
+    criar_sketch,
+    indices_baldes,
+    quantis_sketch,
+    sketch_de_valores,
+    sketches_por_grupo,
+)
+
+# Backlog (chamados em aberto) ao longo do tempo, por varredura de eventos
+from serie_backlog import (
+    calcular_backlog,
+    combinar_eventos,
+    contar_eventos,
+    montar_serie_backlog,
+    tabela_backlog,
+)
+
 # ==============================================================================
 # ETAPA 3: LEITURA DOS DADOS
 # ==============================================================================
@@ -59,7 +95,9 @@ def carregar_dados(caminho_arquivo):
     # pd.read_csv() lê o arquivo e cria um DataFrame
     # O arquivo precisa estar no mesmo diretório do script
     # ou você precisa passar o caminho completo
-    df = pd.read_csv(caminho_arquivo)
+    # ler_csv_chamados() chama o pd.read_csv() já com os tipos declarados
+    # (categorias, int32), o que reduz muito o uso de memória
+    df = ler_csv_chamados(caminho_arquivo)
     
     print(f"✅ Dados carregados com sucesso!")
     print(f"   Total de registros: {len(df)}")  # len() conta as linhas
@@ -110,19 +148,28 @@ def inspecionar_dados(df):
 # Por que: Dados "brutos" geralmente precisam de limpeza e transformação
 # O que você aprende: Conversão de tipos, criação de colunas, tratamento de nulos
 
-def tratar_dados(df):
+def tratar_dados(df, exibir_mensagens=True):
     """
     Função para tratar e limpar os dados.
-    
+
     Tratamentos aplicados:
     1. Conversão de datas (string → datetime)
     2. Criação da coluna de tempo de atendimento
     3. Tratamento de valores nulos
     4. Padronização de texto
+
+    Parâmetros:
+        df (DataFrame): Dados brutos (o arquivo inteiro ou apenas um bloco)
+        exibir_mensagens (bool): Se False, não imprime o passo a passo
+                                 (útil no modo streaming, que trata muitos blocos)
     """
-    print("\n" + "="*60)
-    print("🔧 TRATAMENTO DE DADOS")
-    print("="*60)
+    # No modo streaming esta função roda uma vez por bloco.
+    # Trocamos print por uma função "muda" para não poluir a saída.
+    exibir = print if exibir_mensagens else (lambda *args, **kwargs: None)
+
+    exibir("\n" + "="*60)
+    exibir("🔧 TRATAMENTO DE DADOS")
+    exibir("="*60)
     
     # Criar uma cópia para não modificar o original
     # Boa prática: sempre trabalhe em cópias dos dados
@@ -133,23 +180,35 @@ def tratar_dados(df):
     # -------------------------------------------------------------------------
     # O que: Converter strings de data para tipo datetime do Python
     # Por que: Para fazer cálculos com datas (diferença de dias, horas, etc.)
-    # Como: pd.to_datetime() converte automaticamente
-    
-    print("\n📅 Convertendo colunas de data...")
-    
-    # Convertendo data_abertura
-    # O Pandas reconhece automaticamente o formato "AAAA-MM-DD HH:MM:SS"
-    df_tratado['data_abertura'] = pd.to_datetime(df_tratado['data_abertura'])
-    
-    # Convertendo data_fechamento
-    # errors='coerce': Se encontrar valor inválido, coloca NaT (Not a Time)
-    # Por que usamos coerce: Chamados abertos não têm data de fechamento (vazio)
-    df_tratado['data_fechamento'] = pd.to_datetime(
-        df_tratado['data_fechamento'], 
-        errors='coerce'  # Valores vazios viram NaT (nulo para datas)
-    )
+    # Como: converter_datas() lê o formato fixo "AAAA-MM-DD HH:MM:SS" direto
+    #       dos bytes do texto (bem mais rápido que deixar o pd.to_datetime()
+    #       adivinhar o formato) e só usa o pd.to_datetime() nas linhas
+    #       que fogem do formato (ver conversao_datas.py)
+    
+    exibir("\n📅 Convertendo colunas de data...")
+    
+    # Valores vazios viram NaT (Not a Time): chamados abertos não têm
+    # data de fechamento. Isso é esperado e não é reportado.
+    # Valores preenchidos que não são datas também viram NaT, mas são
+    # reportados com o número das linhas (antes sumiam em silêncio).
+    linhas_coagidas = {}
+    for coluna in COLUNAS_DATA:
+        df_tratado[coluna], relatorio = converter_datas(df_tratado[coluna])
+        if relatorio['alternativas']:
+            exibir(f"   ℹ️ {coluna}: {relatorio['alternativas']} data(s) fora do "
+                   f"formato AAAA-MM-DD HH:MM:SS convertidas pelo caminho lento")
+        if relatorio['coagidas']:
+            linhas_coagidas[coluna] = relatorio['linhas_coagidas']
+            # Aviso sempre exibido: é um problema nos dados, não um detalhe
+            amostra = ', '.join(str(linha) for linha in relatorio['linhas_coagidas'][:10])
+            print(f"   ⚠️ {coluna}: {relatorio['coagidas']} valor(es) inválido(s) "
+                  f"viraram NaT (linhas: {amostra}"
+                  f"{', ...' if relatorio['coagidas'] > 10 else ''})")
+
+    # Guardado junto com o DataFrame para quem quiser investigar
+    df_tratado.attrs['linhas_coagidas'] = linhas_coagidas
     
-    print("   ✅ Colunas de data convertidas")
+    exibir("   ✅ Colunas de data convertidas")
     
     # -------------------------------------------------------------------------
     # TRATAMENTO 2: Criação da Coluna de Tempo de Atendimento
@@ -158,7 +217,7 @@ def tratar_dados(df):
     # Por que: Esta é uma métrica importante (SLA, eficiência da equipe)
     # Como: Subtrair data_fechamento - data_abertura
     
-    print("\n⏱️ Calculando tempo de atendimento...")
+    exibir("\n⏱️ Calculando tempo de atendimento...")
     
     # A subtração de datas cria um objeto Timedelta
     # .dt.total_seconds() converte para segundos
@@ -171,7 +230,7 @@ def tratar_dados(df):
     # Arredondando para 2 casas decimais para melhor visualização
     df_tratado['tempo_atendimento_horas'] = df_tratado['tempo_atendimento_horas'].round(2)
     
-    print("   ✅ Coluna 'tempo_atendimento_horas' criada")
+    exibir("   ✅ Coluna 'tempo_atendimento_horas' criada")
     
     # -------------------------------------------------------------------------
     # TRATAMENTO 3: Tratamento de Valores Nulos
@@ -181,48 +240,422 @@ def tratar_dados(df):
     # Observação: Para chamados abertos, tempo_atendimento será NaN (nulo)
     #             Isso é ESPERADO, não é um erro!
     
-    print("\n🔍 Verificando valores nulos...")
+    exibir("\n🔍 Verificando valores nulos...")
     
     # isnull().sum() conta quantos valores nulos em cada coluna
     nulos = df_tratado.isnull().sum()
-    print("   Valores nulos por coluna:")
-    print(nulos[nulos > 0].to_string() if nulos.sum() > 0 else "   Nenhum valor nulo encontrado")
+    exibir("   Valores nulos por coluna:")
+    exibir(nulos[nulos > 0].to_string() if nulos.sum() > 0 else "   Nenhum valor nulo encontrado")
     
     # -------------------------------------------------------------------------
-    # TRATAMENTO 4: Padronização de Texto (Status)
+    # TRATAMENTO 4: Padronização de Texto e Tipos Compactos
     # -------------------------------------------------------------------------
     # O que: Garantir que os valores de texto estejam padronizados
     # Por que: "aberto", "Aberto" e "ABERTO" devem ser tratados como iguais
-    # Como: Usando .str.strip() para remover espaços extras
+    # Como: Removendo espaços extras e aplicando o esquema declarado
+    #       (categorias, prioridade ordenada e tempo em float32)
     
-    print("\n📝 Padronizando texto...")
+    exibir("\n📝 Padronizando texto...")
     
-    # .str.strip() remove espaços no início e fim
-    df_tratado['status'] = df_tratado['status'].str.strip()
-    df_tratado['tipo_chamado'] = df_tratado['tipo_chamado'].str.strip()
-    df_tratado['setor'] = df_tratado['setor'].str.strip()
-    df_tratado['prioridade'] = df_tratado['prioridade'].str.strip()
-    df_tratado['responsavel'] = df_tratado['responsavel'].str.strip()
+    # aplicar_esquema() remove espaços no início e fim das categorias
+    # e converte as colunas para os tipos compactos do esquema
+    aplicar_esquema(df_tratado)
     
-    print("   ✅ Colunas de texto padronizadas")
+    exibir("   ✅ Colunas de texto padronizadas")
     
-    print("\n✅ Tratamento de dados concluído!")
+    exibir("\n✅ Tratamento de dados concluído!")
     
     return df_tratado
 
 
+# ==============================================================================
+# ETAPA 4B: CACHE COLUNAR DOS DADOS TRATADOS
+# ==============================================================================
+#
+# O que estamos fazendo: Reaproveitando os dados já tratados em execuções anteriores
+# Por que: Ler o CSV e converter as datas é a parte mais lenta do início
+# O que você aprende: Cache em arquivo (veja o módulo cache_colunar.py)
+
+def carregar_dados_com_cache(caminho_arquivo, colunas=None, exibir_mensagens=True):
+    """
+    Carrega os dados já tratados, usando o snapshot colunar quando possível.
+
+    Na primeira execução (ou quando o CSV muda), carrega e trata o CSV
+    normalmente e grava o snapshot. Nas seguintes, lê o snapshot direto,
+    sem passar pelo read_csv nem pela conversão de datas.
+
+    Parâmetros:
+        caminho_arquivo (str): Caminho para o arquivo CSV
+        colunas (list): Colunas desejadas (None = todas)
+        exibir_mensagens (bool): Se False, não imprime o passo a passo
+
+    Retorna:
+        DataFrame: Dados tratados (mesmo resultado de tratar_dados)
+    """
+    def carregar_e_tratar(caminho):
+        if exibir_mensagens:
+            return tratar_dados(carregar_dados(caminho))
+        return tratar_dados(ler_csv_chamados(caminho), exibir_mensagens=False)
+
+    df_tratado, veio_do_cache = carregar_com_cache(caminho_arquivo, carregar_e_tratar, colunas)
+
+    if veio_do_cache and exibir_mensagens:
+        print("⚡ Dados tratados carregados do cache colunar")
+        print(f"   Total de registros: {len(df_tratado)}")
+
+    return df_tratado
+
+
 # ==============================================================================
 # ETAPA 5: CÁLCULO DE MÉTRICAS
 # ==============================================================================
 #
 # O que estamos fazendo: Calculando indicadores de desempenho (KPIs)
 # Por que: Métricas permitem avaliar a performance e tomar decisões
-# O que você aprende: Agregações, agrupamentos e estatísticas com Pandas
+# O que você aprende: Agregações, agrupamentos e estatísticas com Pandas e NumPy
+#
+# Como calculamos (em duas fases):
+# 1. calcular_estado_metricas(): percorre os dados UMA vez e guarda apenas os
+#    "ingredientes" das métricas (contagens, somas, mínimos, máximos e os
+#    sketches dos percentis, ver sketch_quantis.py).
+# 2. finalizar_metricas(): transforma os ingredientes no dicionário final.
+#
+# Por que separar? Os mesmos ingredientes servem para o modo streaming
+# (blocos), para a ingestão incremental e para somar resultados parciais:
+# combinar_estados() junta dois estados sem precisar rever as linhas.
+
+# Métricas de contagem: chave no dicionário de métricas → coluna do DataFrame
+COLUNAS_CONTAGEM = {
+    'por_status': 'status',
+    'por_tipo': 'tipo_chamado',
+    'por_setor': 'setor',
+    'por_prioridade': 'prioridade',
+    'por_responsavel': 'responsavel',
+}
+
+# Percentis do tempo por dimensão: chave no dicionário → coluna do DataFrame
+COLUNAS_PERCENTIS = {
+    'por_prioridade': 'prioridade',
+    'por_tipo': 'tipo_chamado',
+    'por_responsavel': 'responsavel',
+}
+
+
+def criar_estado_metricas():
+    """
+    Cria os acumuladores vazios das métricas.
+
+    Retorna:
+        dict: Estado com contagens, somas, mínimos e máximos zerados
+    """
+    return {
+        'total_chamados': 0,
+        # Para cada dimensão: {valor: quantidade}, na ordem em que cada valor
+        # apareceu pela primeira vez nos dados (é o desempate das contagens)
+        'contagens': {chave: {} for chave in COLUNAS_CONTAGEM},
+        # Ingredientes do tempo médio/mínimo/máximo (apenas valores não nulos)
+        'tempo_soma': 0.0,
+        'tempo_qtd': 0,
+        'tempo_min': None,
+        'tempo_max': None,
+        # Ingredientes do tempo médio por prioridade: {prioridade: [soma, qtd]}
+        'tempo_prioridade': {},
+        # Sketches dos percentis do tempo: geral e {valor: sketch} por dimensão
+        'sketches': {
+            'geral': criar_sketch(),
+            **{chave: {} for chave in COLUNAS_PERCENTIS},
+        },
+    }
+
+
+def codigos_categoria(serie):
+    """
+    Devolve os códigos inteiros e as categorias de uma coluna.
+
+    Em uma coluna categórica cada linha já é um número pequeno (o código)
+    que aponta para a lista de categorias. Trabalhar com esses números é
+    muito mais rápido do que comparar textos.
+
+    Os códigos são deslocados em +1: a posição 0 fica para os nulos
+    (que o Pandas marca com -1), pois np.bincount() não aceita negativos.
+
+    Retorna:
+        tuple: (array de códigos deslocados, lista de categorias)
+    """
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype('category')
+    codigos = serie.cat.codes.to_numpy().astype(np.intp)
+    codigos += 1
+    return codigos, serie.cat.categories
+
+
+def ordem_de_aparicao(codigos, quantidade_categorias):
+    """
+    Categorias presentes, na ordem em que aparecem pela primeira vez.
+
+    np.minimum.at guarda, para cada código, a menor posição em que ele
+    aparece (a primeira linha), sem laço em Python.
+
+    Parâmetros:
+        codigos (ndarray): Códigos deslocados de codigos_categoria()
+        quantidade_categorias (int): Tamanho da lista de categorias
+
+    Retorna:
+        ndarray: Posições na lista de categorias, da primeira a aparecer à última
+    """
+    linhas = len(codigos)
+    primeira = np.full(quantidade_categorias + 1, linhas, dtype=np.intp)
+    np.minimum.at(primeira, codigos, np.arange(linhas, dtype=np.intp))
+    primeira = primeira[1:]  # Descarta a posição dos nulos
+    presentes = np.flatnonzero(primeira < linhas)
+    return presentes[np.argsort(primeira[presentes], kind='stable')]
+
+
+def calcular_estado_metricas(df):
+    """
+    Calcula os ingredientes de todas as métricas em uma única passada.
+
+    Em vez de um value_counts() por coluna e um groupby() para o tempo,
+    usamos np.bincount() sobre os códigos das categorias:
+    - bincount(códigos) conta quantas vezes cada código aparece
+    - bincount(códigos, weights=tempo) soma o tempo de cada código
+
+    Parâmetros:
+        df (DataFrame): Dados tratados (ou um bloco deles)
+
+    Retorna:
+        dict: Estado no formato de criar_estado_metricas()
+    """
+    estado = criar_estado_metricas()
+    estado['total_chamados'] = len(df)
+
+    # Contagens por dimensão ([1:] descarta a posição dos nulos)
+    codigos_por_coluna = {}
+    for chave, coluna in COLUNAS_CONTAGEM.items():
+        codigos, categorias = codigos_categoria(df[coluna])
+        codigos_por_coluna[coluna] = codigos, categorias
+        contagens = np.bincount(codigos, minlength=len(categorias) + 1)[1:]
+        # Na ordem da primeira aparição, como o value_counts() de uma coluna de texto
+        estado['contagens'][chave] = {
+            categorias[posicao]: int(contagens[posicao])
+            for posicao in ordem_de_aparicao(codigos, len(categorias))
+        }
+        if coluna == 'prioridade':
+            codigos_prioridade, categorias_prioridade = codigos, categorias
+            contagens_prioridade = contagens
+
+    # Tempo de atendimento: os chamados abertos (NaN) entram com peso 0
+    # e não são contados na quantidade
+    tempos = df['tempo_atendimento_horas'].to_numpy()
+    validos = ~np.isnan(tempos)
+    pesos = np.where(validos, tempos, 0)
+
+    # Soma e quantidade por prioridade (posição 0 = prioridade nula)
+    tamanho = len(categorias_prioridade) + 1
+    somas = np.bincount(codigos_prioridade, weights=pesos, minlength=tamanho)
+    quantidades = np.bincount(codigos_prioridade, weights=validos, minlength=tamanho)
+
+    # O total geral é a soma de todas as prioridades (inclusive a nula)
+    estado['tempo_qtd'] = int(quantidades.sum())
+    if estado['tempo_qtd'] > 0:
+        estado['tempo_soma'] = float(somas.sum())
+        # fmin/fmax ignoram NaN (só devolvem NaN se todos forem NaN)
+        estado['tempo_min'] = float(np.fmin.reduce(tempos))
+        estado['tempo_max'] = float(np.fmax.reduce(tempos))
+
+    # Prioridades só com chamados abertos entram com quantidade 0,
+    # para aparecerem como NaN, igual ao groupby().mean()
+    for categoria, linhas, soma, qtd in zip(categorias_prioridade, contagens_prioridade,
+                                            somas[1:], quantidades[1:]):
+        if linhas > 0:
+            estado['tempo_prioridade'][categoria] = [float(soma), int(qtd)]
+
+    # Percentis: um sketch geral e um por valor de cada dimensão,
+    # só com os tempos não nulos (chamados fechados)
+    # (o balde de cada tempo é calculado uma vez e serve para todos)
+    tempos_validos = tempos[validos]
+    baldes = indices_baldes(tempos_validos)
+    estado['sketches']['geral'] = sketch_de_valores(tempos_validos, baldes)
+    for chave, coluna in COLUNAS_PERCENTIS.items():
+        codigos, categorias = codigos_por_coluna[coluna]
+        estado['sketches'][chave] = sketches_por_grupo(codigos[validos], categorias,
+                                                       tempos_validos, baldes)
+
+    return estado
+
+
+def combinar_estados(estado, outro):
+    """
+    Soma os ingredientes de 'outro' em 'estado' (altera 'estado').
+
+    Como só guardamos somas, quantidades, mínimos e máximos, dois estados
+    calculados em partes diferentes dos dados podem ser juntados sem erro.
+
+    Parâmetros:
+        estado (dict): Estado acumulado
+        outro (dict): Estado a ser somado
+
+    Retorna:
+        dict: O estado acumulado, atualizado
+    """
+    estado['total_chamados'] += outro['total_chamados']
+
+    for chave in COLUNAS_CONTAGEM:
+        contagem = estado['contagens'][chave]
+        for valor, quantidade in outro['contagens'][chave].items():
+            contagem[valor] = contagem.get(valor, 0) + quantidade
+
+    estado['tempo_soma'] += outro['tempo_soma']
+    estado['tempo_qtd'] += outro['tempo_qtd']
+    if outro['tempo_min'] is not None:
+        if estado['tempo_min'] is None or outro['tempo_min'] < estado['tempo_min']:
+            estado['tempo_min'] = outro['tempo_min']
+        if estado['tempo_max'] is None or outro['tempo_max'] > estado['tempo_max']:
+            estado['tempo_max'] = outro['tempo_max']
+
+    for prioridade, (soma, qtd) in outro['tempo_prioridade'].items():
+        soma_qtd = estado['tempo_prioridade'].setdefault(prioridade, [0.0, 0])
+        soma_qtd[0] += soma
+        soma_qtd[1] += qtd
+
+    # Sketches são somados balde a balde, sem perder precisão
+    sketches = estado['sketches']
+    combinar_sketches(sketches['geral'], outro['sketches']['geral'])
+    for chave in COLUNAS_PERCENTIS:
+        for valor, sketch in outro['sketches'][chave].items():
+            combinar_sketches(sketches[chave].setdefault(valor, criar_sketch()), sketch)
+
+    return estado
+
+
+def finalizar_metricas(estado):
+    """
+    Converte os ingredientes no dicionário final de métricas.
+
+    Parâmetros:
+        estado (dict): Estado de calcular_estado_metricas()/combinar_estados()
+
+    Retorna:
+        dict: Métricas no formato esperado por gerar_relatorio_excel()
+    """
+    metricas = {'total_chamados': estado['total_chamados']}
+
+    # Mesma ordenação de value_counts() sobre texto: decrescente e estável,
+    # desempatando pela primeira aparição (a ordem do dicionário de contagens;
+    # os blocos e shards são somados na ordem do arquivo)
+    for chave, coluna in COLUNAS_CONTAGEM.items():
+        contagem = estado['contagens'][chave]
+        valores = list(contagem)
+        serie = pd.Series([contagem[v] for v in valores], index=pd.Index(valores, name=coluna),
+                          name='count', dtype='int64')
+        metricas[chave] = serie.sort_values(ascending=False, kind='stable')
+
+    # A média só é calculada no final: soma total / quantidade total
+    if estado['tempo_qtd'] > 0:
+        metricas['tempo_medio'] = estado['tempo_soma'] / estado['tempo_qtd']
+        metricas['tempo_min'] = estado['tempo_min']
+        metricas['tempo_max'] = estado['tempo_max']
+    else:
+        metricas['tempo_medio'] = metricas['tempo_min'] = metricas['tempo_max'] = float('nan')
+
+    # Prioridades na ordem das categorias (Baixa, Media, Alta, Critica)
+    # (só as que ainda têm chamados; a ingestão incremental pode descontá-los)
+    prioridades = sorted(
+        (p for p in estado['tempo_prioridade'] if estado['contagens']['por_prioridade'].get(p, 0) > 0),
+        key=chave_ordenacao('prioridade')
+    )
+    medias = [
+        soma / qtd if qtd > 0 else float('nan')
+        for soma, qtd in (estado['tempo_prioridade'][p] for p in prioridades)
+    ]
+    tempo_por_prioridade = pd.Series(medias, index=pd.Index(prioridades, name='prioridade'),
+                                     name='tempo_atendimento_horas')
+    metricas['tempo_por_prioridade'] = tempo_por_prioridade.round(2)
+
+    # Percentis (SLA): geral e uma tabela [valor × p50/p90/p95/p99] por dimensão
+    metricas['percentis_tempo'] = pd.Series(
+        quantis_sketch(estado['sketches']['geral']), name='tempo_atendimento_horas'
+    ).round(2)
+    for chave, coluna in COLUNAS_PERCENTIS.items():
+        sketches = estado['sketches'][chave]
+        valores = sorted(sketches, key=chave_ordenacao(coluna))
+        metricas[f'percentis_{chave}'] = pd.DataFrame(
+            [quantis_sketch(sketches[valor]) for valor in valores],
+            index=pd.Index(valores, name=coluna), columns=list(QUANTIS_PADRAO),
+        ).round(2)
+
+    return metricas
 
-def calcular_metricas(df):
+
+def exibir_metricas(metricas):
+    """
+    Imprime as métricas calculadas, com o percentual de cada categoria.
+
+    Parâmetros:
+        metricas (dict): Resultado de finalizar_metricas()
+    """
+    total_chamados = metricas['total_chamados']
+
+    # MÉTRICA 1: Total de Chamados (o número mais básico e importante)
+    print(f"\n📌 Total de chamados: {total_chamados}")
+
+    # MÉTRICAS 2, 3, 5, 6 e 7: Contagens por dimensão
+    # - Status: carga de trabalho atual
+    # - Tipo: qual tipo de problema é mais comum
+    # - Setor: quais setores mais demandam suporte
+    # - Prioridade: criticidade dos chamados
+    # - Responsável: carga de trabalho por técnico (para balancear a equipe)
+    titulos = {
+        'por_status': 'Chamados por Status',
+        'por_tipo': 'Chamados por Tipo',
+        'por_setor': 'Chamados por Setor',
+        'por_prioridade': 'Chamados por Prioridade',
+        'por_responsavel': 'Chamados por Responsável',
+    }
+    for chave, titulo in titulos.items():
+        if chave == 'por_setor':
+            # MÉTRICA 4: Tempo de Atendimento (indicador de eficiência / SLA)
+            print(f"\n📌 Tempo de Atendimento (apenas chamados fechados):")
+            print(f"   • Médio: {metricas['tempo_medio']:.2f} horas")
+            print(f"   • Mínimo: {metricas['tempo_min']:.2f} horas")
+            print(f"   • Máximo: {metricas['tempo_max']:.2f} horas")
+            print("   • Percentis: " + " | ".join(
+                f"{nome}: {valor:.2f}h" for nome, valor in metricas['percentis_tempo'].items()
+            ))
+
+        print(f"\n📌 {titulo}:")
+        for valor, quantidade in metricas[chave].items():
+            percentual = (quantidade / total_chamados) * 100
+            print(f"   • {valor}: {quantidade} ({percentual:.1f}%)")
+
+    # MÉTRICA 8: Tempo Médio por Prioridade
+    # Chamados críticos devem ser resolvidos mais rápido
+    print(f"\n📌 Tempo Médio por Prioridade (horas):")
+    for prioridade, tempo in metricas['tempo_por_prioridade'].items():
+        print(f"   • {prioridade}: {tempo:.2f} horas")
+
+    # MÉTRICA 9: Percentis do Tempo por Prioridade (SLA)
+    # O p90 diz: 90% dos chamados foram resolvidos em até X horas
+    print(f"\n📌 Percentis do Tempo por Prioridade (horas):")
+    for prioridade, percentis in metricas['percentis_por_prioridade'].iterrows():
+        print(f"   • {prioridade}: " + " | ".join(
+            f"{nome} {valor:.2f}" for nome, valor in percentis.items()
+        ))
+
+    # MÉTRICA 10: Backlog (chamados em aberto) ao longo do tempo
+    # Mostra se a fila está crescendo ou diminuindo
+    backlog = metricas.get('backlog')
+    if backlog is not None and len(backlog) > 0:
+        total = backlog[('Total', 'Total')]
+        print(f"\n📌 Backlog (chamados em aberto no fim de cada dia):")
+        print(f"   • Em {total.index[-1]:%d/%m/%Y}: {total.iloc[-1]}")
+        print(f"   • Pico: {total.max()} em {total.idxmax():%d/%m/%Y}")
+
+
+def calcular_metricas(df, exibir_mensagens=True):
     """
     Função para calcular métricas do relatório.
-    
+
     Métricas calculadas:
     1. Total de chamados
     2. Chamados por status
@@ -231,130 +664,118 @@ def calcular_metricas(df):
     5. Chamados por setor
     6. Chamados por prioridade
     7. Chamados por responsável
+    8. Tempo médio por prioridade
+    9. Percentis do tempo (p50/p90/p95/p99): geral, por prioridade,
+       por tipo e por responsável
+    10. Backlog diário (total, por prioridade e por setor)
+
+    Parâmetros:
+        df (DataFrame): Dados tratados
+        exibir_mensagens (bool): Se False, não imprime as métricas
+
+    Retorna:
+        dict: Métricas (Series para as contagens, números para os tempos)
     """
-    print("\n" + "="*60)
-    print("📊 CÁLCULO DE MÉTRICAS")
-    print("="*60)
-    
+    if exibir_mensagens:
+        print("\n" + "="*60)
+        print("📊 CÁLCULO DE MÉTRICAS")
+        print("="*60)
+
     # Dicionário para armazenar todas as métricas
     # Usamos dicionário para organizar os resultados
-    metricas = {}
-    
-    # -------------------------------------------------------------------------
-    # MÉTRICA 1: Total de Chamados
-    # -------------------------------------------------------------------------
-    # O que: Contar quantos chamados existem no total
-    # Por que: É o número mais básico e importante
-    # Como: len() conta o número de linhas
-    
-    total_chamados = len(df)
-    metricas['total_chamados'] = total_chamados
-    print(f"\n📌 Total de chamados: {total_chamados}")
-    
-    # -------------------------------------------------------------------------
-    # MÉTRICA 2: Chamados por Status
-    # -------------------------------------------------------------------------
-    # O que: Contar quantos chamados em cada status (Aberto, Em Andamento, Fechado)
-    # Por que: Para saber a carga de trabalho atual
-    # Como: value_counts() conta valores únicos
-    
-    por_status = df['status'].value_counts()
-    metricas['por_status'] = por_status
-    print(f"\n📌 Chamados por Status:")
-    for status, quantidade in por_status.items():
-        percentual = (quantidade / total_chamados) * 100
-        print(f"   • {status}: {quantidade} ({percentual:.1f}%)")
-    
-    # -------------------------------------------------------------------------
-    # MÉTRICA 3: Chamados por Tipo
-    # -------------------------------------------------------------------------
-    # O que: Contar chamados de cada categoria (Hardware, Software, Rede, Acesso)
-    # Por que: Para identificar qual tipo de problema é mais comum
-    # Como: value_counts() novamente
-    
-    por_tipo = df['tipo_chamado'].value_counts()
-    metricas['por_tipo'] = por_tipo
-    print(f"\n📌 Chamados por Tipo:")
-    for tipo, quantidade in por_tipo.items():
-        percentual = (quantidade / total_chamados) * 100
-        print(f"   • {tipo}: {quantidade} ({percentual:.1f}%)")
-    
-    # -------------------------------------------------------------------------
-    # MÉTRICA 4: Tempo Médio de Atendimento
-    # -------------------------------------------------------------------------
-    # O que: Calcular a média de tempo para resolver chamados
-    # Por que: Indicador de eficiência (SLA)
-    # Como: .mean() calcula a média, ignorando valores NaN automaticamente
-    
-    # Filtrando apenas chamados fechados (que têm tempo de atendimento)
-    tempo_medio = df['tempo_atendimento_horas'].mean()
-    tempo_min = df['tempo_atendimento_horas'].min()
-    tempo_max = df['tempo_atendimento_horas'].max()
-    
-    metricas['tempo_medio'] = tempo_medio
-    metricas['tempo_min'] = tempo_min
-    metricas['tempo_max'] = tempo_max
-    
-    print(f"\n📌 Tempo de Atendimento (apenas chamados fechados):")
-    print(f"   • Médio: {tempo_medio:.2f} horas")
-    print(f"   • Mínimo: {tempo_min:.2f} horas")
-    print(f"   • Máximo: {tempo_max:.2f} horas")
-    
-    # -------------------------------------------------------------------------
-    # MÉTRICA 5: Chamados por Setor
-    # -------------------------------------------------------------------------
-    # O que: Contar chamados de cada departamento
-    # Por que: Identificar quais setores mais demandam suporte
-    # Como: value_counts() + sort_values() para ordenar
-    
-    por_setor = df['setor'].value_counts()
-    metricas['por_setor'] = por_setor
-    print(f"\n📌 Chamados por Setor:")
-    for setor, quantidade in por_setor.items():
-        percentual = (quantidade / total_chamados) * 100
-        print(f"   • {setor}: {quantidade} ({percentual:.1f}%)")
-    
-    # -------------------------------------------------------------------------
-    # MÉTRICA 6: Chamados por Prioridade
-    # -------------------------------------------------------------------------
-    # O que: Distribuição por urgência
-    # Por que: Para entender a criticidade média dos chamados
-    
-    por_prioridade = df['prioridade'].value_counts()
-    metricas['por_prioridade'] = por_prioridade
-    print(f"\n📌 Chamados por Prioridade:")
-    for prioridade, quantidade in por_prioridade.items():
-        percentual = (quantidade / total_chamados) * 100
-        print(f"   • {prioridade}: {quantidade} ({percentual:.1f}%)")
-    
-    # -------------------------------------------------------------------------
-    # MÉTRICA 7: Chamados por Responsável
-    # -------------------------------------------------------------------------
-    # O que: Carga de trabalho por técnico
-    # Por que: Para balancear a equipe
-    
-    por_responsavel = df['responsavel'].value_counts()
-    metricas['por_responsavel'] = por_responsavel
-    print(f"\n📌 Chamados por Responsável:")
-    for responsavel, quantidade in por_responsavel.items():
-        percentual = (quantidade / total_chamados) * 100
-        print(f"   • {responsavel}: {quantidade} ({percentual:.1f}%)")
-    
-    # -------------------------------------------------------------------------
-    # MÉTRICA 8: Tempo Médio por Prioridade
-    # -------------------------------------------------------------------------
-    # O que: Tempo de atendimento agrupado por prioridade
-    # Por que: Chamados críticos devem ser resolvidos mais rápido
-    # Como: groupby() + mean() para calcular média por grupo
-    
-    tempo_por_prioridade = df.groupby('prioridade')['tempo_atendimento_horas'].mean().round(2)
-    metricas['tempo_por_prioridade'] = tempo_por_prioridade
-    print(f"\n📌 Tempo Médio por Prioridade (horas):")
-    for prioridade, tempo in tempo_por_prioridade.items():
-        print(f"   • {prioridade}: {tempo:.2f} horas")
-    
-    print("\n✅ Cálculo de métricas concluído!")
-    
+    metricas = finalizar_metricas(calcular_estado_metricas(df))
+    metricas['backlog'] = calcular_backlog(df)
+
+    if exibir_mensagens:
+        exibir_metricas(metricas)
+        print("\n✅ Cálculo de métricas concluído!")
+
+    return metricas
+
+
+# ==============================================================================
+# ETAPA 5B: MODO STREAMING (PROCESSAMENTO EM BLOCOS)
+# ==============================================================================
+#
+# O que estamos fazendo: Lendo o CSV em pedaços (blocos) e acumulando as métricas
+# Por que: Com dezenas de milhões de linhas, o arquivo inteiro não cabe na memória
+#          (e tratar_dados ainda faz uma cópia completa do DataFrame)
+# O que você aprende: read_csv(chunksize=...), geradores e acumuladores
+#
+# A ideia é simples: em vez de guardar as linhas, guardamos apenas os
+# "ingredientes" de cada métrica (o estado da ETAPA 5).
+# Cada bloco é tratado, somado aos acumuladores e descartado.
+# Assim a memória depende do tamanho do bloco, não do tamanho do arquivo.
+
+# Tamanho padrão de cada bloco (em linhas)
+TAMANHO_BLOCO_PADRAO = 100_000
+
+
+def carregar_dados_em_blocos(caminho_arquivo, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    Lê o arquivo CSV em blocos de tamanho fixo.
+
+    Parâmetros:
+        caminho_arquivo (str): Caminho para o arquivo CSV
+        tamanho_bloco (int): Quantidade de linhas de cada bloco
+
+    Retorna:
+        Gerador de DataFrames: Um bloco de cada vez (nunca o arquivo inteiro)
+    """
+    # chunksize faz o read_csv devolver um leitor em vez de um DataFrame.
+    # Cada iteração lê apenas as próximas 'tamanho_bloco' linhas.
+    with ler_csv_chamados(caminho_arquivo, chunksize=tamanho_bloco) as leitor:
+        for bloco in leitor:
+            yield bloco
+
+
+def acumular_bloco(estado, df_bloco):
+    """
+    Soma um bloco já tratado aos acumuladores.
+
+    Parâmetros:
+        estado (dict): Acumuladores criados por criar_estado_metricas()
+        df_bloco (DataFrame): Bloco tratado por tratar_dados()
+
+    Retorna:
+        dict: O mesmo estado, atualizado
+    """
+    return combinar_estados(estado, calcular_estado_metricas(df_bloco))
+
+
+def processar_em_blocos(caminho_arquivo, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    Carrega, trata e calcula as métricas bloco a bloco.
+
+    Parâmetros:
+        caminho_arquivo (str): Caminho para o arquivo CSV
+        tamanho_bloco (int): Quantidade de linhas de cada bloco
+
+    Retorna:
+        dict: Métricas no mesmo formato de calcular_metricas()
+    """
+    print("\n" + "="*60)
+    print("🌊 PROCESSAMENTO EM BLOCOS (STREAMING)")
+    print("="*60)
+    print(f"   Tamanho do bloco: {tamanho_bloco} linhas")
+
+    estado = criar_estado_metricas()
+    eventos_backlog = None
+    quantidade_blocos = 0
+
+    for bloco in carregar_dados_em_blocos(caminho_arquivo, tamanho_bloco):
+        bloco_tratado = tratar_dados(bloco, exibir_mensagens=False)
+        acumular_bloco(estado, bloco_tratado)
+        # Saldos de abertura/fechamento por dia também são somados bloco a bloco
+        eventos_backlog = combinar_eventos(eventos_backlog, contar_eventos(bloco_tratado))
+        quantidade_blocos += 1
+
+    metricas = finalizar_metricas(estado)
+    metricas['backlog'] = montar_serie_backlog(eventos_backlog)
+
+    print(f"   ✅ {quantidade_blocos} bloco(s) processado(s)")
+    print(f"   Total de chamados: {metricas['total_chamados']}")
+
     return metricas
 
 
@@ -366,10 +787,112 @@ def calcular_metricas(df):
 # Por que: Excel é o formato padrão em empresas para relatórios
 # O que você aprende: Como usar ExcelWriter para criar múltiplas abas
 
-def gerar_relatorio_excel(df, metricas, nome_arquivo='relatorio_ti.xlsx'):
+def preparar_para_excel(df):
+    """
+    Ajusta os tipos compactos para a escrita no Excel.
+
+    O float32 de 'tempo_atendimento_horas' viraria números como
+    1.100000023841858 na planilha; convertendo para float64 e
+    arredondando, o Excel mostra 1.1 como antes.
+    """
+    return df.assign(
+        tempo_atendimento_horas=df['tempo_atendimento_horas'].astype('float64').round(2)
+    )
+
+
+# Limite de linhas de uma aba do Excel (incluindo a linha do cabeçalho)
+LIMITE_LINHAS_EXCEL = 1_048_576
+
+
+def montar_tabelas_resumo(metricas):
+    """
+    Monta as tabelas das abas de resumo (todas menos Dados_Completos).
+
+    As duas formas de escrita (pandas e streaming) usam estas mesmas
+    tabelas, então o layout das abas é sempre o mesmo.
+
+    Parâmetros:
+        metricas (dict): Métricas calculadas
+
+    Retorna:
+        dict: {nome da aba: DataFrame}, na ordem em que as abas aparecem
+    """
+    resumo_data = {
+        'Métrica': [
+            'Total de Chamados',
+            'Chamados Abertos',
+            'Chamados Em Andamento',
+            'Chamados Fechados',
+            'Tempo Médio de Atendimento (horas)',
+            'Tempo Mínimo de Atendimento (horas)',
+            'Tempo Máximo de Atendimento (horas)',
+            *(f'Tempo {nome.upper()} de Atendimento (horas)' for nome in QUANTIS_PADRAO),
+        ],
+        'Valor': [
+            metricas['total_chamados'],
+            metricas['por_status'].get('Aberto', 0),
+            metricas['por_status'].get('Em Andamento', 0),
+            metricas['por_status'].get('Fechado', 0),
+            round(metricas['tempo_medio'], 2) if pd.notna(metricas['tempo_medio']) else 'N/A',
+            round(metricas['tempo_min'], 2) if pd.notna(metricas['tempo_min']) else 'N/A',
+            round(metricas['tempo_max'], 2) if pd.notna(metricas['tempo_max']) else 'N/A',
+            *(valor if pd.notna(valor) else 'N/A' for valor in metricas['percentis_tempo']),
+        ]
+    }
+    tabelas = {'Resumo': pd.DataFrame(resumo_data)}
+
+    # Abas "Por_..." : contagem + percentual sobre o total de chamados
+    abas_contagem = [
+        ('Por_Status', 'por_status', 'Status'),
+        ('Por_Tipo', 'por_tipo', 'Tipo'),
+        ('Por_Setor', 'por_setor', 'Setor'),
+        ('Por_Prioridade', 'por_prioridade', 'Prioridade'),
+        ('Por_Responsavel', 'por_responsavel', 'Responsavel'),
+    ]
+    for nome_aba, chave, nome_coluna in abas_contagem:
+        tabela = metricas[chave].reset_index()
+        tabela.columns = [nome_coluna, 'Quantidade']
+        tabela['Percentual'] = (tabela['Quantidade'] / metricas['total_chamados'] * 100).round(1)
+        tabelas[nome_aba] = tabela
+
+    # Adicionando tempo médio por prioridade
+    tabelas['Por_Prioridade']['Tempo_Medio_Horas'] = tabelas['Por_Prioridade']['Prioridade'].map(
+        metricas['tempo_por_prioridade']
+    )
+
+    # Percentis do tempo (SLA): colunas P50_Horas ... P99_Horas
+    abas_percentis = [
+        ('Por_Prioridade', 'percentis_por_prioridade', 'Prioridade'),
+        ('Por_Tipo', 'percentis_por_tipo', 'Tipo'),
+        ('Por_Responsavel', 'percentis_por_responsavel', 'Responsavel'),
+    ]
+    for nome_aba, chave, nome_coluna in abas_percentis:
+        tabela = tabelas[nome_aba]
+        for nome, percentis in metricas[chave].items():
+            tabela[f'{nome.upper()}_Horas'] = tabela[nome_coluna].map(percentis)
+
+    # Backlog diário (a ingestão incremental não guarda as datas, então
+    # nem sempre está disponível)
+    if metricas.get('backlog') is not None:
+        tabelas['Backlog'] = tabela_backlog(metricas['backlog'])
+    return tabelas
+
+
+def gerar_relatorio_excel(df, metricas, nome_arquivo='relatorio_ti.xlsx',
+                          escrita_streaming=False):
     """
     Função para gerar o relatório final em Excel.
-    
+
+    Parâmetros:
+        df (DataFrame ou iterável de DataFrames): Base tratada. No modo
+            streaming pode ser um gerador de blocos tratados, que são
+            escritos um após o outro na aba Dados_Completos.
+        metricas (dict): Métricas calculadas
+        nome_arquivo (str): Caminho do arquivo Excel de saída
+        escrita_streaming (bool): Se True, escreve linha a linha com memória
+            constante (ver gerar_relatorio_excel_streaming). Blocos e bases
+            acima do limite de linhas do Excel sempre usam esse modo.
+
     Abas criadas:
     1. Resumo - Métricas principais
     2. Dados_Completos - Base de dados tratada
@@ -378,111 +901,205 @@ def gerar_relatorio_excel(df, metricas, nome_arquivo='relatorio_ti.xlsx'):
     5. Por_Setor - Análise por departamento
     6. Por_Prioridade - Análise por urgência
     7. Por_Responsavel - Carga por técnico
+    8. Backlog - Chamados em aberto no fim de cada dia (total, por
+       prioridade e por setor)
+
+    As abas Por_Prioridade, Por_Tipo e Por_Responsavel trazem também os
+    percentis do tempo de atendimento (P50/P90/P95/P99_Horas).
     """
+    if (
+        escrita_streaming
+        or not isinstance(df, pd.DataFrame)
+        or len(df) >= LIMITE_LINHAS_EXCEL
+    ):
+        return gerar_relatorio_excel_streaming(df, metricas, nome_arquivo)
+
     print("\n" + "="*60)
     print("📑 GERAÇÃO DO RELATÓRIO EXCEL")
     print("="*60)
     
+    tabelas = montar_tabelas_resumo(metricas)
+
     # ExcelWriter permite criar um arquivo Excel com múltiplas abas
     # 'with' garante que o arquivo será fechado corretamente
     # engine='openpyxl' é a biblioteca que escreve o arquivo
     
     with pd.ExcelWriter(nome_arquivo, engine='openpyxl') as writer:
-        
-        # ---------------------------------------------------------------------
-        # ABA 1: RESUMO
-        # ---------------------------------------------------------------------
-        # Criando um DataFrame com as métricas resumidas
-        print("\n📄 Criando aba 'Resumo'...")
-        
-        resumo_data = {
-            'Métrica': [
-                'Total de Chamados',
-                'Chamados Abertos',
-                'Chamados Em Andamento',
-                'Chamados Fechados',
-                'Tempo Médio de Atendimento (horas)',
-                'Tempo Mínimo de Atendimento (horas)',
-                'Tempo Máximo de Atendimento (horas)'
-            ],
-            'Valor': [
-                metricas['total_chamados'],
-                metricas['por_status'].get('Aberto', 0),
-                metricas['por_status'].get('Em Andamento', 0),
-                metricas['por_status'].get('Fechado', 0),
-                round(metricas['tempo_medio'], 2) if pd.notna(metricas['tempo_medio']) else 'N/A',
-                round(metricas['tempo_min'], 2) if pd.notna(metricas['tempo_min']) else 'N/A',
-                round(metricas['tempo_max'], 2) if pd.notna(metricas['tempo_max']) else 'N/A'
-            ]
-        }
-        df_resumo = pd.DataFrame(resumo_data)
-        
-        # to_excel() escreve o DataFrame em uma aba
-        # index=False evita escrever o índice numérico
-        df_resumo.to_excel(writer, sheet_name='Resumo', index=False)
-        
-        # ---------------------------------------------------------------------
-        # ABA 2: DADOS COMPLETOS
-        # ---------------------------------------------------------------------
-        print("📄 Criando aba 'Dados_Completos'...")
-        df.to_excel(writer, sheet_name='Dados_Completos', index=False)
-        
-        # ---------------------------------------------------------------------
-        # ABA 3: POR STATUS
-        # ---------------------------------------------------------------------
-        print("📄 Criando aba 'Por_Status'...")
-        df_status = metricas['por_status'].reset_index()
-        df_status.columns = ['Status', 'Quantidade']
-        df_status['Percentual'] = (df_status['Quantidade'] / metricas['total_chamados'] * 100).round(1)
-        df_status.to_excel(writer, sheet_name='Por_Status', index=False)
-        
-        # ---------------------------------------------------------------------
-        # ABA 4: POR TIPO
-        # ---------------------------------------------------------------------
-        print("📄 Criando aba 'Por_Tipo'...")
-        df_tipo = metricas['por_tipo'].reset_index()
-        df_tipo.columns = ['Tipo', 'Quantidade']
-        df_tipo['Percentual'] = (df_tipo['Quantidade'] / metricas['total_chamados'] * 100).round(1)
-        df_tipo.to_excel(writer, sheet_name='Por_Tipo', index=False)
-        
-        # ---------------------------------------------------------------------
-        # ABA 5: POR SETOR
-        # ---------------------------------------------------------------------
-        print("📄 Criando aba 'Por_Setor'...")
-        df_setor = metricas['por_setor'].reset_index()
-        df_setor.columns = ['Setor', 'Quantidade']
-        df_setor['Percentual'] = (df_setor['Quantidade'] / metricas['total_chamados'] * 100).round(1)
-        df_setor.to_excel(writer, sheet_name='Por_Setor', index=False)
-        
-        # ---------------------------------------------------------------------
-        # ABA 6: POR PRIORIDADE
-        # ---------------------------------------------------------------------
-        print("📄 Criando aba 'Por_Prioridade'...")
-        df_prioridade = metricas['por_prioridade'].reset_index()
-        df_prioridade.columns = ['Prioridade', 'Quantidade']
-        df_prioridade['Percentual'] = (df_prioridade['Quantidade'] / metricas['total_chamados'] * 100).round(1)
-        
-        # Adicionando tempo médio por prioridade
-        df_prioridade['Tempo_Medio_Horas'] = df_prioridade['Prioridade'].map(
-            metricas['tempo_por_prioridade']
-        )
-        df_prioridade.to_excel(writer, sheet_name='Por_Prioridade', index=False)
-        
-        # ---------------------------------------------------------------------
-        # ABA 7: POR RESPONSÁVEL
-        # ---------------------------------------------------------------------
-        print("📄 Criando aba 'Por_Responsavel'...")
-        df_responsavel = metricas['por_responsavel'].reset_index()
-        df_responsavel.columns = ['Responsavel', 'Quantidade']
-        df_responsavel['Percentual'] = (df_responsavel['Quantidade'] / metricas['total_chamados'] * 100).round(1)
-        df_responsavel.to_excel(writer, sheet_name='Por_Responsavel', index=False)
+        for nome_aba, tabela in tabelas.items():
+            print(f"📄 Criando aba '{nome_aba}'...")
+            with instrumentacao.etapa(f'aba:{nome_aba}', linhas=len(tabela)):
+                # to_excel() escreve o DataFrame em uma aba
+                # index=False evita escrever o índice numérico
+                tabela.to_excel(writer, sheet_name=nome_aba, index=False)
+
+            if nome_aba == 'Resumo':
+                # ABA 2: DADOS COMPLETOS (logo depois do Resumo)
+                print("📄 Criando aba 'Dados_Completos'...")
+                with instrumentacao.etapa('aba:Dados_Completos', linhas=len(df)):
+                    preparar_para_excel(df).to_excel(writer, sheet_name='Dados_Completos', index=False)
     
     print(f"\n✅ Relatório gerado com sucesso: {nome_arquivo}")
-    print(f"   📊 Total de abas criadas: 7")
+    print(f"   📊 Total de abas criadas: {len(tabelas) + 1}")
     
     return nome_arquivo
 
 
+# ==============================================================================
+# ETAPA 6B: ESCRITA DO EXCEL EM STREAMING
+# ==============================================================================
+#
+# Por que o ExcelWriter comum gasta tanta memória?
+# O openpyxl normal monta TODAS as células do arquivo na memória (cada uma
+# é um objeto Python) e só grava no final. Com milhões de chamados, isso
+# são dezenas de milhões de objetos.
+#
+# O modo "write_only" do openpyxl grava cada linha no disco assim que ela
+# é adicionada com append(). A memória fica constante: só o bloco atual
+# existe na memória.
+#
+# E o limite de 1.048.576 linhas?
+# Uma aba do Excel não passa disso. Quando a aba Dados_Completos enche,
+# continuamos em Dados_Completos_2, Dados_Completos_3, ...
+
+
+def linhas_para_excel(df):
+    """
+    Converte um bloco em linhas (tuplas) prontas para o openpyxl.
+
+    Valores ausentes (NaN/NaT) viram None, ou seja, células vazias,
+    como o to_excel() do pandas faz.
+
+    Parâmetros:
+        df (DataFrame): Bloco já preparado (ver preparar_para_excel)
+
+    Retorna:
+        iterador de tuplas, uma por linha
+    """
+    colunas = []
+    for nome in df.columns:
+        serie = df[nome]
+        valores = serie.astype(object).to_numpy(copy=True)
+        valores[serie.isna().to_numpy()] = None
+        colunas.append(valores)
+    return zip(*colunas)
+
+
+def escrever_cabecalho(aba, colunas):
+    """Escreve a linha de cabeçalho com o mesmo estilo do to_excel() do pandas."""
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    # Negrito, borda fina e centralizado: o estilo padrão do pandas
+    lado = Side(style='thin')
+    celulas = []
+    for coluna in colunas:
+        celula = WriteOnlyCell(aba, value=str(coluna))
+        celula.font = Font(bold=True)
+        celula.border = Border(left=lado, right=lado, top=lado, bottom=lado)
+        celula.alignment = Alignment(horizontal='center', vertical='top')
+        celulas.append(celula)
+    aba.append(celulas)
+
+
+def escrever_tabela(pasta_trabalho, nome_aba, tabela):
+    """Escreve uma tabela pequena (aba de resumo) no modo write_only."""
+    aba = pasta_trabalho.create_sheet(nome_aba)
+    escrever_cabecalho(aba, tabela.columns)
+    for linha in linhas_para_excel(tabela):
+        aba.append(linha)
+
+
+def escrever_dados_completos(pasta_trabalho, blocos):
+    """
+    Escreve os blocos em Dados_Completos, abrindo uma nova aba numerada
+    sempre que o limite de linhas do Excel é atingido.
+
+    Parâmetros:
+        pasta_trabalho: Workbook do openpyxl em modo write_only
+        blocos (iterável de DataFrames): Blocos tratados
+
+    Retorna:
+        tuple: (abas criadas, linhas de dados escritas)
+    """
+    linhas_por_aba = LIMITE_LINHAS_EXCEL - 1  # uma linha é do cabeçalho
+    abas = []
+    aba = None
+    linhas_na_aba = 0
+    total_linhas = 0
+
+    for bloco in blocos:
+        bloco = preparar_para_excel(bloco)
+        for linha in linhas_para_excel(bloco):
+            if aba is None or linhas_na_aba == linhas_por_aba:
+                nome_aba = 'Dados_Completos' if not abas else f'Dados_Completos_{len(abas) + 1}'
+                print(f"📄 Criando aba '{nome_aba}'...")
+                aba = pasta_trabalho.create_sheet(nome_aba)
+                escrever_cabecalho(aba, bloco.columns)
+                abas.append(nome_aba)
+                linhas_na_aba = 0
+            aba.append(linha)
+            linhas_na_aba += 1
+        total_linhas += len(bloco)
+
+    if not abas:
+        # Base vazia: a aba existe mesmo assim, como no modo normal
+        print("📄 Criando aba 'Dados_Completos'...")
+        pasta_trabalho.create_sheet('Dados_Completos')
+        abas.append('Dados_Completos')
+
+    return abas, total_linhas
+
+
+def gerar_relatorio_excel_streaming(df, metricas, nome_arquivo='relatorio_ti.xlsx'):
+    """
+    Gera o mesmo relatório de gerar_relatorio_excel(), com memória constante.
+
+    As abas de resumo têm o mesmo layout do modo normal. A aba
+    Dados_Completos é dividida em abas numeradas quando passa do limite
+    de linhas do Excel.
+
+    Parâmetros:
+        df (DataFrame ou iterável de DataFrames): Base tratada ou blocos
+        metricas (dict): Métricas calculadas
+        nome_arquivo (str): Caminho do arquivo Excel de saída
+
+    Retorna:
+        str: Caminho do arquivo gerado
+    """
+    from openpyxl import Workbook
+
+    print("\n" + "="*60)
+    print("📑 GERAÇÃO DO RELATÓRIO EXCEL (STREAMING)")
+    print("="*60)
+
+    blocos = [df] if isinstance(df, pd.DataFrame) else df
+    tabelas = montar_tabelas_resumo(metricas)
+
+    pasta_trabalho = Workbook(write_only=True)
+    abas_dados = []
+    for nome_aba, tabela in tabelas.items():
+        print(f"📄 Criando aba '{nome_aba}'...")
+        with instrumentacao.etapa(f'aba:{nome_aba}', linhas=len(tabela)):
+            escrever_tabela(pasta_trabalho, nome_aba, tabela)
+
+        if nome_aba == 'Resumo':
+            # Inclui ler e tratar os blocos, quando eles vêm de um gerador
+            with instrumentacao.etapa('aba:Dados_Completos') as registro:
+                abas_dados, total_linhas = escrever_dados_completos(pasta_trabalho, blocos)
+                registro['linhas'] = total_linhas
+            print(f"   {total_linhas} linhas em {len(abas_dados)} aba(s) de dados")
+
+    # No modo write_only, as abas vão para arquivos temporários; o save()
+    # junta tudo no .xlsx final
+    with instrumentacao.etapa('salvar_xlsx'):
+        pasta_trabalho.save(nome_arquivo)
+
+    print(f"\n✅ Relatório gerado com sucesso: {nome_arquivo}")
+    print(f"   📊 Total de abas criadas: {len(tabelas) + len(abas_dados)}")
+
+    return nome_arquivo
+
+
 # ==============================================================================
 # ETAPA 7: FUNÇÃO PRINCIPAL (ORQUESTRADOR)
 # ==============================================================================
@@ -491,38 +1108,240 @@ def gerar_relatorio_excel(df, metricas, nome_arquivo='relatorio_ti.xlsx'):
 # Por que: Boa prática - separar a lógica em funções e ter um ponto de entrada
 # O que você aprende: Organização de código e a convenção if __name__ == "__main__"
 
-def main():
+# Arquivos usados quando nenhum caminho é informado
+ARQUIVO_ENTRADA_PADRAO = 'chamados_ti.csv'
+ARQUIVO_SAIDA_PADRAO = 'relatorio_ti.xlsx'
+
+def main(modo_streaming=False, tamanho_bloco=TAMANHO_BLOCO_PADRAO, usar_cache=True,
+         modo_incremental=False, escrita_streaming=False, formatos_exportacao=None,
+         arquivo_rastro=None, arquivo_perfil=None, pasta_particoes=None,
+         data_inicio=None, data_fim=None, ultimos_dias=None, modo_paralelo=False,
+         max_processos=None, relatorios_por=None, usar_sqlite=False, url_api=None,
+         arquivo_entrada=ARQUIVO_ENTRADA_PADRAO, arquivo_saida=ARQUIVO_SAIDA_PADRAO):
     """
     Função principal que orquestra todo o processamento.
-    
+
     Por que usar uma função main()?
     - Organização: Todo o fluxo fica claro em um lugar
     - Testabilidade: Pode ser chamada de outros scripts
     - Convenção: É padrão em Python
+
+    Parâmetros:
+        modo_streaming (bool): Se True, processa o CSV em blocos, sem nunca
+                               carregar o arquivo inteiro na memória
+        tamanho_bloco (int): Linhas por bloco no modo streaming
+        usar_cache (bool): Se True, reaproveita o snapshot colunar dos dados
+                           tratados (ver carregar_dados_com_cache)
+        modo_incremental (bool): Se True, processa só as linhas acrescentadas
+                                 ao CSV desde a última execução; a aba
+                                 Dados_Completos vem das partes já tratadas
+                                 (ver ingestao_incremental.py)
+        escrita_streaming (bool): Se True, grava o Excel com memória constante
+                                  (ver gerar_relatorio_excel_streaming). Os
+                                  modos streaming e incremental já gravam assim.
+        formatos_exportacao (tuple): Formatos extras além do Excel, por exemplo
+                                     ('parquet', 'csv', 'json'); ver
+                                     exportacao_formatos.py. None = só o Excel.
+        arquivo_rastro (str): Se informado, mede cada etapa e grava o resultado
+                              neste JSON (ver instrumentacao.py)
+        arquivo_perfil (str): Se informado, grava também um perfil do cProfile
+        pasta_particoes (str): Pasta com um arquivo por mês (CSV ou Parquet), no
+                               lugar de arquivo_entrada (ver leitura_particionada.py)
+        data_inicio, data_fim: Período do relatório (fim inclusive). Com
+                               pasta_particoes, só os meses do período são lidos
+        ultimos_dias (int): Atalho para data_inicio = hoje - ultimos_dias
+        modo_paralelo (bool): Se True, calcula as métricas em vários núcleos
+                              (ver agregacao_paralela.py)
+        max_processos (int): Processos do modo paralelo e dos relatórios por
+                             grupo (None = um por núcleo)
+        relatorios_por (str): 'setor' ou 'mes': além do relatório geral, gera
+                              um relatorio_<grupo>.xlsx por grupo, em paralelo
+                              (ver relatorios_por_grupo.py)
+        usar_sqlite (bool): Se True, carrega os chamados em um banco SQLite
+                            com índices e calcula as métricas com consultas
+                            SQL, sem a base na memória (ver banco_sqlite.py)
+        url_api (str): Endereço da API REST do helpdesk. Se informado, os
+                       chamados (do período, se houver) são baixados e
+                       tratados direto, no lugar de arquivo_entrada
+                       (ver ingestao_api.py)
+        arquivo_entrada (str): CSV de chamados lido pelo relatório
+        arquivo_saida (str): Caminho do relatório Excel gerado
     """
+    if pasta_particoes and (modo_streaming or modo_incremental):
+        raise ValueError("pasta_particoes não pode ser usada com os modos streaming/incremental")
+    if modo_paralelo and (modo_streaming or modo_incremental):
+        raise ValueError("modo_paralelo não pode ser usado com os modos streaming/incremental")
+    if relatorios_por and (modo_streaming or modo_incremental):
+        raise ValueError("relatorios_por não pode ser usado com os modos streaming/incremental")
+    if (data_inicio is not None or data_fim is not None or ultimos_dias is not None) and (
+            modo_streaming or modo_incremental):
+        # Esses modos acumulam o arquivo inteiro: o período seria ignorado em silêncio
+        raise ValueError("data_inicio/data_fim/ultimos_dias não podem ser usados com os "
+                         "modos streaming/incremental")
+    if usar_sqlite and (modo_streaming or modo_incremental or pasta_particoes
+                        or modo_paralelo or relatorios_por):
+        raise ValueError("usar_sqlite não pode ser combinado com os outros modos")
+    if url_api and (modo_streaming or modo_incremental or pasta_particoes or usar_sqlite):
+        raise ValueError("url_api não pode ser usada com os modos streaming/incremental/"
+                         "SQLite nem com pasta_particoes")
+    if ultimos_dias is not None:
+        data_inicio = pd.Timestamp.now().normalize() - pd.Timedelta(days=ultimos_dias)
+
+    if arquivo_rastro or arquivo_perfil:
+        instrumentacao.iniciar_rastreamento(
+            arquivo_rastro or 'rastro_relatorio.json', arquivo_perfil
+        )
+    try:
+        executar_etapas(modo_streaming, tamanho_bloco, usar_cache, modo_incremental,
+                        escrita_streaming, formatos_exportacao,
+                        pasta_particoes, data_inicio, data_fim,
+                        modo_paralelo, max_processos, relatorios_por, usar_sqlite, url_api,
+                        arquivo_entrada, arquivo_saida)
+    finally:
+        # Grava o rastro mesmo se alguma etapa falhar: é quando ele mais ajuda
+        rastro = instrumentacao.finalizar_rastreamento()
+    if rastro is not None:
+        instrumentacao.exibir_resumo(rastro)
+
+
+def executar_etapas(modo_streaming, tamanho_bloco, usar_cache, modo_incremental,
+                    escrita_streaming, formatos_exportacao,
+                    pasta_particoes=None, data_inicio=None, data_fim=None,
+                    modo_paralelo=False, max_processos=None, relatorios_por=None,
+                    usar_sqlite=False, url_api=None,
+                    arquivo_entrada=ARQUIVO_ENTRADA_PADRAO, arquivo_saida=ARQUIVO_SAIDA_PADRAO):
+    """Executa as etapas 3 a 6 de main(), cada uma marcada na instrumentação."""
     print("\n" + "="*60)
     print("🚀 GERADOR DE RELATÓRIO DE SUPORTE DE TI")
     print("="*60)
     print("Iniciando processamento...\n")
+
+    # Nos modos incremental, streaming e SQLite a base nunca fica inteira na memória
+    df_tratado = None
     
-    # Definir caminhos dos arquivos
-    arquivo_entrada = 'chamados_ti.csv'
-    arquivo_saida = 'relatorio_ti.xlsx'
-    
-    # ETAPA 3: Carregar dados
-    df = carregar_dados(arquivo_entrada)
-    
-    # Opcional: Inspecionar dados (descomente para ver detalhes)
-    # inspecionar_dados(df)
-    
-    # ETAPA 4: Tratar dados
-    df_tratado = tratar_dados(df)
-    
-    # ETAPA 5: Calcular métricas
-    metricas = calcular_metricas(df_tratado)
-    
-    # ETAPA 6: Gerar relatório Excel
-    gerar_relatorio_excel(df_tratado, metricas, arquivo_saida)
+    if usar_sqlite:
+        # Importado aqui porque banco_sqlite usa funções deste módulo
+        from banco_sqlite import calcular_metricas_sql, carregar_no_banco, ler_blocos_do_banco
+
+        # ETAPAS 3 e 4: CSV → banco (só quando o CSV mudou)
+        with instrumentacao.etapa('carregar_no_banco'):
+            caminho_banco = carregar_no_banco(arquivo_entrada, tamanho_bloco=tamanho_bloco)
+
+        # ETAPA 5: métricas calculadas no banco (o período vai no WHERE)
+        with instrumentacao.etapa('calcular_metricas_sql') as registro:
+            metricas = calcular_metricas_sql(caminho_banco, data_inicio=data_inicio,
+                                             data_fim=data_fim)
+            registro['linhas'] = metricas['total_chamados']
+
+        # ETAPA 6: Dados_Completos lida do banco, bloco a bloco
+        blocos_tratados = ler_blocos_do_banco(caminho_banco, tamanho_bloco, data_inicio, data_fim)
+        with instrumentacao.etapa('gerar_relatorio_excel'):
+            gerar_relatorio_excel(blocos_tratados, metricas, arquivo_saida)
+    elif modo_incremental:
+        # Importado aqui porque ingestao_incremental usa funções deste módulo
+        from ingestao_incremental import atualizar_incremental, blocos_incrementais
+
+        # ETAPAS 3 a 5 só para as linhas novas; o resto vem do estado salvo
+        with instrumentacao.etapa('atualizar_incremental') as registro:
+            metricas, linhas_substituidas = atualizar_incremental(arquivo_entrada)
+            registro['linhas'] = metricas['total_chamados']
+
+        # ETAPA 6: Dados_Completos sem as versões antigas dos chamados atualizados,
+        # lida das partes já tratadas (o CSV não é relido)
+        blocos_tratados = blocos_incrementais(arquivo_entrada, linhas_substituidas, tamanho_bloco)
+        with instrumentacao.etapa('gerar_relatorio_excel'):
+            gerar_relatorio_excel(blocos_tratados, metricas, arquivo_saida)
+    elif modo_streaming:
+        # ETAPAS 3 a 5 em blocos: a memória fica limitada ao tamanho do bloco
+        with instrumentacao.etapa('processar_em_blocos') as registro:
+            metricas = processar_em_blocos(arquivo_entrada, tamanho_bloco)
+            registro['linhas'] = metricas['total_chamados']
+
+        # ETAPA 6: a aba Dados_Completos é escrita relendo o CSV bloco a bloco
+        blocos_tratados = (
+            tratar_dados(bloco, exibir_mensagens=False)
+            for bloco in carregar_dados_em_blocos(arquivo_entrada, tamanho_bloco)
+        )
+        with instrumentacao.etapa('gerar_relatorio_excel'):
+            gerar_relatorio_excel(blocos_tratados, metricas, arquivo_saida)
+    else:
+        if pasta_particoes:
+            # Importado aqui: só é necessário com a pasta de partições
+            from leitura_particionada import carregar_particoes, filtrar_periodo
+
+            # ETAPA 3: só os meses do período, lidos em paralelo
+            with instrumentacao.etapa('carregar_particoes') as registro:
+                df = carregar_particoes(pasta_particoes, data_inicio, data_fim)
+                registro['linhas'] = len(df)
+
+            # ETAPA 4: Tratar dados e cortar exatamente no período pedido
+            with instrumentacao.etapa('tratar_dados', linhas=len(df)):
+                df_tratado = filtrar_periodo(tratar_dados(df), data_inicio, data_fim)
+        elif url_api:
+            # Importado aqui porque ingestao_api usa funções deste módulo
+            from ingestao_api import carregar_da_api
+
+            # ETAPAS 3 e 4: páginas da API tratadas em blocos, sem CSV no meio
+            with instrumentacao.etapa('carregar_da_api') as registro:
+                df_tratado = carregar_da_api(url_api, data_inicio, data_fim,
+                                             tamanho_bloco=tamanho_bloco)
+                registro['linhas'] = len(df_tratado)
+        elif usar_cache:
+            # ETAPAS 3 e 4 com cache: só relê o CSV se ele tiver mudado
+            with instrumentacao.etapa('carregar_dados_com_cache') as registro:
+                df_tratado = carregar_dados_com_cache(arquivo_entrada)
+                registro['linhas'] = len(df_tratado)
+        else:
+            # ETAPA 3: Carregar dados
+            with instrumentacao.etapa('carregar_dados') as registro:
+                df = carregar_dados(arquivo_entrada)
+                registro['linhas'] = len(df)
+
+            # Opcional: Inspecionar dados (descomente para ver detalhes)
+            # inspecionar_dados(df)
+
+            # ETAPA 4: Tratar dados
+            with instrumentacao.etapa('tratar_dados', linhas=len(df)):
+                df_tratado = tratar_dados(df)
+
+        if not pasta_particoes and not url_api and (data_inicio is not None or data_fim is not None):
+            # Período pedido com um CSV único: não há o que podar, só filtrar
+            from leitura_particionada import filtrar_periodo
+            df_tratado = filtrar_periodo(df_tratado, data_inicio, data_fim)
+
+        # ETAPA 5: Calcular métricas
+        if modo_paralelo:
+            # Importado aqui porque agregacao_paralela usa funções deste módulo
+            from agregacao_paralela import calcular_metricas_paralelo
+
+            with instrumentacao.etapa('calcular_metricas_paralelo', linhas=len(df_tratado)):
+                metricas = calcular_metricas_paralelo(df_tratado, max_processos)
+        else:
+            with instrumentacao.etapa('calcular_metricas', linhas=len(df_tratado)):
+                metricas = calcular_metricas(df_tratado)
+
+        # ETAPA 6: Gerar relatório Excel
+        # (no modo normal, o tempo de gravar o .xlsx aparece nesta etapa,
+        # fora das abas: o ExcelWriter só grava o arquivo ao ser fechado)
+        with instrumentacao.etapa('gerar_relatorio_excel', linhas=len(df_tratado)):
+            gerar_relatorio_excel(df_tratado, metricas, arquivo_saida,
+                                  escrita_streaming=escrita_streaming)
+
+        if relatorios_por:
+            # Importado aqui porque relatorios_por_grupo usa funções deste módulo
+            from relatorios_por_grupo import gerar_relatorios_por_grupo
+
+            # ETAPA 6D: um relatório por setor/mês, reaproveitando os dados já tratados
+            with instrumentacao.etapa('gerar_relatorios_por_grupo', linhas=len(df_tratado)):
+                gerar_relatorios_por_grupo(df_tratado, relatorios_por, max_processos=max_processos)
+
+    if formatos_exportacao:
+        # Importado aqui porque exportacao_formatos usa funções deste módulo
+        from exportacao_formatos import exportar_formatos
+
+        # ETAPA 6C: Parquet/CSV/JSON (sem a base completa nos modos em blocos)
+        with instrumentacao.etapa('exportar_formatos'):
+            exportar_formatos(df_tratado, metricas, formatos=formatos_exportacao)
     
     print("\n" + "="*60)
     print("✅ PROCESSAMENTO CONCLUÍDO COM SUCESSO!")
@@ -0,0 +1,160 @@
+"""
+==============================================================================
+ÍNDICE BITMAP PARA OS FILTROS DO DASHBOARD
+==============================================================================
+Descrição: Para cada valor das colunas categóricas, guarda um "mapa de bits"
+           dizendo quais linhas têm aquele valor. Combinar filtros vira um
+           E (AND) entre mapas de bits, e contar linhas vira contar bits 1.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- O que é um bitmap (bitset) e um índice invertido
+- Como np.packbits() guarda 8 linhas em 1 byte
+- Como contar bits ligados (popcount) de forma vetorizada
+==============================================================================
+"""
+
+import numpy as np
+
+# ==============================================================================
+# COMO FUNCIONA O ÍNDICE
+# ==============================================================================
+#
+# Imagine 10 chamados e a coluna status:
+#
+#   linha:     0 1 2 3 4 5 6 7 8 9
+#   Aberto:    1 0 0 1 0 0 0 0 1 0
+#   Fechado:   0 1 1 0 1 1 1 1 0 1
+#
+# Cada linha do "desenho" acima é um bitmap. Para o filtro
+# status = Aberto E prioridade = Critica, basta fazer
+# bitmap_aberto & bitmap_critica: um bit por linha, sem copiar o DataFrame.
+#
+# Com np.packbits(), 8 linhas ocupam 1 byte: 1 milhão de chamados
+# ocupam só 125 KB por valor indexado.
+
+# Contagem de bits ligados para cada byte possível (0 a 255)
+TABELA_POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+
+def construir_indice(df, colunas):
+    """
+    Constrói o índice bitmap das colunas informadas (uma única vez).
+
+    Parâmetros:
+        df (DataFrame): Dados tratados (colunas categóricas)
+        colunas (list): Colunas a indexar
+
+    Retorna:
+        dict: {'linhas': n, 'bitmaps': {coluna: {valor: bitmap}}}
+    """
+    bitmaps = {}
+    for coluna in colunas:
+        serie = df[coluna]
+        codigos = serie.cat.codes.to_numpy()
+        bitmaps[coluna] = {
+            categoria: np.packbits(codigos == posicao)
+            for posicao, categoria in enumerate(serie.cat.categories)
+        }
+    return {'linhas': len(df), 'bitmaps': bitmaps}
+
+
+def todos(indice):
+    """Bitmap com todas as linhas selecionadas (nenhum filtro)."""
+    return np.packbits(np.ones(indice['linhas'], dtype=bool))
+
+
+def selecionar(indice, filtros):
+    """
+    Combina os filtros com um E (AND) entre os bitmaps.
+
+    Parâmetros:
+        indice (dict): Resultado de construir_indice()
+        filtros (dict): {coluna: valor}; valores None são ignorados
+
+    Retorna:
+        array: Bitmap (np.uint8 empacotado) das linhas selecionadas
+    """
+    selecao = None
+    for coluna, valor in filtros.items():
+        if valor is None:
+            continue
+        bitmap = indice['bitmaps'][coluna].get(valor)
+        if bitmap is None:
+            # Valor inexistente: nenhuma linha atende ao filtro
+            return np.zeros((indice['linhas'] + 7) // 8, dtype=np.uint8)
+        selecao = bitmap.copy() if selecao is None else np.bitwise_and(selecao, bitmap, out=selecao)
+    return todos(indice) if selecao is None else selecao
+
+
+def contar(bitmap):
+    """Quantidade de linhas selecionadas (popcount do bitmap)."""
+    if hasattr(np, 'bitwise_count'):  # NumPy 2.0+
+        return int(np.bitwise_count(bitmap).sum())
+    return int(TABELA_POPCOUNT[bitmap].sum())
+
+
+def contar_com(indice, selecao, coluna, valor):
+    """Quantidade de linhas da seleção que têm coluna == valor."""
+    bitmap = indice['bitmaps'][coluna].get(valor)
+    if bitmap is None:
+        return 0
+    return contar(np.bitwise_and(selecao, bitmap))
+
+
+def contar_por_valor(indice, selecao, coluna):
+    """
+    Contagem de linhas selecionadas para cada valor de uma coluna.
+
+    Equivale a df_filtrado[coluna].value_counts(), mas só com popcounts.
+
+    Retorna:
+        dict: {valor: quantidade}, na ordem das categorias
+    """
+    return {
+        valor: contar_com(indice, selecao, coluna, valor)
+        for valor in indice['bitmaps'][coluna]
+    }
+
+
+def posicoes(indice, selecao):
+    """Números (posições) das linhas selecionadas, em ordem crescente."""
+    return np.flatnonzero(np.unpackbits(selecao, count=indice['linhas']))
+
+
+def mascara(indice, selecao):
+    """Máscara booleana das linhas selecionadas (uma posição por linha)."""
+    return np.unpackbits(selecao, count=indice['linhas']).view(bool)
+
+
+def anexar_linhas(indice, df_novo):
+    """
+    Acrescenta linhas novas ao final do índice (modo ao vivo do dashboard).
+
+    Os bytes completos dos bitmaps antigos são reaproveitados; só o último
+    byte (que pode estar pela metade) é desempacotado e refeito junto com
+    os bits das linhas novas.
+
+    Parâmetros:
+        indice (dict): Índice atual (não é alterado)
+        df_novo (DataFrame): Linhas novas, com as categorias já unificadas
+                             (todas as categorias antigas presentes)
+
+    Retorna:
+        dict: Novo índice, no formato de construir_indice()
+    """
+    linhas = indice['linhas']
+    completos, resto = divmod(linhas, 8)
+    vazio = np.zeros((linhas + 7) // 8, dtype=np.uint8)
+
+    bitmaps = {}
+    for coluna, antigos in indice['bitmaps'].items():
+        serie = df_novo[coluna]
+        codigos = serie.cat.codes.to_numpy()
+        bitmaps[coluna] = {}
+        for posicao, categoria in enumerate(serie.cat.categories):
+            # Valor que aparece pela primeira vez: nenhuma linha antiga tem
+            antigo = antigos.get(categoria, vazio)
+            bits = np.concatenate([np.unpackbits(antigo[completos:], count=resto),
+                                   codigos == posicao])
+            bitmaps[coluna][categoria] = np.concatenate([antigo[:completos], np.packbits(bits)])
+    return {'linhas': linhas + len(df_novo), 'bitmaps': bitmaps}
@@ -0,0 +1,349 @@
+"""
+==============================================================================
+INGESTÃO DIRETO DA API DO HELPDESK (ASSÍNCRONA E PAGINADA)
+==============================================================================
+Descrição: Baixa os chamados da API REST do helpdesk e entrega as páginas,
+           em blocos, direto para o tratar_dados(), sem gravar um CSV no
+           meio do caminho. Várias páginas são baixadas ao mesmo tempo,
+           por um número limitado de conexões reaproveitadas.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- O que é asyncio e por que ele serve para esperar a rede
+- Como limitar a concorrência (quantas requisições ao mesmo tempo)
+- Como funciona a paginação por cursor
+- Como repetir uma requisição com espera crescente (retry com backoff)
+==============================================================================
+"""
+
+import asyncio
+import os
+import random
+import time
+
+import aiohttp
+import pandas as pd
+
+from atualizacao_ao_vivo import juntar_partes
+from esquema_chamados import COLUNAS_CATEGORICAS, COLUNAS_DATA, TIPOS_LEITURA
+from gerador_relatorio import TAMANHO_BLOCO_PADRAO, tratar_dados
+
+# ==============================================================================
+# COMO FUNCIONA A INGESTÃO PELA API
+# ==============================================================================
+#
+# O script antigo pedia uma página, esperava a resposta, gravava no CSV,
+# pedia a próxima... Quase todo o tempo era ESPERA pela rede.
+#
+# CONTRATO DA API (o mesmo da api_simulada.py):
+#
+#   GET /chamados?abertura_de=...&abertura_ate=...&limite=500&cursor=...
+#   → {"chamados": [{...}, ...], "proximo_cursor": "abc" ou null}
+#
+#   GET /chamados/periodo
+#   → {"inicio": "2024-01-02 08:15:00", "fim": "2024-03-15 12:30:00"}
+#
+# abertura_de é inclusivo e abertura_ate exclusivo. Com sem_abertura=1,
+# vêm só os chamados sem data de abertura.
+#
+# PAGINAÇÃO POR CURSOR: cada resposta traz o cursor da página seguinte.
+# Não dá para pedir a página 7 sem ter a 6, então UMA listagem é sempre
+# sequencial. Para baixar em paralelo, dividimos o período em FATIAS
+# (ex.: 32 pedaços de tempo), e cada fatia é uma listagem independente:
+#
+#   fatia 1: jan/01 a jan/03  → página, cursor, página, cursor...
+#   fatia 2: jan/03 a jan/05  → página, cursor, ...
+#   ...
+#
+# CONCORRÊNCIA LIMITADA: 'concorrencia' tarefas (asyncio) pegam fatias de
+# uma fila. Enquanto uma espera a resposta, as outras trabalham; nunca há
+# mais do que 'concorrencia' requisições abertas, para não derrubar a API.
+#
+# CONEXÕES REAPROVEITADAS: uma única sessão aiohttp com um pool de
+# 'concorrencia' conexões (keep-alive). Sem isso, cada página pagaria uma
+# conexão TCP (e um handshake TLS) nova.
+#
+# RETRY COM BACKOFF: falha de rede, 429 (muitas requisições) ou 5xx são
+# repetidos, esperando 0,5 s, 1 s, 2 s, 4 s... (com um sorteio, o "jitter",
+# para as tarefas não voltarem todas juntas). Se a API manda Retry-After,
+# esperamos o que ela pediu.
+#
+# DIRETO PARA O TRATAMENTO: as páginas vão para uma fila limitada; quando
+# juntam 'tamanho_bloco' chamados, o bloco é tratado (tratar_dados) em uma
+# thread, enquanto as tarefas continuam baixando. Se o tratamento atrasar,
+# a fila enche e o download espera (a memória não cresce sem limite).
+
+# Colunas de cada chamado na resposta da API (as mesmas do CSV)
+COLUNAS_API = ['id_chamado'] + COLUNAS_DATA + COLUNAS_CATEGORICAS
+
+# Requisições (e conexões) simultâneas
+CONCORRENCIA_PADRAO = 8
+
+# Chamados por página (o máximo aceito pela API)
+TAMANHO_PAGINA_PADRAO = 500
+
+# Fatias do período por tarefa: mais fatias equilibram melhor a carga
+FATIAS_POR_TAREFA = 4
+
+# Tentativas por requisição e espera antes da segunda (dobra a cada uma)
+TENTATIVAS_PADRAO = 5
+ESPERA_INICIAL = 0.5
+ESPERA_MAXIMA = 30.0
+
+# Respostas que valem uma nova tentativa
+STATUS_REPETIR = {429, 500, 502, 503, 504}
+
+FORMATO_DATA_API = '%Y-%m-%d %H:%M:%S'
+
+
+def dividir_periodo(inicio, fim_exclusivo, quantidade):
+    """
+    Divide [inicio, fim_exclusivo) em fatias contíguas, sem sobreposição.
+
+    Retorna:
+        list: Pares (abertura_de, abertura_ate) em texto, em ordem
+    """
+    limites = pd.date_range(inicio, fim_exclusivo, periods=quantidade + 1).floor('s').unique()
+    textos = [limite.strftime(FORMATO_DATA_API) for limite in limites]
+    return [(de, ate) for de, ate in zip(textos[:-1], textos[1:]) if de < ate]
+
+
+def tempo_de_espera(tentativa, resposta=None):
+    """
+    Espera antes de repetir uma requisição (backoff exponencial com jitter).
+
+    Parâmetros:
+        tentativa (int): Tentativas que já falharam (1, 2, ...)
+        resposta: Resposta da API, se houve (para ler o Retry-After)
+
+    Retorna:
+        float: Segundos
+    """
+    if resposta is not None:
+        pedido = resposta.headers.get('Retry-After')
+        if pedido is not None:
+            try:
+                return min(float(pedido), ESPERA_MAXIMA)
+            except ValueError:
+                pass  # Retry-After com data HTTP: usa o backoff normal
+    limite = min(ESPERA_INICIAL * 2 ** (tentativa - 1), ESPERA_MAXIMA)
+    return random.uniform(limite / 2, limite)
+
+
+async def buscar_pagina(sessao, url, parametros, estatisticas, tentativas=TENTATIVAS_PADRAO):
+    """
+    Faz um GET e devolve o JSON, repetindo falhas temporárias.
+
+    Parâmetros:
+        sessao (ClientSession): Sessão com o pool de conexões
+        url (str): Endereço da listagem
+        parametros (dict): Parâmetros da requisição (período, cursor...)
+        estatisticas (dict): Contadores 'requisicoes' e 'repeticoes'
+        tentativas (int): Máximo de tentativas
+
+    Retorna:
+        dict: Resposta da API
+    """
+    for tentativa in range(1, tentativas + 1):
+        estatisticas['requisicoes'] += 1
+        try:
+            async with sessao.get(url, params=parametros) as resposta:
+                if resposta.status not in STATUS_REPETIR:
+                    # 4xx (exceto 429) não melhora repetindo: erro na hora
+                    resposta.raise_for_status()
+                    return await resposta.json()
+                if tentativa == tentativas:
+                    resposta.raise_for_status()
+                espera = tempo_de_espera(tentativa, resposta)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if tentativa == tentativas:
+                raise
+            espera = tempo_de_espera(tentativa)
+        estatisticas['repeticoes'] += 1
+        await asyncio.sleep(espera)
+
+
+async def baixar_fatia(sessao, url, filtro, fila, estatisticas, tamanho_pagina, tentativas):
+    """
+    Percorre todas as páginas de uma fatia, seguindo os cursores.
+
+    Cada página vai para a fila assim que chega; a próxima só é pedida
+    depois (ela depende do cursor desta).
+    """
+    parametros = {**filtro, 'limite': tamanho_pagina}
+    while True:
+        dados = await buscar_pagina(sessao, url, parametros, estatisticas, tentativas)
+        if dados['chamados']:
+            await fila.put(dados['chamados'])
+        cursor = dados.get('proximo_cursor')
+        if not cursor:
+            return
+        parametros = {**filtro, 'limite': tamanho_pagina, 'cursor': cursor}
+
+
+def pagina_para_dataframe(registros):
+    """
+    Monta o DataFrame "bruto" de uma lista de chamados da API.
+
+    Fica igual ao lido do CSV (datas em texto, categóricas livres), para
+    passar pelo mesmo tratar_dados().
+    """
+    df = pd.DataFrame.from_records(registros, columns=COLUNAS_API)
+    return df.astype(TIPOS_LEITURA)
+
+
+async def blocos_da_api(url_base, data_inicio=None, data_fim=None,
+                        concorrencia=CONCORRENCIA_PADRAO,
+                        tamanho_pagina=TAMANHO_PAGINA_PADRAO,
+                        tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+                        token=None, tentativas=TENTATIVAS_PADRAO, estatisticas=None):
+    """
+    Baixa os chamados e devolve, conforme chegam, os blocos já tratados.
+
+    É um gerador assíncrono: use com "async for bloco in blocos_da_api(...)".
+    A ordem das linhas é a de chegada (as fatias correm em paralelo).
+
+    Parâmetros:
+        url_base (str): Endereço da API (ex.: https://helpdesk.empresa/api)
+        data_inicio, data_fim: Período da data de abertura (fim inclusive;
+                               None = todo o período informado pela API)
+        concorrencia (int): Requisições e conexões simultâneas
+        tamanho_pagina (int): Chamados por página
+        tamanho_bloco (int): Chamados por bloco entregue ao tratar_dados()
+        token (str): Token de acesso (cabeçalho Authorization: Bearer)
+        tentativas (int): Tentativas por requisição
+        estatisticas (dict): Se informado, recebe os contadores do download
+
+    Retorna:
+        Gerador assíncrono de DataFrames tratados
+    """
+    if estatisticas is None:
+        estatisticas = {}
+    estatisticas.update({'requisicoes': 0, 'repeticoes': 0, 'paginas': 0, 'fatias': 0})
+
+    url_base = url_base.rstrip('/')
+    cabecalhos = {'Authorization': f'Bearer {token}'} if token else {}
+    # Pool de conexões: no máximo 'concorrencia', reaproveitadas (keep-alive)
+    conector = aiohttp.TCPConnector(limit=concorrencia)
+    limite_tempo = aiohttp.ClientTimeout(total=60)
+
+    async with aiohttp.ClientSession(connector=conector, headers=cabecalhos,
+                                     timeout=limite_tempo) as sessao:
+        # ETAPA 1: período e fatias
+        if data_inicio is None or data_fim is None:
+            periodo = await buscar_pagina(sessao, f'{url_base}/chamados/periodo', {},
+                                          estatisticas, tentativas)
+        inicio = pd.Timestamp(data_inicio if data_inicio is not None else periodo['inicio'])
+        if data_fim is not None:
+            fim = pd.Timestamp(data_fim)
+            # Só a data (sem hora): inclui o dia inteiro, como filtrar_periodo()
+            fim_exclusivo = fim + pd.Timedelta(days=1) if fim == fim.normalize() else fim + pd.Timedelta(seconds=1)
+        else:
+            fim_exclusivo = pd.Timestamp(periodo['fim']) + pd.Timedelta(seconds=1)
+
+        filtros = [{'abertura_de': de, 'abertura_ate': ate}
+                   for de, ate in dividir_periodo(inicio, fim_exclusivo,
+                                                  concorrencia * FATIAS_POR_TAREFA)]
+        if data_inicio is None and data_fim is None:
+            # Sem período, a listagem também traz os chamados sem abertura
+            filtros.append({'sem_abertura': 1})
+        estatisticas['fatias'] = len(filtros)
+
+        # ETAPA 2: tarefas que baixam as fatias, com a fila limitada
+        fatias = asyncio.Queue()
+        for filtro in filtros:
+            fatias.put_nowait(filtro)
+        paginas = asyncio.Queue(maxsize=concorrencia * 4)
+        url = f'{url_base}/chamados'
+
+        async def tarefa():
+            while not fatias.empty():
+                filtro = fatias.get_nowait()
+                await baixar_fatia(sessao, url, filtro, paginas, estatisticas,
+                                   tamanho_pagina, tentativas)
+
+        async def baixar_tudo():
+            try:
+                await asyncio.gather(*(tarefa() for _ in range(concorrencia)))
+            finally:
+                # None avisa o consumidor que acabou (também em caso de erro)
+                await paginas.put(None)
+
+        download = asyncio.create_task(baixar_tudo())
+
+        # ETAPA 3: junta as páginas em blocos e trata cada bloco em uma
+        # thread (o tratamento é CPU; o loop segue atendendo a rede)
+        try:
+            acumulado, linhas = [], 0
+            while True:
+                registros = await paginas.get()
+                if registros is not None:
+                    acumulado.extend(registros)
+                    linhas += len(registros)
+                    estatisticas['paginas'] += 1
+                if acumulado and (registros is None or linhas >= tamanho_bloco):
+                    bloco = pagina_para_dataframe(acumulado)
+                    acumulado, linhas = [], 0
+                    yield await asyncio.to_thread(tratar_dados, bloco, False)
+                if registros is None:
+                    break
+            # Repassa um erro do download (ex.: API fora do ar)
+            await download
+        finally:
+            if not download.done():
+                download.cancel()
+
+
+async def coletar_blocos(gerador):
+    """Junta os blocos de um gerador assíncrono em uma lista."""
+    return [bloco async for bloco in gerador]
+
+
+def carregar_da_api(url_base, data_inicio=None, data_fim=None,
+                    concorrencia=CONCORRENCIA_PADRAO, tamanho_pagina=TAMANHO_PAGINA_PADRAO,
+                    tamanho_bloco=TAMANHO_BLOCO_PADRAO, token=None, exibir_mensagens=True):
+    """
+    Baixa e trata os chamados da API (ETAPAS 3 e 4 sem CSV).
+
+    Parâmetros:
+        url_base (str): Endereço da API
+        data_inicio, data_fim: Período da data de abertura (fim inclusive)
+        concorrencia (int): Requisições e conexões simultâneas
+        tamanho_pagina (int): Chamados por página
+        tamanho_bloco (int): Chamados por bloco tratado
+        token (str): Token de acesso (None = variável HELPDESK_API_TOKEN)
+        exibir_mensagens (bool): Se False, não imprime o resumo
+
+    Retorna:
+        DataFrame: Dados tratados, ordenados por id_chamado
+    """
+    if exibir_mensagens:
+        print("\n" + "="*60)
+        print("🌐 INGESTÃO PELA API DO HELPDESK")
+        print("="*60)
+
+    if token is None:
+        token = os.environ.get('HELPDESK_API_TOKEN')
+
+    estatisticas = {}
+    inicio = time.perf_counter()
+    blocos = asyncio.run(coletar_blocos(blocos_da_api(
+        url_base, data_inicio, data_fim, concorrencia, tamanho_pagina, tamanho_bloco,
+        token, estatisticas=estatisticas,
+    )))
+    duracao = time.perf_counter() - inicio
+
+    if not blocos:
+        raise ValueError(f"A API {url_base} não devolveu nenhum chamado no período")
+
+    # As fatias chegam fora de ordem: a ordem final é a dos ids (como no export)
+    df = juntar_partes(blocos)
+    df = df.sort_values('id_chamado', kind='stable', ignore_index=True)
+
+    if exibir_mensagens:
+        print(f"   ✅ {len(df)} chamados em {estatisticas['paginas']} página(s), "
+              f"{estatisticas['fatias']} fatia(s), {concorrencia} conexão(ões)")
+        print(f"   ⏱️ {duracao:.1f}s ({len(df) / duracao:,.0f} chamados/s)")
+        if estatisticas['repeticoes']:
+            print(f"   🔁 {estatisticas['repeticoes']} requisição(ões) repetida(s) após falha")
+
+    return df
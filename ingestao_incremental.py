@@ -0,0 +1,481 @@
+"""
+==============================================================================
+INGESTÃO INCREMENTAL DE CHAMADOS
+==============================================================================
+Descrição: Processa apenas as linhas novas do CSV (o "final" do arquivo),
+           guardando entre uma execução e outra a posição já lida e os
+           acumuladores das métricas.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- Como ler um arquivo a partir de uma posição (seek / offset em bytes)
+- Como salvar e recuperar um estado em JSON
+- Como guardar listas grandes de ids em arquivos binários só de acréscimo
+- Como corrigir métricas quando um registro é atualizado
+==============================================================================
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from cache_colunar import gravar_snapshot, ler_snapshot, nome_cache
+from esquema_chamados import TIPOS_LEITURA
+from gerador_relatorio import (
+    COLUNAS_CONTAGEM,
+    TAMANHO_BLOCO_PADRAO,
+    acumular_bloco,
+    carregar_dados_em_blocos,
+    criar_estado_metricas,
+    finalizar_metricas,
+    tratar_dados,
+)
+
+# ==============================================================================
+# COMO FUNCIONA A INGESTÃO INCREMENTAL
+# ==============================================================================
+#
+# O helpdesk só ACRESCENTA linhas ao final do CSV. Então guardamos:
+# - 'offset': até qual byte do arquivo já processamos
+# - 'estado': os acumuladores das métricas (os mesmos do modo streaming)
+# - 'pendentes': chamados ainda não fechados, com a contribuição de cada um
+#
+# Na próxima execução, pulamos direto para o 'offset' e lemos só o final.
+#
+# E quando um chamado muda de status (Aberto → Fechado)?
+# O helpdesk acrescenta uma nova linha com o MESMO id_chamado. Se apenas
+# somássemos, o chamado seria contado duas vezes. Por isso, para cada id
+# que já está em 'pendentes', primeiro DESCONTAMOS a contribuição antiga
+# e só depois somamos a nova. A linha antiga passa a ser "substituída".
+#
+# Chamados fechados são considerados definitivos: uma nova linha para um
+# chamado já fechado é ignorada (e também marcada como substituída).
+# Para isso, guardamos em 'fechados' os ids de todos os chamados fechados.
+# (Não dá para usar "id menor que o maior já visto": o CSV não é ordenado
+# por id, e um chamado novo com id menor seria descartado por engano.)
+#
+# 'fechados' e 'substituidas' crescem com o histórico inteiro. Se fossem
+# para o JSON, cada execução regravaria milhões de números em texto, e o
+# custo deixaria de ser proporcional só à cauda nova. Por isso cada um fica
+# em um arquivo binário ao lado do JSON (int64, 8 bytes por número), no
+# qual só ACRESCENTAMOS os números novos. O JSON guarda quantos números do
+# arquivo valem: se a execução for interrompida depois de acrescentar e
+# antes de salvar o JSON, o que passou da conta é descartado na próxima.
+# Na memória eles são arrays numpy, e a busca é um isin vetorizado.
+#
+# E a aba Dados_Completos, que precisa de TODAS as linhas?
+# Cada bloco novo, já tratado, é gravado como uma "parte" em Arrow
+# (.cache_chamados/<csv>-<hash do caminho>_incremental_partes/). O relatório lê as partes
+# (sem read_csv nem tratar_dados) e só tira as linhas substituídas.
+# Escrever a aba continua custando o tamanho da base inteira (ela contém
+# todas as linhas), mas ler e tratar custa só o tamanho da cauda nova.
+# Quando há mais de MAXIMO_PARTES partes, elas são juntadas em uma só
+# (já sem as linhas substituídas), para não acumular arquivos pequenos.
+# Depois disso, 'substituidas' é esvaziado: as linhas já saíram das partes.
+
+# Versão 2: o estado das métricas passou a ter os sketches dos percentis
+# Versão 3: 'fechados' (ids fechados) no lugar de 'ultimo_id'
+# Versão 4: 'fechados' e 'substituidas' em arquivos binários fora do JSON
+# Versão 5: contagens na ordem da primeira aparição (desempate do relatório)
+VERSAO_ESTADO = 5
+
+# Listas de números guardadas fora do JSON (ver arquivo_ids)
+LISTAS_BINARIAS = ('fechados', 'substituidas')
+
+# Quantos bytes lemos de cada vez do final do arquivo (64 MB)
+TAMANHO_LEITURA_BYTES = 64 * 1024 * 1024
+
+# Quantos bytes antes do offset usamos para conferir se o arquivo
+# foi reescrito (em vez de apenas receber linhas novas)
+TAMANHO_CONFERENCIA = 4096
+
+# Acima de quantas partes tratadas elas são juntadas em uma só
+MAXIMO_PARTES = 16
+
+
+def caminho_estado_padrao(caminho_arquivo, pasta='.cache_chamados'):
+    """Caminho do arquivo JSON com o estado incremental de um CSV."""
+    return os.path.join(pasta, f'{nome_cache(caminho_arquivo)}_incremental.json')
+
+
+def arquivo_ids(caminho_estado, nome):
+    """Arquivo binário (int64) com uma das LISTAS_BINARIAS de um estado."""
+    return f'{os.path.splitext(caminho_estado)[0]}_{nome}.int64'
+
+
+def pasta_partes(caminho_estado):
+    """Pasta com as partes tratadas (Arrow) que acompanham um estado."""
+    return f'{os.path.splitext(caminho_estado)[0]}_partes'
+
+
+def criar_estado_incremental():
+    """
+    Cria um estado incremental vazio (nada processado ainda).
+
+    Retorna:
+        dict: Estado com offset zero e acumuladores zerados
+    """
+    return {
+        'versao': VERSAO_ESTADO,
+        'offset': 0,            # Bytes já processados (sempre em fim de linha)
+        'cabecalho': None,      # Primeira linha do CSV, para conferência
+        'conferencia': None,    # Hash dos últimos bytes antes do offset
+        'linhas': 0,            # Linhas de dados já lidas (numeração global)
+        # ids dos chamados já fechados (definitivos)
+        'fechados': np.array([], dtype='int64'),
+        'estado': criar_estado_metricas(),
+        # {id: {'linha': n, 'valores': {coluna: valor}}} dos chamados não fechados
+        'pendentes': {},
+        # Números das linhas que foram substituídas por uma versão mais nova
+        'substituidas': np.array([], dtype='int64'),
+        # Quantos números de cada lista já estão gravados no arquivo binário
+        'gravados': dict.fromkeys(LISTAS_BINARIAS, 0),
+        # Arquivos das partes tratadas, em ordem (None = sem pyarrow, sem partes)
+        'partes': [],
+    }
+
+
+def carregar_estado(caminho_estado):
+    """Lê o estado salvo (ou None se não existir ou for de outra versão)."""
+    try:
+        with open(caminho_estado, encoding='utf-8') as arquivo:
+            estado = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+    if estado.get('versao') != VERSAO_ESTADO:
+        return None
+    for nome in LISTAS_BINARIAS:
+        quantidade = estado['gravados'][nome]
+        try:
+            ids = np.fromfile(arquivo_ids(caminho_estado, nome), dtype='<i8', count=quantidade)
+        except OSError:
+            return None
+        if len(ids) < quantidade:
+            return None  # Arquivo binário incompleto: o estado não serve
+        estado[nome] = ids.astype('int64')
+    return estado
+
+
+def salvar_estado(estado, caminho_estado):
+    """Grava o estado de forma atômica (arquivo temporário + rename)."""
+    pasta = os.path.dirname(caminho_estado)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+
+    # Primeiro os números novos das listas binárias, depois o JSON que diz
+    # quantos valem: um JSON antigo nunca aponta para números que faltam
+    for nome in LISTAS_BINARIAS:
+        caminho_ids = arquivo_ids(caminho_estado, nome)
+        gravados = estado['gravados'][nome]
+        with open(caminho_ids, 'ab') as arquivo:
+            # Descarta o que uma execução interrompida acrescentou a mais
+            arquivo.truncate(gravados * 8)
+            estado[nome][gravados:].astype('<i8').tofile(arquivo)
+        estado['gravados'][nome] = len(estado[nome])
+
+    caminho_temporario = f'{caminho_estado}.{os.getpid()}.tmp'
+    with open(caminho_temporario, 'w', encoding='utf-8') as arquivo:
+        # dumps + write: o json.dump() em arquivo usa o codificador em Python
+        # puro, bem mais lento que o em C com muitos chamados pendentes
+        arquivo.write(json.dumps({chave: valor for chave, valor in estado.items()
+                                  if chave not in LISTAS_BINARIAS}, ensure_ascii=False))
+    os.replace(caminho_temporario, caminho_estado)
+
+
+def hash_conferencia(arquivo, offset):
+    """Hash dos bytes imediatamente anteriores ao offset."""
+    inicio = max(0, offset - TAMANHO_CONFERENCIA)
+    arquivo.seek(inicio)
+    return hashlib.sha256(arquivo.read(offset - inicio)).hexdigest()
+
+
+def estado_ainda_valido(estado, arquivo, tamanho_arquivo):
+    """
+    Confere se o arquivo só recebeu linhas novas desde a última execução.
+
+    Se o arquivo diminuiu, mudou de cabeçalho ou teve o trecho já processado
+    alterado, o estado salvo não serve mais e tudo é reprocessado.
+    """
+    if estado['offset'] == 0:
+        return True
+    if tamanho_arquivo < estado['offset']:
+        return False
+    arquivo.seek(0)
+    if arquivo.readline().decode('utf-8').rstrip('\r\n') != estado['cabecalho']:
+        return False
+    return hash_conferencia(arquivo, estado['offset']) == estado['conferencia']
+
+
+def ler_cauda_em_blocos(arquivo, offset, nomes_colunas, tamanho_bytes=TAMANHO_LEITURA_BYTES):
+    """
+    Lê o arquivo a partir do offset, em blocos de linhas completas.
+
+    Uma linha sem '\\n' no final pode estar sendo escrita neste momento
+    pelo helpdesk; ela fica para a próxima execução.
+
+    Parâmetros:
+        arquivo: Arquivo aberto em modo binário ('rb')
+        offset (int): Byte a partir do qual ler
+        nomes_colunas (list): Nomes das colunas (o cabeçalho não é relido)
+        tamanho_bytes (int): Quantidade aproximada de bytes por bloco
+
+    Retorna:
+        Gerador de tuplas (DataFrame bruto, offset logo após o bloco)
+    """
+    arquivo.seek(offset)
+    sobra = b''
+    while True:
+        pedaco = arquivo.read(tamanho_bytes)
+        if not pedaco:
+            return
+        dados = sobra + pedaco
+        fim = dados.rfind(b'\n') + 1
+        if fim == 0:
+            sobra = dados
+            continue
+        sobra = dados[fim:]
+        offset += fim
+        if not dados[:fim].strip():
+            continue  # Só linhas em branco
+        bloco = pd.read_csv(
+            io.BytesIO(dados[:fim]),
+            header=None,
+            names=nomes_colunas,
+            dtype=TIPOS_LEITURA,
+        )
+        yield bloco, offset
+
+
+def descontar_pendente(estado_metricas, pendente):
+    """
+    Remove dos acumuladores a contribuição de um chamado não fechado.
+
+    Chamados não fechados não têm tempo de atendimento, então basta
+    descontar o total e as contagens por dimensão.
+    """
+    estado_metricas['total_chamados'] -= 1
+    for chave, coluna in COLUNAS_CONTAGEM.items():
+        valor = pendente['valores'][coluna]
+        if valor is None:
+            continue
+        contagem = estado_metricas['contagens'][chave]
+        contagem[valor] -= 1
+        if contagem[valor] == 0:
+            del contagem[valor]
+
+
+def aplicar_bloco(estado, bloco_tratado):
+    """
+    Soma um bloco novo ao estado, corrigindo chamados atualizados.
+
+    Parâmetros:
+        estado (dict): Estado incremental
+        bloco_tratado (DataFrame): Bloco já tratado; o índice é o número
+                                   global da linha no arquivo
+
+    Retorna:
+        int: Quantidade de chamados corrigidos neste bloco
+    """
+    # Dentro do próprio bloco, a última linha de cada id é a que vale
+    repetidas = bloco_tratado['id_chamado'].duplicated(keep='last').to_numpy()
+    substituidas = [bloco_tratado.index.to_numpy()[repetidas]]
+    bloco_tratado = bloco_tratado[~repetidas]
+
+    pendentes = estado['pendentes']
+    ids = bloco_tratado['id_chamado'].to_numpy().astype('int64')
+    chaves = ids.astype(str)
+
+    # Atualização de um chamado não fechado: desconta a versão antiga
+    atualizados = np.isin(chaves, list(pendentes))
+    for chave_id in chaves[atualizados]:
+        pendente = pendentes.pop(chave_id)
+        descontar_pendente(estado['estado'], pendente)
+        substituidas.append([pendente['linha']])
+
+    # Nova linha de um chamado já fechado: fechado é definitivo
+    ignorados = np.isin(ids, estado['fechados'])
+    substituidas.append(bloco_tratado.index.to_numpy()[ignorados])
+    bloco_tratado = bloco_tratado[~ignorados]
+    acumular_bloco(estado['estado'], bloco_tratado)
+
+    # Guarda a contribuição dos chamados que ainda não foram fechados
+    sem_tempo = bloco_tratado['tempo_atendimento_horas'].isna()
+    abertos = bloco_tratado[sem_tempo]
+    colunas = list(COLUNAS_CONTAGEM.values())
+    # Uma lista por coluna (nulo vira None), juntadas por zip: sem iterrows
+    valores = [abertos[coluna].astype(object).where(abertos[coluna].notna(), None).tolist()
+               for coluna in colunas]
+    for chave_id, numero_linha, *valores_linha in zip(
+            abertos['id_chamado'].to_numpy().astype('int64').astype(str).tolist(),
+            abertos.index.tolist(), *valores):
+        pendentes[chave_id] = {'linha': numero_linha,
+                               'valores': dict(zip(colunas, valores_linha))}
+
+    # Fechados a partir de agora: novas linhas deles serão ignoradas
+    novos_fechados = bloco_tratado.loc[~sem_tempo, 'id_chamado'].to_numpy().astype('int64')
+    estado['fechados'] = np.concatenate([estado['fechados'], novos_fechados])
+    estado['substituidas'] = np.concatenate([estado['substituidas'],
+                                             *(np.asarray(n, dtype='int64') for n in substituidas)])
+
+    return int(atualizados.sum())
+
+
+def gravar_parte(estado, pasta, bloco_tratado):
+    """
+    Grava um bloco tratado como parte Arrow (o índice, número global da
+    linha, vira a coluna 'linha').
+
+    O nome vem da primeira linha do bloco: se uma execução for
+    interrompida antes de salvar o estado, a próxima regrava o mesmo
+    arquivo em vez de deixar uma parte órfã.
+    """
+    primeira = int(bloco_tratado.index[0]) if len(bloco_tratado) else 0
+    nome = f'linhas-{primeira:012d}.arrow'
+    os.makedirs(pasta, exist_ok=True)
+    gravar_snapshot(bloco_tratado.rename_axis('linha').reset_index(), os.path.join(pasta, nome))
+    estado['partes'].append(nome)
+
+
+def ler_parte(caminho_parte, substituidas):
+    """Lê uma parte tratada, sem as linhas substituídas."""
+    parte = ler_snapshot(caminho_parte).set_index('linha')
+    parte.index.name = None
+    return parte[~parte.index.isin(substituidas)]
+
+
+def compactar_partes(estado, pasta):
+    """
+    Junta todas as partes em uma só, já sem as linhas substituídas.
+    """
+    # Importado aqui porque atualizacao_ao_vivo usa funções deste módulo
+    from atualizacao_ao_vivo import juntar_partes
+
+    partes = [ler_parte(os.path.join(pasta, nome), estado['substituidas'])
+              for nome in estado['partes']]
+    indice = pd.Index([linha for parte in partes for linha in parte.index])
+    juntas = juntar_partes(partes)
+    juntas.index = indice
+
+    nomes_antigos = estado['partes']
+    estado['partes'] = []
+    gravar_parte(estado, pasta, juntas)
+    for nome in nomes_antigos:
+        if nome not in estado['partes']:
+            os.remove(os.path.join(pasta, nome))
+
+    # As linhas substituídas já não estão em parte nenhuma
+    estado['substituidas'] = np.array([], dtype='int64')
+    estado['gravados']['substituidas'] = 0
+
+
+def blocos_incrementais(caminho_arquivo, linhas_substituidas, tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+                        caminho_estado=None):
+    """
+    Todas as linhas tratadas (sem as substituídas), para a aba Dados_Completos.
+
+    Com as partes gravadas por atualizar_incremental(), nada do CSV é
+    relido nem tratado de novo. Sem elas (pyarrow não instalado), o CSV
+    inteiro é relido e tratado bloco a bloco.
+
+    Parâmetros:
+        caminho_arquivo (str): Caminho para o arquivo CSV
+        linhas_substituidas (ndarray): Segundo valor devolvido por atualizar_incremental()
+        tamanho_bloco (int): Linhas por bloco (só quando o CSV é relido)
+        caminho_estado (str): Onde está o estado (padrão: .cache_chamados/)
+
+    Retorna:
+        Gerador de DataFrames tratados
+    """
+    if caminho_estado is None:
+        caminho_estado = caminho_estado_padrao(caminho_arquivo)
+    estado = carregar_estado(caminho_estado)
+
+    if estado is None or estado['partes'] is None:
+        for bloco in carregar_dados_em_blocos(caminho_arquivo, tamanho_bloco):
+            yield tratar_dados(bloco[~bloco.index.isin(linhas_substituidas)],
+                               exibir_mensagens=False)
+        return
+
+    pasta = pasta_partes(caminho_estado)
+    for nome in estado['partes']:
+        yield ler_parte(os.path.join(pasta, nome), linhas_substituidas)
+
+
+def atualizar_incremental(caminho_arquivo, caminho_estado=None,
+                          tamanho_bytes=TAMANHO_LEITURA_BYTES):
+    """
+    Processa apenas as linhas novas do CSV e devolve as métricas atualizadas.
+
+    Parâmetros:
+        caminho_arquivo (str): Caminho para o arquivo CSV
+        caminho_estado (str): Onde salvar o estado (padrão: .cache_chamados/)
+        tamanho_bytes (int): Bytes lidos por bloco do final do arquivo
+
+    Retorna:
+        tuple: (métricas no formato de calcular_metricas,
+                array com os números das linhas substituídas que ainda
+                estão nas partes, ou no CSV quando não há partes)
+    """
+    print("\n" + "="*60)
+    print("🔁 INGESTÃO INCREMENTAL")
+    print("="*60)
+
+    if caminho_estado is None:
+        caminho_estado = caminho_estado_padrao(caminho_arquivo)
+
+    estado = carregar_estado(caminho_estado) or criar_estado_incremental()
+    tamanho_arquivo = os.path.getsize(caminho_arquivo)
+
+    with open(caminho_arquivo, 'rb') as arquivo:
+        if not estado_ainda_valido(estado, arquivo, tamanho_arquivo):
+            print("   ⚠️ O arquivo foi reescrito: reprocessando desde o início")
+            estado = criar_estado_incremental()
+
+        pasta = pasta_partes(caminho_estado)
+        if estado['offset'] == 0:
+            # Do início: as partes de um processamento anterior não valem mais
+            shutil.rmtree(pasta, ignore_errors=True)
+            try:
+                import pyarrow  # só verificamos se está instalado
+            except ImportError:
+                estado['partes'] = None
+            arquivo.seek(0)
+            linha_cabecalho = arquivo.readline()
+            estado['cabecalho'] = linha_cabecalho.decode('utf-8').rstrip('\r\n')
+            estado['offset'] = len(linha_cabecalho)
+
+        nomes_colunas = estado['cabecalho'].split(',')
+        bytes_iniciais = estado['offset']
+        linhas_novas = 0
+        corrigidos = 0
+
+        for bloco, novo_offset in ler_cauda_em_blocos(arquivo, estado['offset'],
+                                                      nomes_colunas, tamanho_bytes):
+            # Numeração global das linhas: continua de onde parou
+            bloco.index = pd.RangeIndex(estado['linhas'], estado['linhas'] + len(bloco))
+            bloco_tratado = tratar_dados(bloco, exibir_mensagens=False)
+            if estado['partes'] is not None:
+                gravar_parte(estado, pasta, bloco_tratado)
+            corrigidos += aplicar_bloco(estado, bloco_tratado)
+
+            estado['linhas'] += len(bloco)
+            estado['offset'] = novo_offset
+            linhas_novas += len(bloco)
+
+        estado['conferencia'] = hash_conferencia(arquivo, estado['offset'])
+
+    if estado['partes'] is not None and len(estado['partes']) > MAXIMO_PARTES:
+        compactar_partes(estado, pasta)
+
+    salvar_estado(estado, caminho_estado)
+
+    print(f"   Bytes novos lidos: {estado['offset'] - bytes_iniciais}")
+    print(f"   Linhas novas: {linhas_novas}")
+    print(f"   Chamados corrigidos (mudança de status): {corrigidos}")
+    print(f"   Total de chamados: {estado['estado']['total_chamados']}")
+
+    return finalizar_metricas(estado['estado']), estado['substituidas']
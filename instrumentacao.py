@@ -0,0 +1,231 @@
+"""
+==============================================================================
+INSTRUMENTAÇÃO DAS ETAPAS DO RELATÓRIO
+==============================================================================
+Descrição: Mede cada etapa do processamento (e cada aba do Excel): tempo de
+           relógio, tempo de CPU, pico de memória e quantidade de linhas.
+           O resultado é gravado em um arquivo JSON (o "rastro") e,
+           opcionalmente, em um perfil do cProfile.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- A diferença entre tempo de relógio (wall time) e tempo de CPU
+- Como usar um gerenciador de contexto ('with') para medir um trecho
+- Como gerar um perfil com cProfile e abri-lo com pstats
+==============================================================================
+"""
+
+import contextlib
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime
+
+# ==============================================================================
+# COMO FUNCIONA A INSTRUMENTAÇÃO
+# ==============================================================================
+#
+# O código do relatório marca cada etapa assim:
+#
+#   with instrumentacao.etapa('tratar_dados') as registro:
+#       df_tratado = tratar_dados(df)
+#       registro['linhas'] = len(df_tratado)
+#
+# DESLIGADA (padrão): etapa() devolve um contexto vazio. Não mede nada,
+# não guarda nada: o custo é uma chamada de função por etapa.
+#
+# LIGADA (iniciar_rastreamento): cada etapa guarda
+# - tempo_s:  tempo de relógio (inclui esperar o disco)
+# - cpu_s:    tempo que o processador trabalhou para este processo
+#             (se cpu_s for bem menor que tempo_s, a etapa esperou E/S)
+# - memoria_pico_mb: maior memória alocada durante a etapa, acima da que
+#             já existia no início dela (tracemalloc)
+# - linhas:   quantidade de linhas processadas, quando a etapa informa
+#
+# Etapas podem ficar uma dentro da outra (as abas dentro do Excel);
+# o campo 'pai' indica a etapa de fora.
+
+# Registro usado quando a instrumentação está desligada (nada é lido dele)
+REGISTRO_DESLIGADO = {}
+
+# Contexto vazio reaproveitado por todas as etapas quando está desligada
+CONTEXTO_DESLIGADO = contextlib.nullcontext(REGISTRO_DESLIGADO)
+
+# Rastreamento ativo (None = desligado)
+_rastreamento = None
+
+
+def iniciar_rastreamento(arquivo_rastro='rastro_relatorio.json', arquivo_perfil=None,
+                         medir_memoria=True):
+    """
+    Liga a instrumentação.
+
+    Parâmetros:
+        arquivo_rastro (str): JSON de saída com as medidas de cada etapa
+        arquivo_perfil (str): Se informado, grava também um perfil do cProfile
+                              (abrir com: python -m pstats arquivo)
+        medir_memoria (bool): Liga o tracemalloc (deixa o código mais lento)
+    """
+    global _rastreamento
+
+    perfil = None
+    if arquivo_perfil:
+        perfil = cProfile.Profile()
+        perfil.enable()
+
+    # Só desligamos o tracemalloc no final se fomos nós que o ligamos
+    ligou_tracemalloc = medir_memoria and not tracemalloc.is_tracing()
+    if ligou_tracemalloc:
+        tracemalloc.start()
+
+    _rastreamento = {
+        'arquivo_rastro': arquivo_rastro,
+        'arquivo_perfil': arquivo_perfil,
+        'perfil': perfil,
+        'medir_memoria': medir_memoria,
+        'ligou_tracemalloc': ligou_tracemalloc,
+        'inicio': datetime.now().isoformat(timespec='seconds'),
+        'relogio_inicio': time.perf_counter(),
+        'cpu_inicio': time.process_time(),
+        'etapas': [],
+        'pilha': [],   # etapas abertas no momento (para saber o 'pai')
+    }
+
+
+def finalizar_rastreamento():
+    """
+    Desliga a instrumentação e grava o rastro (e o perfil, se pedido).
+
+    Retorna:
+        dict: O rastro gravado (ou None se a instrumentação estava desligada)
+    """
+    global _rastreamento
+
+    if _rastreamento is None:
+        return None
+    rastreamento, _rastreamento = _rastreamento, None
+
+    if rastreamento['perfil'] is not None:
+        rastreamento['perfil'].disable()
+        criar_pasta_do_arquivo(rastreamento['arquivo_perfil'])
+        rastreamento['perfil'].dump_stats(rastreamento['arquivo_perfil'])
+
+    if rastreamento['ligou_tracemalloc']:
+        tracemalloc.stop()
+
+    rastro = {
+        'inicio': rastreamento['inicio'],
+        'tempo_total_s': round(time.perf_counter() - rastreamento['relogio_inicio'], 6),
+        'cpu_total_s': round(time.process_time() - rastreamento['cpu_inicio'], 6),
+        'perfil': rastreamento['arquivo_perfil'],
+        'etapas': rastreamento['etapas'],
+    }
+
+    criar_pasta_do_arquivo(rastreamento['arquivo_rastro'])
+    with open(rastreamento['arquivo_rastro'], 'w', encoding='utf-8') as arquivo:
+        json.dump(rastro, arquivo, ensure_ascii=False, indent=2)
+
+    return rastro
+
+
+def descartar_rastreamento():
+    """
+    Desliga a instrumentação sem gravar nada.
+
+    Usado como 'initializer' dos pools de processos: no Linux os processos
+    filhos nascem como cópia do pai (fork) e herdariam o cProfile e o
+    tracemalloc ligados, ficando mais lentos sem que ninguém leia o resultado.
+    """
+    global _rastreamento
+
+    if _rastreamento is None:
+        return
+    rastreamento, _rastreamento = _rastreamento, None
+    if rastreamento['perfil'] is not None:
+        rastreamento['perfil'].disable()
+    if rastreamento['ligou_tracemalloc']:
+        tracemalloc.stop()
+
+
+def criar_pasta_do_arquivo(caminho):
+    """Cria a pasta de um arquivo de saída, se ela ainda não existir."""
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+
+
+def etapa(nome, linhas=None):
+    """
+    Marca um trecho do processamento como uma etapa medida.
+
+    Parâmetros:
+        nome (str): Nome da etapa no rastro
+        linhas (int): Linhas processadas, se já conhecidas no início
+                      (também podem ser informadas depois, em registro['linhas'])
+
+    Retorna:
+        Gerenciador de contexto que entrega o registro (dict) da etapa
+    """
+    if _rastreamento is None:
+        return CONTEXTO_DESLIGADO
+    return _medir_etapa(_rastreamento, nome, linhas)
+
+
+@contextlib.contextmanager
+def _medir_etapa(rastreamento, nome, linhas):
+    """Mede a etapa e guarda o registro no rastreamento ativo."""
+    pilha = rastreamento['pilha']
+    medir_memoria = rastreamento['medir_memoria']
+
+    registro = {
+        'nome': nome,
+        'pai': pilha[-1]['nome'] if pilha else None,
+        'linhas': linhas,
+    }
+    rastreamento['etapas'].append(registro)
+
+    memoria_inicio = 0
+    if medir_memoria:
+        memoria_atual, pico_ate_agora = tracemalloc.get_traced_memory()
+        if pilha:
+            # O pico da etapa de fora até aqui não pode se perder no reset
+            pilha[-1]['_pico'] = max(pilha[-1]['_pico'], pico_ate_agora)
+        tracemalloc.reset_peak()
+        memoria_inicio = memoria_atual
+    registro['_pico'] = memoria_inicio
+    registro['_memoria_inicio'] = memoria_inicio
+
+    pilha.append(registro)
+    relogio = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        yield registro
+    finally:
+        registro['tempo_s'] = round(time.perf_counter() - relogio, 6)
+        registro['cpu_s'] = round(time.process_time() - cpu, 6)
+        pilha.pop()
+
+        pico = registro.pop('_pico')
+        inicio = registro.pop('_memoria_inicio')
+        if medir_memoria:
+            pico = max(pico, tracemalloc.get_traced_memory()[1])
+            registro['memoria_pico_mb'] = round((pico - inicio) / 1024 / 1024, 3)
+            if pilha:
+                pilha[-1]['_pico'] = max(pilha[-1]['_pico'], pico)
+
+
+def exibir_resumo(rastro):
+    """Imprime uma tabela com as etapas do rastro."""
+    print("\n" + "="*60)
+    print("⏱️ TEMPO POR ETAPA")
+    print("="*60)
+    print(f"   {'etapa':<34}{'tempo (s)':>10}{'cpu (s)':>10}{'pico (MB)':>11}{'linhas':>12}")
+    for registro in rastro['etapas']:
+        nome = ('  ' if registro['pai'] else '') + registro['nome']
+        pico = registro.get('memoria_pico_mb')
+        linhas = registro['linhas']
+        print(f"   {nome:<34}{registro['tempo_s']:>10.3f}{registro['cpu_s']:>10.3f}"
+              f"{'' if pico is None else f'{pico:.1f}':>11}"
+              f"{'' if linhas is None else linhas:>12}")
+    print(f"   {'TOTAL':<34}{rastro['tempo_total_s']:>10.3f}{rastro['cpu_total_s']:>10.3f}")
@@ -0,0 +1,224 @@
+"""
+==============================================================================
+LEITURA DE UMA PASTA DE ARQUIVOS PARTICIONADOS POR MÊS
+==============================================================================
+Descrição: Lê o histórico de chamados exportado como um arquivo por mês
+           (CSV ou Parquet). Só os meses que cruzam o período pedido são
+           lidos ("poda de partições"), e os arquivos são lidos em paralelo,
+           um por processo.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- O que é particionar dados por data e por que isso economiza leitura
+- Como reconhecer a data de um arquivo pelo nome (expressões regulares)
+- Como usar vários núcleos do processador (ProcessPoolExecutor)
+==============================================================================
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+import instrumentacao
+from esquema_chamados import COLUNAS_CATEGORICAS, TIPOS_LEITURA, ler_csv_chamados
+
+# ==============================================================================
+# COMO FUNCIONA A LEITURA PARTICIONADA
+# ==============================================================================
+#
+# Cada arquivo da pasta guarda os chamados ABERTOS em um mês. O mês vem
+# do nome do arquivo (ou da pasta), em um destes formatos:
+#
+#   historico/chamados_2024-01.csv          (AAAA-MM no nome)
+#   historico/2024_02.parquet               (AAAA_MM no nome)
+#   historico/ano=2024/mes=03/dados.csv     (pastas "ano=" e "mes=")
+#
+# Para um relatório dos últimos 30 dias, só 1 ou 2 arquivos cruzam o
+# período: os outros nem são abertos. É a "poda" (pruning) de partições.
+#
+# Os arquivos escolhidos são lidos ao mesmo tempo, cada um em um processo
+# (um núcleo do processador). Depois, tudo vira um único DataFrame e segue
+# para o tratar_dados() normalmente.
+
+EXTENSOES_SUPORTADAS = ('.csv', '.parquet')
+
+# AAAA-MM, AAAA_MM ou AAAAMM no nome do arquivo
+PADRAO_NOME = re.compile(r'(?<!\d)(\d{4})[-_]?(\d{2})(?!\d)')
+
+# Pastas no estilo "hive": ano=2024/mes=01 (ou year=/month=)
+PADRAO_PASTAS = re.compile(r'(?:ano|year)=(\d{4}).*?(?:mes|month)=(\d{1,2})(?!\d)')
+
+
+def mes_da_particao(caminho_relativo):
+    """
+    Descobre o mês de um arquivo pelo caminho.
+
+    Parâmetros:
+        caminho_relativo (str): Caminho do arquivo dentro da pasta
+
+    Retorna:
+        Timestamp: Primeiro dia do mês (ou None se o caminho não tem data)
+    """
+    caminho = caminho_relativo.replace(os.sep, '/')
+    encontrado = PADRAO_PASTAS.search(caminho) or PADRAO_NOME.search(os.path.basename(caminho))
+    if encontrado is None:
+        return None
+    ano, mes = int(encontrado.group(1)), int(encontrado.group(2))
+    if not 1 <= mes <= 12:
+        return None
+    return pd.Timestamp(year=ano, month=mes, day=1)
+
+
+def listar_particoes(pasta):
+    """
+    Lista os arquivos de partição de uma pasta (inclusive subpastas).
+
+    Parâmetros:
+        pasta (str): Pasta com os arquivos mensais
+
+    Retorna:
+        list: Dicionários {'caminho', 'inicio', 'fim'}, em ordem de mês;
+              'fim' é o primeiro dia do mês seguinte (intervalo [inicio, fim))
+    """
+    particoes = []
+    for raiz, _, arquivos in os.walk(pasta):
+        for nome in arquivos:
+            if not nome.lower().endswith(EXTENSOES_SUPORTADAS):
+                continue
+            caminho = os.path.join(raiz, nome)
+            inicio = mes_da_particao(os.path.relpath(caminho, pasta))
+            if inicio is None:
+                print(f"   ⚠️ Arquivo sem mês no nome, ignorado: {caminho}")
+                continue
+            particoes.append({
+                'caminho': caminho,
+                'inicio': inicio,
+                'fim': inicio + pd.offsets.MonthBegin(1),
+            })
+    return sorted(particoes, key=lambda particao: (particao['inicio'], particao['caminho']))
+
+
+def selecionar_particoes(particoes, data_inicio=None, data_fim=None):
+    """
+    Poda: mantém só as partições que cruzam o período [data_inicio, data_fim].
+
+    Parâmetros:
+        particoes (list): Resultado de listar_particoes()
+        data_inicio: Início do período (None = desde o começo)
+        data_fim: Fim do período, inclusive (None = até o fim)
+
+    Retorna:
+        list: Partições selecionadas
+    """
+    inicio = pd.Timestamp(data_inicio) if data_inicio is not None else None
+    fim = pd.Timestamp(data_fim) if data_fim is not None else None
+    return [
+        particao for particao in particoes
+        if (inicio is None or particao['fim'] > inicio)
+        and (fim is None or particao['inicio'] <= fim)
+    ]
+
+
+def ler_particao(caminho):
+    """
+    Lê um arquivo de partição (roda dentro de um processo do pool).
+
+    Retorna:
+        DataFrame: Dados brutos, com os mesmos tipos do CSV principal
+    """
+    if caminho.lower().endswith('.parquet'):
+        df = pd.read_parquet(caminho)
+        # Mesmos tipos de leitura do CSV (id em int32, texto em categoria)
+        return df.astype({coluna: tipo for coluna, tipo in TIPOS_LEITURA.items()
+                          if coluna in df.columns})
+    return ler_csv_chamados(caminho)
+
+
+def unificar_categorias(partes):
+    """
+    Deixa as colunas categóricas de todas as partes com as mesmas categorias.
+
+    Sem isso, pd.concat() de categóricas diferentes vira texto (object),
+    e a economia de memória do esquema se perde.
+    """
+    for coluna in COLUNAS_CATEGORICAS:
+        series = [parte[coluna] for parte in partes if coluna in parte.columns]
+        if not series:
+            continue
+        categorias = union_categoricals(
+            [serie.astype('category') for serie in series], ignore_order=True
+        ).categories
+        for parte in partes:
+            if coluna in parte.columns:
+                parte[coluna] = parte[coluna].astype('category').cat.set_categories(categorias)
+    return partes
+
+
+def carregar_particoes(pasta, data_inicio=None, data_fim=None, max_processos=None):
+    """
+    Carrega só as partições do período pedido, lendo em paralelo.
+
+    Parâmetros:
+        pasta (str): Pasta com os arquivos mensais (CSV ou Parquet)
+        data_inicio: Início do período (None = desde o começo)
+        data_fim: Fim do período, inclusive (None = até o fim)
+        max_processos (int): Processos no pool (None = um por núcleo)
+
+    Retorna:
+        DataFrame: Dados brutos das partições selecionadas (ainda não tratados)
+    """
+    print("\n" + "="*60)
+    print("🗂️ LEITURA PARTICIONADA")
+    print("="*60)
+
+    particoes = listar_particoes(pasta)
+    selecionadas = selecionar_particoes(particoes, data_inicio, data_fim)
+    print(f"   Partições na pasta: {len(particoes)}")
+    print(f"   Partições no período: {len(selecionadas)} (as outras nem são abertas)")
+
+    if not selecionadas:
+        raise FileNotFoundError(f"Nenhuma partição de '{pasta}' cruza o período pedido")
+
+    caminhos = [particao['caminho'] for particao in selecionadas]
+    if len(caminhos) == 1:
+        # Um arquivo só: abrir um processo custaria mais do que ler direto
+        partes = [ler_particao(caminhos[0])]
+    else:
+        processos = min(len(caminhos), max_processos or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=processos,
+                                 initializer=instrumentacao.descartar_rastreamento) as pool:
+            # map() devolve os resultados na mesma ordem dos caminhos
+            partes = list(pool.map(ler_particao, caminhos))
+
+    df = pd.concat(unificar_categorias(partes), ignore_index=True)
+    print(f"   ✅ {len(df)} registros carregados")
+    return df
+
+
+def filtrar_periodo(df, data_inicio=None, data_fim=None):
+    """
+    Mantém só os chamados abertos dentro do período (depois do tratamento).
+
+    As partições são mensais, então o primeiro e o último mês podem trazer
+    dias fora do período; este filtro corta exatamente nas datas pedidas.
+
+    Parâmetros:
+        df (DataFrame): Dados tratados (data_abertura já em datetime)
+        data_inicio: Início do período (None = sem limite)
+        data_fim: Fim do período, inclusive (None = sem limite)
+
+    Retorna:
+        DataFrame: Chamados do período
+    """
+    mascara = pd.Series(True, index=df.index)
+    if data_inicio is not None:
+        mascara &= df['data_abertura'] >= pd.Timestamp(data_inicio)
+    if data_fim is not None:
+        fim = pd.Timestamp(data_fim)
+        if fim == fim.normalize():
+            # Só a data (sem hora): inclui o dia inteiro
+            fim = fim + pd.Timedelta(days=1) - pd.Timedelta(1, unit='ns')
+        mascara &= df['data_abertura'] <= fim
+    return df[mascara].reset_index(drop=True)
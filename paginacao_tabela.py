@@ -0,0 +1,143 @@
+"""
+==============================================================================
+PAGINAÇÃO DA TABELA DE DADOS DO DASHBOARD
+==============================================================================
+Descrição: Mostra a tabela de chamados página por página. A ordem das
+           linhas (mais recentes primeiro) é calculada uma vez por versão
+           dos dados; a cada clique só a página visível, com as colunas
+           escolhidas, é montada e enviada ao navegador.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- O que é paginação "no servidor" e por que ela é necessária
+- Como reaproveitar uma ordenação (argsort) em vez de ordenar sempre
+- Como aplicar um filtro sem desfazer uma ordem já calculada
+==============================================================================
+"""
+
+import numpy as np
+
+# ==============================================================================
+# COMO FUNCIONA A PAGINAÇÃO
+# ==============================================================================
+#
+# Antes, a cada interação:
+#   df_filtrado.sort_values('data_abertura')  → ordena TODAS as linhas
+#   st.dataframe(...)                         → envia TODAS ao navegador
+# Com centenas de milhares de chamados, a página travava.
+#
+# Agora:
+# 1. ORDEM (uma vez por versão dos dados): 'ordem' é a lista de posições
+#    das linhas, da abertura mais recente para a mais antiga.
+#
+#       ordem = [7, 2, 9, 0, ...]   (a linha 7 é a mais recente)
+#
+# 2. FILTRO (a cada mudança de filtro): o bitmap dos filtros diz quais
+#    linhas ficam. Olhando o bitmap NA ORDEM da lista, as posições
+#    selecionadas já saem ordenadas, sem ordenar de novo.
+#
+# 3. PÁGINA (a cada clique): só as linhas de uma página (ex.: 50) e só as
+#    colunas escolhidas são copiadas e enviadas ao navegador.
+
+TAMANHOS_PAGINA = [25, 50, 100, 500]
+
+
+def construir_ordem(df, coluna='data_abertura', decrescente=True):
+    """
+    Calcula a ordem de exibição das linhas (uma única vez).
+
+    Parâmetros:
+        df (DataFrame): Dados tratados
+        coluna (str): Coluna usada na ordenação
+        decrescente (bool): Se True, os maiores valores (mais recentes) primeiro
+
+    Retorna:
+        array: Posições das linhas na ordem de exibição; valores nulos
+               ficam no final, como no sort_values()
+    """
+    serie = df[coluna]
+    nulos = serie.isna().to_numpy()
+    posicoes = np.flatnonzero(~nulos)
+    valores = serie.to_numpy()[posicoes]
+
+    # argsort estável: linhas com o mesmo valor mantêm a ordem do arquivo
+    if decrescente:
+        # Ordena a lista invertida e desinverte o resultado: fica do maior
+        # para o menor, e os empates continuam na ordem do arquivo
+        ordem = posicoes[::-1][np.argsort(valores[::-1], kind='stable')][::-1]
+    else:
+        ordem = posicoes[np.argsort(valores, kind='stable')]
+    return np.concatenate([ordem, np.flatnonzero(nulos)])
+
+
+def anexar_ordem(ordem, df, primeira_nova, coluna='data_abertura', decrescente=True):
+    """
+    Intercala linhas novas (no final de df) em uma ordem já calculada.
+
+    Em vez de ordenar tudo de novo, ordenamos só as linhas novas e
+    procuramos, com busca binária, onde cada uma entra na ordem antiga.
+    Empates ficam com as linhas antigas primeiro (ordem do arquivo),
+    exatamente como em construir_ordem() sobre a base inteira.
+
+    Parâmetros:
+        ordem (array): Ordem das linhas antigas (0 a primeira_nova - 1)
+        df (DataFrame): Dados com as linhas antigas e as novas
+        primeira_nova (int): Posição da primeira linha nova
+        coluna (str): Coluna usada na ordenação
+        decrescente (bool): Se True, os maiores valores primeiro
+
+    Retorna:
+        array: Ordem de todas as linhas de df
+    """
+    novas = construir_ordem(df.iloc[primeira_nova:], coluna, decrescente) + primeira_nova
+    serie = df[coluna]
+    nulos = serie.isna().to_numpy()
+    valores = serie.to_numpy()
+
+    # Os nulos ficam no final: antigos primeiro, depois os novos
+    antigas, antigas_nulas = ordem[~nulos[ordem]], ordem[nulos[ordem]]
+    novas, novas_nulas = novas[~nulos[novas]], novas[nulos[novas]]
+
+    chaves_antigas = valores[antigas]
+    if decrescente:
+        # Cada nova entra depois de todas as antigas com valor >= ao dela
+        posicoes = len(antigas) - np.searchsorted(chaves_antigas[::-1], valores[novas], side='left')
+    else:
+        posicoes = np.searchsorted(chaves_antigas, valores[novas], side='right')
+    return np.concatenate([np.insert(antigas, posicoes, novas), antigas_nulas, novas_nulas])
+
+
+def filtrar_ordem(ordem, linhas_selecionadas):
+    """
+    Mantém, na ordem de exibição, só as linhas selecionadas pelos filtros.
+
+    Parâmetros:
+        ordem (array): Resultado de construir_ordem()
+        linhas_selecionadas (array): Máscara booleana (uma posição por linha)
+
+    Retorna:
+        array: Posições selecionadas, já ordenadas (sem ordenar de novo)
+    """
+    return ordem[linhas_selecionadas[ordem]]
+
+
+def quantidade_paginas(total_linhas, tamanho_pagina):
+    """Quantas páginas são necessárias (pelo menos 1, mesmo sem linhas)."""
+    return max(1, -(-total_linhas // tamanho_pagina))
+
+
+def montar_pagina(df, linhas_ordenadas, pagina, tamanho_pagina, colunas):
+    """
+    Monta só a página pedida, com as colunas escolhidas.
+
+    Parâmetros:
+        df (DataFrame): Dados tratados (completos)
+        linhas_ordenadas (array): Resultado de filtrar_ordem()
+        pagina (int): Número da página, começando em 1
+        tamanho_pagina (int): Linhas por página
+        colunas (list): Colunas exibidas
+
+    Retorna:
+        DataFrame: No máximo 'tamanho_pagina' linhas
+    """
+    inicio = (pagina - 1) * tamanho_pagina
+    return df[colunas].take(linhas_ordenadas[inicio:inicio + tamanho_pagina])
@@ -0,0 +1,195 @@
+"""
+==============================================================================
+UM RELATÓRIO POR SETOR (OU POR MÊS) EM UMA ÚNICA EXECUÇÃO
+==============================================================================
+Descrição: Carrega e trata os dados UMA vez e gera um relatório Excel para
+           cada setor (relatorio_TI.xlsx, relatorio_RH.xlsx, ...) ou para
+           cada mês (relatorio_2024-01.xlsx, ...). Os arquivos são gerados
+           ao mesmo tempo, em processos separados.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- Como dividir um DataFrame em grupos com groupby()
+- Como distribuir tarefas independentes em um pool de processos
+- Por que começar pelas tarefas maiores equilibra o trabalho
+==============================================================================
+"""
+
+import contextlib
+import io
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import instrumentacao
+from gerador_relatorio import calcular_metricas, gerar_relatorio_excel
+
+# ==============================================================================
+# COMO FUNCIONA O "FAN-OUT"
+# ==============================================================================
+#
+# Antes: um CSV filtrado por setor e uma execução do gerador para cada um.
+# O mesmo arquivo era lido e tratado 7 vezes.
+#
+# Agora:
+# 1. Lemos e tratamos a base uma vez só (no processo principal).
+# 2. Dividimos as linhas por setor (ou por mês de abertura).
+# 3. Cada grupo vira uma tarefa: calcular_metricas() + gerar_relatorio_excel(),
+#    exatamente as mesmas funções do relatório geral.
+# 4. As tarefas rodam em paralelo, uma por processo. Como escrever o .xlsx
+#    é a parte mais cara, o tempo total fica perto do tempo de escrita do
+#    maior grupo (dividido pelos núcleos disponíveis).
+#
+# As tarefas são enviadas da maior para a menor: se o maior grupo ficasse
+# para o final, todos os outros processos ficariam esperando por ele.
+
+# Agrupamentos disponíveis
+AGRUPAMENTOS = ('setor', 'mes')
+
+PASTA_RELATORIOS_PADRAO = 'relatorios'
+
+
+def nome_seguro(texto):
+    """
+    Transforma um valor (ex.: 'Operações / Norte') em parte de nome de arquivo.
+
+    Retorna:
+        str: Só letras sem acento, números, '-' e '_' (ex.: 'Operacoes_Norte')
+    """
+    sem_acento = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^A-Za-z0-9-]+', '_', sem_acento).strip('_') or 'sem_nome'
+
+
+def nomes_de_arquivo(nomes_grupos):
+    """
+    Um nome seguro e ÚNICO por grupo, para que um relatório não sobrescreva
+    outro.
+
+    Valores diferentes podem virar o mesmo nome ('Operações' e 'Operacoes'
+    → 'Operacoes'); do segundo em diante, o nome ganha um sufixo (_2, _3...).
+    Maiúsculas e minúsculas contam como iguais: no Windows e no macOS,
+    'relatorio_TI.xlsx' e 'relatorio_ti.xlsx' são o mesmo arquivo. Os
+    sufixos seguem a ordem alfabética dos valores (e não o tamanho dos
+    grupos), então cada grupo mantém o seu arquivo de uma execução para outra.
+
+    Parâmetros:
+        nomes_grupos (iterable): Valores dos grupos
+
+    Retorna:
+        dict: {valor do grupo: nome seguro}
+    """
+    usados = set()
+    nomes = {}
+    for nome_grupo in sorted(nomes_grupos):
+        base = nome_seguro(nome_grupo)
+        candidato, numero = base, 1
+        while candidato.lower() in usados:
+            numero += 1
+            candidato = f'{base}_{numero}'
+        usados.add(candidato.lower())
+        nomes[nome_grupo] = candidato
+    return nomes
+
+
+def dividir_por_grupo(df, por='setor'):
+    """
+    Divide os dados tratados em um DataFrame por grupo.
+
+    Parâmetros:
+        df (DataFrame): Dados tratados
+        por (str): 'setor' ou 'mes' (mês de abertura, no formato AAAA-MM)
+
+    Retorna:
+        dict: {nome do grupo: DataFrame}, do maior grupo para o menor
+    """
+    if por == 'setor':
+        chaves = df['setor']
+    elif por == 'mes':
+        chaves = df['data_abertura'].dt.strftime('%Y-%m')
+    else:
+        raise ValueError(f"Agrupamento desconhecido: {por} (use {', '.join(AGRUPAMENTOS)})")
+
+    sem_grupo = int(chaves.isna().sum())
+    if sem_grupo:
+        print(f"   ⚠️ {sem_grupo} chamado(s) sem {por} ficaram fora dos relatórios por grupo")
+
+    # observed=True: só os grupos que têm chamados (categorias vazias não geram arquivo)
+    grupos = {str(valor): grupo for valor, grupo in df.groupby(chaves, observed=True, sort=True)}
+    return dict(sorted(grupos.items(), key=lambda item: len(item[1]), reverse=True))
+
+
+def gerar_relatorio_grupo(nome_grupo, df_grupo, caminho):
+    """
+    Gera o relatório de um grupo (roda dentro de um processo do pool).
+
+    As mensagens das etapas são descartadas: com vários processos
+    escrevendo ao mesmo tempo, o terminal viraria uma mistura ilegível.
+
+    Retorna:
+        tuple: (nome do grupo, caminho, linhas, segundos)
+    """
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        metricas = calcular_metricas(df_grupo, exibir_mensagens=False)
+        gerar_relatorio_excel(df_grupo, metricas, caminho)
+    return nome_grupo, caminho, len(df_grupo), time.perf_counter() - inicio
+
+
+def gerar_relatorios_por_grupo(df, por='setor', pasta_saida=PASTA_RELATORIOS_PADRAO,
+                               max_processos=None):
+    """
+    Gera um relatório Excel por setor (ou por mês), em paralelo.
+
+    Parâmetros:
+        df (DataFrame): Dados tratados (carregados e tratados uma única vez)
+        por (str): 'setor' ou 'mes'
+        pasta_saida (str): Pasta dos arquivos relatorio_<grupo>.xlsx
+        max_processos (int): Processos no pool (None = um por núcleo)
+
+    Retorna:
+        list: Caminhos dos relatórios gerados, na ordem dos grupos
+    """
+    print("\n" + "="*60)
+    print(f"🗂️ RELATÓRIOS POR {por.upper()}")
+    print("="*60)
+
+    grupos = dividir_por_grupo(df, por)
+    if not grupos:
+        print("   Nenhum grupo com chamados: nada a gerar")
+        return []
+
+    os.makedirs(pasta_saida, exist_ok=True)
+    nomes = nomes_de_arquivo(grupos)
+    for nome, nome_arquivo in nomes.items():
+        if nome_arquivo != nome_seguro(nome):
+            print(f"   ⚠️ '{nome}' teria o mesmo nome de arquivo de outro grupo: "
+                  f"relatorio_{nome_arquivo}.xlsx")
+    tarefas = [
+        (nome, grupo, os.path.join(pasta_saida, f'relatorio_{nomes[nome]}.xlsx'))
+        for nome, grupo in grupos.items()
+    ]
+
+    inicio = time.perf_counter()
+    processos = min(len(tarefas), max_processos or os.cpu_count() or 1)
+    resultados = {}
+
+    if processos == 1:
+        # Um núcleo só: as mesmas tarefas, uma depois da outra
+        concluidos = (gerar_relatorio_grupo(*tarefa) for tarefa in tarefas)
+        for nome, caminho, linhas, segundos in concluidos:
+            resultados[nome] = caminho
+            print(f"   ✅ {caminho}: {linhas} chamados ({segundos:.2f}s)")
+    else:
+        with ProcessPoolExecutor(max_workers=processos,
+                                 initializer=instrumentacao.descartar_rastreamento) as pool:
+            # Tarefas já estão do maior grupo para o menor
+            futuros = [pool.submit(gerar_relatorio_grupo, *tarefa) for tarefa in tarefas]
+            for futuro in as_completed(futuros):
+                nome, caminho, linhas, segundos = futuro.result()
+                resultados[nome] = caminho
+                print(f"   ✅ {caminho}: {linhas} chamados ({segundos:.2f}s)")
+
+    print(f"   {len(resultados)} relatório(s) em {time.perf_counter() - inicio:.2f}s "
+          f"({processos} processo(s)) na pasta '{pasta_saida}'")
+    return [resultados[nome] for nome in grupos]
@@ -0,0 +1,248 @@
+"""
+==============================================================================
+BACKLOG AO LONGO DO TEMPO
+==============================================================================
+Descrição: Calcula quantos chamados estavam em aberto (backlog) no fim de
+           cada hora ou de cada dia, no total e por prioridade e setor.
+           Em vez de filtrar a base uma vez para cada instante, percorremos
+           os eventos (abertura = +1, fechamento = -1) em ordem de tempo,
+           somando um saldo acumulado.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- Como transformar intervalos (abertura → fechamento) em eventos
+- O que é uma soma acumulada (cumsum) e como ela substitui um laço
+- Como juntar resultados parciais de vários blocos de dados
+==============================================================================
+"""
+
+import numpy as np
+import pandas as pd
+
+from esquema_chamados import chave_ordenacao
+
+# ==============================================================================
+# COMO FUNCIONA A VARREDURA DE EVENTOS
+# ==============================================================================
+#
+# O jeito ingênuo: para cada dia, contar os chamados com
+# abertura <= dia < fechamento. Com 365 dias e 1 milhão de chamados
+# são 365 milhões de comparações (e com resolução por hora, 24x mais).
+#
+# O jeito com eventos: cada chamado gera no máximo dois eventos
+#
+#   abertura   → +1 no período em que foi aberto
+#   fechamento → -1 no período em que foi fechado
+#
+# Somamos o saldo (+1/-1) de cada período e fazemos a soma acumulada
+# em ordem de tempo. O valor acumulado no período P é exatamente quantos
+# chamados estavam abertos no FIM de P. Uma passada pelos eventos e uma
+# pelos períodos: o custo cresce com (chamados + períodos), não com o
+# produto dos dois.
+#
+# Chamados ainda abertos não têm evento de fechamento: continuam somando
+# +1 até o fim da série, que termina na data de referência (por padrão,
+# o último evento da base).
+#
+# Os saldos de blocos diferentes podem ser somados (combinar_eventos),
+# então o modo streaming monta a mesma série sem guardar as linhas.
+
+# Resoluções disponíveis: nome → frequência do Pandas
+FREQUENCIAS = {'hora': 'h', 'dia': 'D'}
+
+# Dimensões com série própria (além do total)
+DIMENSOES_BACKLOG = ['prioridade', 'setor']
+
+# Nome usado para a série total no lugar de uma dimensão
+TOTAL = 'Total'
+
+
+def periodos_inteiros(serie, largura):
+    """
+    Número do período (hora ou dia desde 1970) de cada data.
+
+    Parâmetros:
+        serie (Series): Datas (datetime)
+        largura (int): Tamanho do período em nanossegundos
+
+    Retorna:
+        tuple: (números dos períodos, máscara das datas não nulas)
+    """
+    datas = serie.to_numpy(dtype='datetime64[ns]')
+    validas = ~np.isnat(datas)
+    # Divisão inteira "para baixo": o mesmo corte de dt.floor()
+    return datas.view('int64') // largura, validas
+
+
+def contar_eventos(df, frequencia='D', dimensoes=DIMENSOES_BACKLOG):
+    """
+    Soma o saldo de aberturas (+1) e fechamentos (-1) de cada período.
+
+    Parâmetros:
+        df (DataFrame): Dados tratados (ou um bloco deles)
+        frequencia (str): 'D' (dia) ou 'h' (hora)
+        dimensoes (list): Colunas com série própria
+
+    Retorna:
+        DataFrame: [periodo, dimensao, valor, saldo], um por período com eventos
+    """
+    largura = pd.Timedelta(1, unit=frequencia).value
+    abertura, validas = periodos_inteiros(df['data_abertura'], largura)
+    fechamento, fechados = periodos_inteiros(df['data_fechamento'], largura)
+
+    # Sem abertura não há como saber desde quando o chamado está aberto
+    fechados &= validas
+    # Fechamento antes da abertura (erro de digitação) conta como fechado
+    # na própria abertura: o chamado não entra no backlog
+    fechamento = np.maximum(fechamento, abertura)
+
+    colunas = ['periodo', 'dimensao', 'valor', 'saldo']
+    if not validas.any():
+        return pd.DataFrame(columns=colunas)
+
+    # Períodos numerados a partir do primeiro do bloco
+    primeiro = int(abertura[validas].min())
+    quantidade = int(max(abertura[validas].max(),
+                         fechamento[fechados].max() if fechados.any() else primeiro)) - primeiro + 1
+
+    partes = []
+    for dimensao in [TOTAL] + list(dimensoes):
+        if dimensao == TOTAL:
+            codigos, categorias = np.ones(len(df), dtype=np.int64), pd.Index([TOTAL])
+        else:
+            coluna = df[dimensao].astype('category')
+            # +1: a posição 0 fica para os nulos (código -1 do Pandas)
+            codigos, categorias = coluna.cat.codes.to_numpy().astype(np.int64) + 1, coluna.cat.categories
+        grupos = len(categorias) + 1
+
+        # Uma posição por (período, valor): bincount conta aberturas e fechamentos
+        tamanho = quantidade * grupos
+        entradas = np.bincount((abertura[validas] - primeiro) * grupos + codigos[validas],
+                               minlength=tamanho)
+        saidas = np.bincount((fechamento[fechados] - primeiro) * grupos + codigos[fechados],
+                             minlength=tamanho)
+
+        # Só as posições com algum evento e com valor não nulo
+        posicoes = np.flatnonzero((entradas + saidas) > 0)
+        posicoes = posicoes[posicoes % grupos > 0]
+        partes.append(pd.DataFrame({
+            'periodo': ((posicoes // grupos + primeiro) * largura).astype('datetime64[ns]'),
+            'dimensao': dimensao,
+            'valor': categorias[posicoes % grupos - 1],
+            'saldo': entradas[posicoes] - saidas[posicoes],
+        }))
+
+    return pd.concat(partes, ignore_index=True)[colunas]
+
+
+def combinar_eventos(eventos, outros):
+    """
+    Junta os saldos de dois blocos (somando os períodos repetidos).
+
+    Parâmetros:
+        eventos (DataFrame): Saldos acumulados (ou None no primeiro bloco)
+        outros (DataFrame): Saldos do bloco novo
+
+    Retorna:
+        DataFrame: Saldos combinados, no formato de contar_eventos()
+    """
+    if eventos is None:
+        return outros
+    return (
+        pd.concat([eventos, outros], ignore_index=True)
+        .groupby(['periodo', 'dimensao', 'valor'], sort=False)['saldo']
+        .sum()
+        .reset_index()
+    )
+
+
+def eventos_para_dict(eventos):
+    """
+    Converte os saldos em um dicionário que cabe em JSON (datas em texto ISO).
+
+    Serve para juntar saldos calculados em outros processos ou máquinas.
+    """
+    return {
+        'periodo': [periodo.isoformat() for periodo in eventos['periodo']],
+        'dimensao': list(eventos['dimensao']),
+        'valor': list(eventos['valor']),
+        'saldo': [int(saldo) for saldo in eventos['saldo']],
+    }
+
+
+def eventos_de_dict(dados):
+    """Operação inversa de eventos_para_dict()."""
+    eventos = pd.DataFrame(dados, columns=['periodo', 'dimensao', 'valor', 'saldo'])
+    eventos['periodo'] = pd.to_datetime(eventos['periodo']).astype('datetime64[ns]')
+    eventos['saldo'] = eventos['saldo'].astype('int64')
+    return eventos
+
+
+def montar_serie_backlog(eventos, frequencia='D', referencia=None):
+    """
+    Transforma os saldos na série de backlog (soma acumulada no tempo).
+
+    Parâmetros:
+        eventos (DataFrame): Resultado de contar_eventos()/combinar_eventos()
+        frequencia (str): A mesma usada em contar_eventos()
+        referencia: Até quando a série vai (None = último evento). Chamados
+                    ainda abertos contam no backlog até esta data.
+
+    Retorna:
+        DataFrame: Índice 'periodo' (início de cada hora/dia) e uma coluna
+                   por (dimensao, valor), começando por (Total, Total);
+                   cada valor é o backlog no fim do período
+    """
+    if eventos is None or len(eventos) == 0:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name='periodo'))
+
+    tabela = eventos.pivot_table(index='periodo', columns=['dimensao', 'valor'],
+                                 values='saldo', aggfunc='sum', fill_value=0)
+
+    fim = tabela.index.max() if referencia is None else pd.Timestamp(referencia).floor(frequencia)
+    periodos = pd.date_range(tabela.index.min(), max(fim, tabela.index.min()),
+                             freq=frequencia, name='periodo')
+
+    # Períodos sem nenhum evento entram com saldo 0 (o backlog se mantém);
+    # a soma acumulada é feita antes do corte, para não perder eventos
+    todos = tabela.index.union(periodos)
+    serie = tabela.reindex(todos, fill_value=0).cumsum().reindex(periodos)
+
+    # Ordem das colunas: total, depois cada dimensão na ordem das categorias
+    dimensoes = list(dict.fromkeys(eventos['dimensao']))
+    ordem = [(TOTAL, TOTAL)] + [
+        (dimensao, valor)
+        for dimensao in dimensoes if dimensao != TOTAL
+        for valor in sorted(serie[dimensao].columns, key=chave_ordenacao(dimensao))
+    ]
+    return serie[ordem].astype('int64')
+
+
+def calcular_backlog(df, frequencia='D', dimensoes=DIMENSOES_BACKLOG, referencia=None):
+    """
+    Série de backlog de uma base inteira (contar + montar).
+
+    Parâmetros:
+        df (DataFrame): Dados tratados
+        frequencia (str): 'D' (dia) ou 'h' (hora)
+        dimensoes (list): Colunas com série própria
+        referencia: Até quando a série vai (None = último evento)
+
+    Retorna:
+        DataFrame: Série no formato de montar_serie_backlog()
+    """
+    return montar_serie_backlog(contar_eventos(df, frequencia, dimensoes), frequencia, referencia)
+
+
+def tabela_backlog(serie):
+    """
+    Achata as colunas da série para uma tabela simples (Excel, CSV).
+
+    Retorna:
+        DataFrame: Periodo, Backlog_Total, Prioridade_Baixa, ..., Setor_TI, ...
+    """
+    nomes = [
+        'Backlog_Total' if dimensao == TOTAL else f'{dimensao.capitalize()}_{valor}'
+        for dimensao, valor in serie.columns
+    ]
+    tabela = serie.set_axis(nomes, axis=1).reset_index()
+    return tabela.rename(columns={'periodo': 'Periodo'})
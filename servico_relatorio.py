@@ -0,0 +1,383 @@
+"""
+==============================================================================
+SERVIÇO DE RELATÓRIOS (PROCESSO RESIDENTE COM OS DADOS NA MEMÓRIA)
+==============================================================================
+Descrição: Um servidor HTTP local que carrega e trata os chamados UMA vez
+           e fica no ar respondendo pedidos: métricas em JSON e relatórios
+           Excel, com ou sem filtros. Respostas já calculadas ficam em
+           cache até os dados mudarem.
+
+Para executar:
+    python servico_relatorio.py --porta 8000
+
+    curl "http://localhost:8000/metricas?setor=TI"
+    curl -o relatorio.xlsx "http://localhost:8000/relatorio.xlsx?status=Aberto"
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- Por que um processo "quente" responde mais rápido que um script
+- Como montar um servidor HTTP só com a biblioteca padrão (http.server)
+- Como usar uma chave (filtros, versão dos dados) para invalidar o cache
+==============================================================================
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+
+from esquema_chamados import COLUNAS_CATEGORICAS
+from gerador_relatorio import (
+    calcular_metricas,
+    carregar_dados_com_cache,
+    gerar_relatorio_excel,
+    montar_tabelas_resumo,
+)
+from leitura_particionada import filtrar_periodo
+
+# ==============================================================================
+# COMO FUNCIONA O SERVIÇO
+# ==============================================================================
+#
+# Cada "python gerador_relatorio.py" paga sempre o mesmo preço: abrir o
+# interpretador, importar pandas/openpyxl, ler e tratar o CSV. Só depois
+# vem o trabalho que interessa.
+#
+# O serviço paga esse preço UMA vez e fica no ar:
+#
+#   GET /metricas?setor=TI          → métricas em JSON
+#   GET /relatorio.xlsx?setor=TI    → o relatório Excel completo
+#   GET /status                     → versão dos dados e tamanho dos caches
+#
+# Filtros aceitos: status, tipo_chamado, setor, prioridade, responsavel,
+# data_inicio e data_fim (período da abertura, fim inclusive).
+#
+# CACHE: a resposta de cada pedido fica guardada com a chave
+#
+#   (filtros, versão dos dados)
+#
+# e o mesmo pedido é respondido de novo em milissegundos. A VERSÃO é o
+# tamanho + mtime do CSV: a cada pedido, um os.stat() (barato) confere se
+# o arquivo mudou. Se mudou, os dados são recarregados e as chaves antigas
+# deixam de valer; se não, nada é relido.
+#
+# As planilhas ocupam memória (a aba Dados_Completos tem a base filtrada),
+# então guardamos só as MAXIMO_PLANILHAS_EM_CACHE mais recentes (LRU: a
+# usada há mais tempo sai primeiro; cada acerto a coloca no fim da fila).
+#
+# TRAVAS: o servidor atende cada pedido em uma thread. Para que uma
+# planilha lenta não segure os outros pedidos, há três tipos de trava:
+#
+#   trava_carga    só uma thread relê o CSV quando ele muda
+#   trava_cache    protege o cache e os contadores, por instantes
+#                  (nunca fica presa durante um cálculo)
+#   calculando     uma trava por resposta (tipo, chave): dois pedidos
+#                  iguais calculam uma vez só, pedidos diferentes
+#                  calculam ao mesmo tempo
+#
+# A versão e o DataFrame são trocados juntos, numa tupla ('dados'): quem
+# lê a tupla nunca vê dados novos com a versão antiga.
+
+CAMINHO_DADOS = 'chamados_ti.csv'
+
+PORTA_PADRAO = 8000
+
+# Filtros de período aceitos na URL (além das colunas categóricas)
+FILTROS_PERIODO = ('data_inicio', 'data_fim')
+
+# Quantas respostas de cada tipo ficam na memória
+MAXIMO_PLANILHAS_EM_CACHE = 16
+MAXIMO_METRICAS_EM_CACHE = 256
+
+TIPO_XLSX = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def assinatura_arquivo(caminho_arquivo):
+    """Versão dos dados: tamanho e mtime do CSV (sem ler o arquivo)."""
+    info = os.stat(caminho_arquivo)
+    return f'{info.st_size}-{info.st_mtime_ns}'
+
+
+def criar_servico(caminho_arquivo=CAMINHO_DADOS):
+    """
+    Cria o estado do serviço (os dados são carregados no primeiro pedido
+    ou em recarregar_se_mudou()).
+
+    Retorna:
+        dict: Estado compartilhado pelas threads do servidor
+    """
+    return {
+        'caminho': caminho_arquivo,
+        # (versão, DataFrame) da última carga, sempre lidos e trocados juntos
+        'dados': (None, None),
+        'carregado_em': None,
+        # Respostas prontas: (tipo, filtros, versão) → bytes
+        'cache': {'metricas': OrderedDict(), 'planilhas': OrderedDict()},
+        'limites': {'metricas': MAXIMO_METRICAS_EM_CACHE, 'planilhas': MAXIMO_PLANILHAS_EM_CACHE},
+        'acertos': 0,
+        'faltas': 0,
+        # Uma thread por vez recarrega os dados
+        'trava_carga': threading.Lock(),
+        # Protege 'cache', 'acertos', 'faltas' e 'calculando' (só por instantes)
+        'trava_cache': threading.Lock(),
+        # Respostas sendo calculadas: (tipo, chave) → trava própria
+        'calculando': {},
+    }
+
+
+def recarregar_se_mudou(servico):
+    """
+    Recarrega os dados se o CSV mudou desde a última carga.
+
+    Retorna:
+        tuple: (versão, DataFrame) atuais, da mesma carga
+    """
+    versao = assinatura_arquivo(servico['caminho'])
+    dados = servico['dados']
+    if versao == dados[0]:
+        return dados
+
+    with servico['trava_carga']:
+        dados = servico['dados']
+        if versao != dados[0]:  # outra thread pode ter recarregado
+            inicio = time.perf_counter()
+            df = carregar_dados_com_cache(servico['caminho'], exibir_mensagens=False)
+            dados = (versao, df)
+            with servico['trava_cache']:
+                # Troca tudo de uma vez: quem chegar agora já vê a versão nova
+                servico['dados'] = dados
+                servico['carregado_em'] = pd.Timestamp.now().isoformat(timespec='seconds')
+                for respostas in servico['cache'].values():
+                    respostas.clear()
+            print(f"🔄 Dados carregados: {len(df)} chamados em "
+                  f"{time.perf_counter() - inicio:.1f}s (versão {versao})")
+    return dados
+
+
+def ler_filtros(consulta):
+    """
+    Lê os filtros da URL (?setor=TI&data_inicio=2024-03-01).
+
+    Retorna:
+        tuple: Pares (nome, valor) em ordem, para servir de chave de cache
+
+    Levanta:
+        ValueError: Filtro desconhecido ou repetido
+    """
+    filtros = {}
+    for nome, valor in parse_qsl(consulta, keep_blank_values=True):
+        if nome not in COLUNAS_CATEGORICAS and nome not in FILTROS_PERIODO:
+            raise ValueError(f"Filtro desconhecido: {nome}")
+        if nome in filtros:
+            raise ValueError(f"Filtro repetido: {nome}")
+        if nome in FILTROS_PERIODO:
+            pd.Timestamp(valor)  # data inválida → ValueError
+        filtros[nome] = valor
+    return tuple(sorted(filtros.items()))
+
+
+def aplicar_filtros(df, filtros):
+    """Linhas que atendem aos filtros (colunas categóricas e período)."""
+    filtros = dict(filtros)
+    mascara = pd.Series(True, index=df.index)
+    for coluna in COLUNAS_CATEGORICAS:
+        if coluna in filtros:
+            mascara &= df[coluna] == filtros[coluna]
+    df = df[mascara] if not mascara.all() else df
+    if 'data_inicio' in filtros or 'data_fim' in filtros:
+        df = filtrar_periodo(df, filtros.get('data_inicio'), filtros.get('data_fim'))
+    return df
+
+
+def montar_json_metricas(metricas, filtros, versao):
+    """
+    Métricas em JSON: as mesmas tabelas das abas de resumo do Excel.
+
+    Retorna:
+        bytes: Documento JSON em UTF-8
+    """
+    tabelas = {
+        nome: json.loads(tabela.to_json(orient='records', date_format='iso', force_ascii=False))
+        for nome, tabela in montar_tabelas_resumo(metricas).items()
+    }
+    documento = {'versao': versao, 'filtros': dict(filtros),
+                 'total_chamados': metricas['total_chamados'], 'tabelas': tabelas}
+    return json.dumps(documento, ensure_ascii=False).encode('utf-8')
+
+
+def montar_planilha(df_filtrado, metricas):
+    """
+    Gera o relatório Excel na memória (sem arquivo em disco).
+
+    Retorna:
+        bytes: Conteúdo do .xlsx
+    """
+    destino = io.BytesIO()
+    # As mensagens das etapas são descartadas (o terminal é o log do servidor)
+    with contextlib.redirect_stdout(io.StringIO()):
+        gerar_relatorio_excel(df_filtrado, metricas, destino)
+    return destino.getvalue()
+
+
+def buscar_no_cache(servico, tipo, chave):
+    """Resposta guardada (ou None); um acerto a marca como a usada por último."""
+    with servico['trava_cache']:
+        respostas = servico['cache'][tipo]
+        resposta = respostas.get(chave)
+        if resposta is not None:
+            # LRU: a resposta vai para o fim da fila (a última a sair)
+            respostas.move_to_end(chave)
+            servico['acertos'] += 1
+        return resposta
+
+
+def obter_resposta(servico, tipo, filtros):
+    """
+    Devolve a resposta do cache ou calcula e guarda.
+
+    Parâmetros:
+        servico (dict): Resultado de criar_servico()
+        tipo (str): 'metricas' ou 'planilhas'
+        filtros (tuple): Resultado de ler_filtros()
+
+    Retorna:
+        tuple: (bytes da resposta, bool indicando se veio do cache)
+    """
+    versao, df = recarregar_se_mudou(servico)
+    chave = (filtros, versao)
+
+    resposta = buscar_no_cache(servico, tipo, chave)
+    if resposta is not None:
+        return resposta, True
+
+    with servico['trava_cache']:
+        trava = servico['calculando'].setdefault((tipo, chave), threading.Lock())
+
+    with trava:
+        # Outra thread pode ter calculado esta resposta enquanto esperávamos
+        resposta = buscar_no_cache(servico, tipo, chave)
+        if resposta is not None:
+            return resposta, True
+
+        try:
+            df_filtrado = aplicar_filtros(df, filtros)
+            metricas = calcular_metricas(df_filtrado, exibir_mensagens=False)
+            if tipo == 'metricas':
+                resposta = montar_json_metricas(metricas, filtros, versao)
+            else:
+                resposta = montar_planilha(df_filtrado, metricas)
+
+            with servico['trava_cache']:
+                servico['faltas'] += 1
+                # Se os dados mudaram durante o cálculo, a chave já não vale
+                if servico['dados'][0] == versao:
+                    respostas = servico['cache'][tipo]
+                    respostas[chave] = resposta
+                    # LRU: as respostas usadas há mais tempo saem primeiro
+                    while len(respostas) > servico['limites'][tipo]:
+                        respostas.popitem(last=False)
+        finally:
+            # Só depois de guardada: quem esperava esta trava acha a resposta pronta
+            with servico['trava_cache']:
+                servico['calculando'].pop((tipo, chave), None)
+    return resposta, False
+
+
+def criar_manipulador(servico):
+    """
+    Cria a classe que atende cada requisição HTTP (uma thread por pedido).
+
+    Retorna:
+        type: Subclasse de BaseHTTPRequestHandler ligada a este serviço
+    """
+    class Manipulador(BaseHTTPRequestHandler):
+        def enviar(self, status, corpo, tipo_conteudo, cabecalhos=None):
+            self.send_response(status)
+            self.send_header('Content-Type', tipo_conteudo)
+            self.send_header('Content-Length', str(len(corpo)))
+            for nome, valor in (cabecalhos or {}).items():
+                self.send_header(nome, valor)
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def enviar_json(self, status, documento):
+            corpo = json.dumps(documento, ensure_ascii=False).encode('utf-8')
+            self.enviar(status, corpo, 'application/json; charset=utf-8')
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            inicio = time.perf_counter()
+            try:
+                if url.path == '/status':
+                    versao, df = recarregar_se_mudou(servico)
+                    self.enviar_json(200, {
+                        'versao': versao,
+                        'linhas': len(df),
+                        'carregado_em': servico['carregado_em'],
+                        'em_cache': {tipo: len(respostas) for tipo, respostas in servico['cache'].items()},
+                        'acertos': servico['acertos'],
+                        'faltas': servico['faltas'],
+                    })
+                    return
+
+                if url.path == '/metricas':
+                    tipo, tipo_conteudo, cabecalhos = 'metricas', 'application/json; charset=utf-8', {}
+                elif url.path == '/relatorio.xlsx':
+                    tipo, tipo_conteudo = 'planilhas', TIPO_XLSX
+                    cabecalhos = {'Content-Disposition': 'attachment; filename="relatorio_ti.xlsx"'}
+                else:
+                    self.enviar_json(404, {'erro': f"Caminho desconhecido: {url.path}"})
+                    return
+
+                corpo, do_cache = obter_resposta(servico, tipo, ler_filtros(url.query))
+                cabecalhos['X-Cache'] = 'HIT' if do_cache else 'MISS'
+                cabecalhos['X-Tempo-Ms'] = f'{(time.perf_counter() - inicio) * 1000:.1f}'
+                self.enviar(200, corpo, tipo_conteudo, cabecalhos)
+            except ValueError as erro:
+                self.enviar_json(400, {'erro': str(erro)})
+
+    return Manipulador
+
+
+def iniciar_servico(caminho_arquivo=CAMINHO_DADOS, porta=PORTA_PADRAO, host='127.0.0.1'):
+    """
+    Carrega os dados e deixa o serviço no ar até Ctrl+C.
+
+    Parâmetros:
+        caminho_arquivo (str): CSV de chamados
+        porta (int): Porta HTTP
+        host (str): Endereço (127.0.0.1 = só esta máquina)
+    """
+    print("\n" + "="*60)
+    print("🛰️ SERVIÇO DE RELATÓRIOS")
+    print("="*60)
+
+    servico = criar_servico(caminho_arquivo)
+    # Carrega já na partida: o primeiro pedido não paga a leitura do CSV
+    recarregar_se_mudou(servico)
+
+    servidor = ThreadingHTTPServer((host, porta), criar_manipulador(servico))
+    print(f"🌐 No ar em http://{host}:{porta} (Ctrl+C para sair)")
+    print("   /metricas  /relatorio.xlsx  /status   (filtros: ?setor=TI&data_inicio=...)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Serviço encerrado")
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço de relatórios de suporte de TI")
+    parser.add_argument('--arquivo', default=CAMINHO_DADOS, help="CSV de chamados (padrão: %(default)s)")
+    parser.add_argument('--porta', type=int, default=PORTA_PADRAO)
+    parser.add_argument('--host', default='127.0.0.1')
+    argumentos = parser.parse_args()
+    iniciar_servico(argumentos.arquivo, argumentos.porta, argumentos.host)
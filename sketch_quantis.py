@@ -0,0 +1,284 @@
+"""
+==============================================================================
+PERCENTIS DO TEMPO DE ATENDIMENTO (SKETCH DE QUANTIS)
+==============================================================================
+Descrição: Calcula p50/p90/p95/p99 do tempo de atendimento sem ordenar os
+           dados e sem guardar todos os valores. Cada tempo cai em um
+           "balde" de largura proporcional ao próprio valor; para saber o
+           percentil basta contar os baldes em ordem.
+
+O QUE VOCÊ VAI APRENDER NESTE MÓDULO:
+- O que é um percentil e por que os SLAs usam p90/p99 em vez da média
+- Como um histograma em escala logarítmica garante um erro RELATIVO máximo
+- Por que somar histogramas permite juntar blocos, arquivos e processos
+==============================================================================
+"""
+
+import math
+
+import numpy as np
+
+# ==============================================================================
+# COMO FUNCIONA O SKETCH
+# ==============================================================================
+#
+# Percentil 90 (p90) = o tempo abaixo do qual ficam 90% dos chamados.
+# O jeito exato é ordenar todos os tempos e pegar a posição 90%. Só que
+# isso exige TODOS os valores na memória ao mesmo tempo: não funciona no
+# modo streaming, na ingestão incremental nem com vários processos.
+#
+# A ideia (a mesma do "DDSketch"): dividir os tempos em baldes cada vez
+# mais largos, em progressão geométrica de razão GAMA:
+#
+#   balde i  =  tempos entre GAMA^(i-1) e GAMA^i
+#
+# Com ALFA = 1%, GAMA ≈ 1,0202. Qualquer tempo do balde fica a no máximo
+# 1% do "valor representante" do balde, seja ele 0,5 h ou 500 h. Então
+# o percentil calculado erra no máximo 1% (erro relativo garantido).
+#
+# Guardamos só {balde: quantidade}. De 0,01 h a 10.000 h são ~1.000
+# baldes possíveis, não importa se a base tem 100 ou 100 milhões de
+# chamados. E o melhor: dois sketches são juntados SOMANDO as quantidades
+# de cada balde, sem erro adicional (igual às contagens das métricas).
+#
+# Tempos muito pequenos (até VALOR_MINIMO, incluindo zero) vão para um
+# balde especial, BALDE_ZERO, cujo representante é 0.
+
+# Erro relativo máximo dos percentis (1%)
+ALFA = 0.01
+
+GAMA = (1 + ALFA) / (1 - ALFA)
+LOG_GAMA = math.log(GAMA)
+
+# Tempos até este valor (em horas) contam como zero
+VALOR_MINIMO = 1e-3
+
+# Balde logo abaixo do menor balde "normal": fica em primeiro na ordem
+BALDE_ZERO = math.ceil(math.log(VALOR_MINIMO) / LOG_GAMA) - 1
+
+# Percentis calculados para o relatório e o dashboard
+QUANTIS_PADRAO = {'p50': 0.50, 'p90': 0.90, 'p95': 0.95, 'p99': 0.99}
+
+
+def indices_baldes(valores):
+    """
+    Calcula o balde de cada tempo (vetorizado).
+
+    Parâmetros:
+        valores (array): Tempos não nulos, em horas
+
+    Retorna:
+        array: Índice (int32) do balde de cada valor
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    positivos = valores > VALOR_MINIMO
+    baldes = np.full(len(valores), BALDE_ZERO, dtype=np.int32)
+    baldes[positivos] = np.ceil(np.log(valores[positivos]) / LOG_GAMA)
+    return baldes
+
+
+def valores_baldes(baldes):
+    """
+    Valor representante de cada balde (a no máximo ALFA dos valores dele).
+
+    Parâmetros:
+        baldes (array): Índices de baldes
+
+    Retorna:
+        array: Tempos (float64), com 0 para o BALDE_ZERO
+    """
+    baldes = np.asarray(baldes, dtype=np.float64)
+    valores = 2 * np.power(GAMA, baldes) / (GAMA + 1)
+    return np.where(baldes == BALDE_ZERO, 0.0, valores)
+
+
+def quantis_de_baldes(baldes, quantidades, quantis=QUANTIS_PADRAO):
+    """
+    Calcula percentis a partir de um histograma {balde: quantidade}.
+
+    Parâmetros:
+        baldes (array): Índices dos baldes (em qualquer ordem)
+        quantidades (array): Quantidade de tempos em cada balde
+        quantis (dict): {nome: fração}, ex.: {'p90': 0.9}
+
+    Retorna:
+        dict: {nome: tempo em horas} (NaN se o histograma estiver vazio)
+    """
+    baldes = np.asarray(baldes, dtype=np.int64)
+    quantidades = np.asarray(quantidades, dtype=np.int64)
+    ordem = np.argsort(baldes, kind='stable')
+    acumulado = np.cumsum(quantidades[ordem])
+    total = int(acumulado[-1]) if len(acumulado) else 0
+    if total == 0:
+        return {nome: float('nan') for nome in quantis}
+
+    # Posição do percentil na lista ordenada (0 = menor, total-1 = maior),
+    # e o primeiro balde cuja contagem acumulada passa dessa posição
+    posicoes = np.array([fracao * (total - 1) for fracao in quantis.values()])
+    encontrados = np.searchsorted(acumulado, posicoes, side='right')
+    valores = valores_baldes(baldes[ordem][encontrados])
+    return {nome: float(valor) for nome, valor in zip(quantis, valores)}
+
+
+# ==============================================================================
+# SKETCH COMO DICIONÁRIO (PARA O ESTADO DAS MÉTRICAS)
+# ==============================================================================
+#
+# No estado das métricas o sketch é um dicionário simples, que vai para o
+# JSON da ingestão incremental sem conversões. O JSON transforma as chaves
+# {balde: quantidade} em texto; por isso elas passam por int() na leitura.
+
+def criar_sketch():
+    """
+    Cria um sketch vazio.
+
+    Retorna:
+        dict: {'baldes': {}, 'qtd': 0, 'min': None, 'max': None}
+    """
+    # min/max exatos: o p0 e o p100 não precisam de aproximação
+    return {'baldes': {}, 'qtd': 0, 'min': None, 'max': None}
+
+
+def sketch_de_contagens(baldes, quantidades, minimo, maximo):
+    """
+    Monta um sketch a partir de um histograma já contado (ex.: bincount).
+
+    Parâmetros:
+        baldes (array): Índices dos baldes
+        quantidades (array): Quantidade em cada balde (zeros são ignorados)
+        minimo (float): Menor tempo do grupo
+        maximo (float): Maior tempo do grupo
+
+    Retorna:
+        dict: Sketch no formato de criar_sketch()
+    """
+    preenchidos = quantidades > 0
+    return {
+        'baldes': {int(balde): int(qtd)
+                   for balde, qtd in zip(baldes[preenchidos], quantidades[preenchidos])},
+        'qtd': int(quantidades.sum()),
+        'min': float(minimo),
+        'max': float(maximo),
+    }
+
+
+def sketch_de_valores(valores, baldes=None):
+    """
+    Calcula o sketch de um conjunto de tempos.
+
+    Parâmetros:
+        valores (array): Tempos não nulos, em horas
+        baldes (array): indices_baldes(valores), se já calculados
+
+    Retorna:
+        dict: Sketch no formato de criar_sketch()
+    """
+    if len(valores) == 0:
+        return criar_sketch()
+    if baldes is None:
+        baldes = indices_baldes(valores)
+    primeiro = int(baldes.min())
+    quantidades = np.bincount(baldes - primeiro)
+    indices = np.arange(primeiro, primeiro + len(quantidades))
+    return sketch_de_contagens(indices, quantidades, np.min(valores), np.max(valores))
+
+
+def sketches_por_grupo(codigos, categorias, valores, baldes=None):
+    """
+    Calcula um sketch por categoria em uma única passada.
+
+    Como em calcular_estado_metricas(), usamos np.bincount(): cada par
+    (categoria, balde) vira uma posição de um vetor de contagens.
+
+    Parâmetros:
+        codigos (array): Códigos das categorias deslocados em +1
+                         (0 = nulo), como em codigos_categoria()
+        categorias (Index): Categorias da coluna
+        valores (array): Tempos não nulos, um por código
+        baldes (array): indices_baldes(valores), se já calculados
+
+    Retorna:
+        dict: {categoria: sketch}, só para categorias com algum tempo
+    """
+    if len(valores) == 0:
+        return {}
+    if baldes is None:
+        baldes = indices_baldes(valores)
+
+    primeiro = int(baldes.min())
+    largura = int(baldes.max()) - primeiro + 1
+    grupos = len(categorias) + 1
+
+    colunas = baldes - primeiro
+    posicoes = codigos.astype(np.int64) * largura + colunas
+    contagens = np.bincount(posicoes, minlength=grupos * largura).reshape(grupos, largura)
+
+    # Mínimo e máximo exatos de cada categoria. O mínimo só pode estar no
+    # primeiro balde preenchido do grupo (e o máximo, no último): olhamos
+    # apenas esses poucos valores, em vez de todos
+    preenchidos = contagens > 0
+    primeiros = preenchidos.argmax(axis=1)
+    ultimos = largura - 1 - preenchidos[:, ::-1].argmax(axis=1)
+    minimos = np.full(grupos, np.inf)
+    maximos = np.full(grupos, -np.inf)
+    no_primeiro = colunas == primeiros[codigos]
+    no_ultimo = colunas == ultimos[codigos]
+    np.minimum.at(minimos, codigos[no_primeiro], valores[no_primeiro])
+    np.maximum.at(maximos, codigos[no_ultimo], valores[no_ultimo])
+
+    indices = np.arange(primeiro, primeiro + largura)
+    return {
+        categoria: sketch_de_contagens(indices, contagens[codigo + 1],
+                                       minimos[codigo + 1], maximos[codigo + 1])
+        for codigo, categoria in enumerate(categorias)
+        if contagens[codigo + 1].any()
+    }
+
+
+def combinar_sketches(sketch, outro):
+    """
+    Soma 'outro' em 'sketch' (altera 'sketch').
+
+    Parâmetros:
+        sketch (dict): Sketch acumulado
+        outro (dict): Sketch a ser somado
+
+    Retorna:
+        dict: O sketch acumulado, atualizado
+    """
+    # int() nas chaves dos dois lados: um deles pode ter vindo do JSON
+    baldes = {int(balde): qtd for balde, qtd in sketch['baldes'].items()}
+    for balde, qtd in outro['baldes'].items():
+        balde = int(balde)
+        baldes[balde] = baldes.get(balde, 0) + qtd
+    sketch['baldes'] = baldes
+
+    sketch['qtd'] += outro['qtd']
+    if outro['min'] is not None:
+        if sketch['min'] is None or outro['min'] < sketch['min']:
+            sketch['min'] = outro['min']
+        if sketch['max'] is None or outro['max'] > sketch['max']:
+            sketch['max'] = outro['max']
+    return sketch
+
+
+def quantis_sketch(sketch, quantis=QUANTIS_PADRAO):
+    """
+    Calcula os percentis de um sketch.
+
+    Parâmetros:
+        sketch (dict): Sketch no formato de criar_sketch()
+        quantis (dict): {nome: fração}
+
+    Retorna:
+        dict: {nome: tempo em horas}, limitado ao mínimo e máximo exatos
+    """
+    baldes = np.fromiter((int(balde) for balde in sketch['baldes']), dtype=np.int64,
+                         count=len(sketch['baldes']))
+    quantidades = np.fromiter(sketch['baldes'].values(), dtype=np.int64,
+                              count=len(sketch['baldes']))
+    resultado = quantis_de_baldes(baldes, quantidades, quantis)
+    if sketch['qtd'] > 0:
+        resultado = {nome: min(max(valor, sketch['min']), sketch['max'])
+                     for nome, valor in resultado.items()}
+    return resultado